@@ -0,0 +1,48 @@
+"""Solvers for restricted path problems (FPTAS label engines and MTZ ILP models).
+
+Submodules are imported on first use, so ``import pathproblems`` stays cheap and
+heavy backends such as gurobipy are only loaded by the solvers that need them.
+"""
+import importlib
+
+__version__ = "0.1.0"
+
+_EXPORTS = {
+    "load_graph_from_csv": "pathproblems.graph",
+    "read_graph": "pathproblems.graph",
+    "load_graph": "pathproblems.graph",
+    "read_csr": "pathproblems.columnar",
+    "GraphCatalog": "pathproblems.columnar",
+    "load_vector_graph_from_csv": "pathproblems.graph",
+    "generate_graph": "pathproblems.generate",
+    "CSRGraph": "pathproblems.csr",
+    "ReducedGraph": "pathproblems.reduce",
+    "reduce_graph": "pathproblems.reduce",
+    "PathLabel": "pathproblems.labels",
+    "PredecessorLabel": "pathproblems.labels",
+    "FPTAS_RRP": "pathproblems.fptas",
+    "TargetTable": "pathproblems.fptas",
+    "ScalingFPTAS_RRP": "pathproblems.scaling",
+    "FPTAS_MultiObjective": "pathproblems.multiobjective",
+    "FPTAS_BiObjectiveSP": "pathproblems.layered",
+    "ParallelBiObjectiveSP": "pathproblems.parallel",
+    "AdditiveFPTAS": "pathproblems.additive",
+    "LARAC_RRP": "pathproblems.lagrangian",
+    "PortfolioRRP": "pathproblems.portfolio",
+    "ParetoShortcutIndex": "pathproblems.ch",
+    "Orienteering": "pathproblems.orienteering",
+    "PathScorer": "pathproblems.scoring",
+    "solve_rrp_ilp": "pathproblems.ilp",
+    "solve_min_weight_ilp": "pathproblems.ilp",
+    "DynamicGraph": "pathproblems.dynamic",
+    "IncrementalFPTAS_RRP": "pathproblems.dynamic",
+    "QueryCache": "pathproblems.cache",
+    "PathService": "pathproblems.service",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
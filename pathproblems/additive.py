@@ -0,0 +1,81 @@
+"""Additive-interval FPTAS for the shortest simple path problem (Problem 1).
+
+Labels are grouped by the interval floor(reward / delta) of their reward, and each
+node keeps the label with the largest penalty (lowest reward - penalty) per interval.
+Only occupied intervals are stored, and labels are PredecessorLabels, so memory is
+proportional to the number of live labels rather than to the (n-1) * W / delta
+interval range.
+"""
+from collections import deque
+
+from pathproblems.graph import graph_nodes
+from pathproblems.labels import PredecessorLabel
+
+class AdditiveFPTAS:
+    def __init__(self, graph, source, target, epsilon):
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.epsilon = epsilon
+        self.n = len(graph_nodes(graph))
+        self.delta = epsilon / (self.n - 1) if self.n > 1 else epsilon
+        self.num_labels = 0  # Labels currently stored in the interval maps
+
+    def get_interval(self, reward):
+        """Uniform discretization of the reward axis."""
+        if reward <= 0:
+            return 0
+        return int(reward // self.delta)
+
+    def run(self):
+        """Return (path, value) of the best source-target path, or (None, inf)."""
+        # intervals[node][interval] = PredecessorLabel, holding occupied intervals only
+        intervals = {self.source: {0: PredecessorLabel(0, 0, self.source)}}
+        self.num_labels = 1
+
+        # Queue for nodes to process
+        queue = deque([self.source])
+        in_queue = {self.source}
+
+        while queue:
+            node = queue.popleft()
+            in_queue.remove(node)
+
+            # Process each label at the current node
+            for label in list(intervals[node].values()):
+                for neighbor, (edge_reward, edge_penalty) in self.graph.get(node, {}).items():
+                    new_reward = label.reward + edge_reward
+                    new_penalty = label.penalty + edge_penalty
+                    new_interval = self.get_interval(new_reward)
+
+                    # Check dominance first, it is cheaper than the cycle check
+                    neighbor_intervals = intervals.get(neighbor)
+                    if neighbor_intervals is not None:
+                        existing = neighbor_intervals.get(new_interval)
+                        if existing is not None and existing.penalty >= new_penalty:
+                            continue
+
+                    # Skip if the neighbor is already in the path (avoid cycles)
+                    if label.contains(neighbor):
+                        continue
+
+                    if neighbor_intervals is None:
+                        neighbor_intervals = intervals[neighbor] = {}
+                    if new_interval not in neighbor_intervals:
+                        self.num_labels += 1
+                    neighbor_intervals[new_interval] = PredecessorLabel(new_reward, new_penalty, neighbor, label)
+
+                    # Add the neighbor to the queue for processing
+                    if neighbor not in in_queue:
+                        queue.append(neighbor)
+                        in_queue.add(neighbor)
+
+        # Find the best path to the target
+        best_label = None
+        for label in intervals.get(self.target, {}).values():
+            if best_label is None or label.get_value() < best_label.get_value():
+                best_label = label
+
+        if best_label is None:
+            return None, float('inf')
+        return best_label.reconstruct_path(), best_label.get_value()
@@ -0,0 +1,330 @@
+"""Sharded batch execution of FPTAS_RRP queries over a filesystem work queue.
+
+A queue is a directory that the coordinator and every worker can reach (a local
+disk for worker processes on one machine, a shared mount for several machines):
+
+    root/job.json             graph, epsilon, graph fingerprint, shard count, lease, max attempts
+    root/pending/00042.json   shards waiting for a worker: {"shard", "attempt", "queries"}
+    root/running/00042.json   shards claimed by a worker; the worker touches the file after every query
+    root/results/00042.jsonl  one JSON line per query of a finished shard
+    root/failed/00042.json    shards that used up their attempts
+
+Every state change is a rename, which is atomic on POSIX filesystems, so a shard
+is claimed by exactly one worker at a time. A worker loads the graph once, checks
+its fingerprint, and streams the results of a shard into results/00042.jsonl.part,
+renamed into place when the shard is done. Shards whose claim has not been
+touched for lease seconds (a dead or stuck worker) and shards whose worker failed
+go back to pending until they reach max_attempts; idle workers and the
+coordinator both check for expired claims. Results are written under the
+shard id and a query always gives the same answer, so a shard that runs twice
+after a retry leaves the same file, and a worker that claims a shard with a
+result already in place just drops the claim.
+"""
+import json
+import multiprocessing
+import os
+import socket
+import time
+from queue import Empty
+
+from pathproblems.cache import graph_fingerprint
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.graph import load_graph
+
+STATES = ('pending', 'running', 'results', 'failed')
+
+def read_queries(filename, constraint_C=None):
+    """Read source,target[,constraint] rows (with a header line); constraint_C fills a missing column."""
+    import csv
+
+    queries = []
+    with open(filename, 'r') as f:
+        reader = csv.reader(f)
+        next(reader)  # Skip the header
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < 3 and constraint_C is None:
+                raise ValueError(f"Query {row} has no constraint column and no default constraint was given")
+            queries.append((row[0], row[1], float(row[2]) if len(row) > 2 else constraint_C))
+    return queries
+
+class ShardQueue:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, state, shard, suffix='.json'):
+        return os.path.join(self.root, state, f'{shard:05d}{suffix}')
+
+    def shards(self, state):
+        """Sorted shard ids in one state directory."""
+        suffix = '.jsonl' if state == 'results' else '.json'
+        return sorted(int(name[:-len(suffix)]) for name in os.listdir(os.path.join(self.root, state))
+                      if name.endswith(suffix))
+
+    def job(self):
+        with open(os.path.join(self.root, 'job.json'), 'r') as f:
+            return json.load(f)
+
+    def submit(self, input_path, queries, epsilon, shard_size=1000, dims=2, catalog=None, max_attempts=3,
+               lease=60.0):
+        """Write the job description and split queries into pending shards of shard_size queries."""
+        if os.path.exists(os.path.join(self.root, 'job.json')):
+            raise ValueError(f"{self.root} already holds a job, use a new queue directory")
+        graph = load_graph(input_path, dims, catalog)
+        for state in STATES:
+            os.makedirs(os.path.join(self.root, state), exist_ok=True)
+        shards = [queries[i:i + shard_size] for i in range(0, len(queries), shard_size)]
+        for shard, chunk in enumerate(shards):
+            # The first query number lets results be merged back in input order
+            self.write(self.path('pending', shard), {'shard': shard, 'attempt': 0, 'first': shard * shard_size,
+                                                     'queries': chunk})
+        job = {
+            'input': input_path if catalog is not None else os.path.abspath(input_path),
+            'dims': dims,
+            'catalog': catalog and os.path.abspath(catalog),
+            'epsilon': epsilon,
+            'fingerprint': graph_fingerprint(graph),
+            'shards': len(shards),
+            'queries': len(queries),
+            'max_attempts': max_attempts,
+            'lease': lease,
+        }
+        # job.json goes last: workers wait for it before claiming
+        self.write(os.path.join(self.root, 'job.json'), job)
+        return job
+
+    def write(self, path, data):
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f)
+        os.replace(temporary, path)
+
+    def claim(self):
+        """Move the first pending shard to running and return it, or None if nothing is pending."""
+        for shard in self.shards('pending'):
+            running = self.path('running', shard)
+            try:
+                os.rename(self.path('pending', shard), running)
+            except FileNotFoundError:
+                continue  # Another worker was faster
+            # The rename keeps the time the shard was queued; the lease starts now
+            os.utime(running)
+            with open(running, 'r') as f:
+                return json.load(f)
+        return None
+
+    def heartbeat(self, shard):
+        try:
+            os.utime(self.path('running', shard))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, shard, part=None):
+        """Publish the streamed results of a shard (if part is given) and drop its claim."""
+        if part is not None:
+            try:
+                os.replace(part, self.path('results', shard, '.jsonl'))
+            except FileNotFoundError:
+                # Removed as stale by a retry of the same shard that finished first
+                if not os.path.exists(self.path('results', shard, '.jsonl')):
+                    raise
+        # Partial results of earlier attempts whose worker died
+        prefix = f'{shard:05d}.jsonl.'
+        for name in os.listdir(os.path.join(self.root, 'results')):
+            if name.startswith(prefix) and name.endswith('.part') and os.path.join(self.root, 'results', name) != part:
+                try:
+                    os.remove(os.path.join(self.root, 'results', name))
+                except FileNotFoundError:
+                    pass
+        try:
+            os.remove(self.path('running', shard))
+        except FileNotFoundError:
+            pass  # The claim expired and was requeued; the next claim will find the result
+
+    def release(self, task, max_attempts, claim=None):
+        """Return a claimed shard to pending, or to failed once it used max_attempts attempts."""
+        task = dict(task, attempt=task['attempt'] + 1)
+        state = 'failed' if task['attempt'] >= max_attempts else 'pending'
+        self.write(self.path(state, task['shard']), task)
+        try:
+            os.remove(claim or self.path('running', task['shard']))
+        except FileNotFoundError:
+            pass
+        return state
+
+    def requeue_expired(self, lease, max_attempts):
+        """Release shards whose claim was not touched for lease seconds; returns their ids."""
+        expired = []
+        now = time.time()
+        for shard in self.shards('running'):
+            running = self.path('running', shard)
+            # Take the expired claim over with a rename, so only one process releases it
+            claim = self.path('running', shard, f'.json.expired-{os.getpid()}')
+            try:
+                if now - os.path.getmtime(running) < lease:
+                    continue
+                os.rename(running, claim)
+            except FileNotFoundError:
+                continue  # Completed meanwhile
+            with open(claim, 'r') as f:
+                task = json.load(f)
+            if os.path.exists(self.path('results', shard, '.jsonl')):
+                os.remove(claim)
+                continue
+            self.release(task, max_attempts, claim)
+            expired.append(shard)
+        return expired
+
+    def status(self):
+        return {state: len(self.shards(state)) for state in STATES}
+
+    def finished(self):
+        status = self.status()
+        return status['pending'] == 0 and status['running'] == 0
+
+    def results(self):
+        """Yield the result dictionaries of every finished shard, in query order."""
+        for shard in self.shards('results'):
+            with open(self.path('results', shard, '.jsonl'), 'r') as f:
+                for line in f:
+                    yield json.loads(line)
+
+def solve_query(graph, epsilon, number, source, target, constraint_C):
+    """Result dictionary of one query; unknown nodes are reported, not raised."""
+    result = {'query': number, 'source': source, 'target': target, 'constraint': constraint_C}
+    try:
+        fptas = FPTAS_RRP(graph, source, target, constraint_C, epsilon)
+        for node in (source, target):
+            if node not in fptas.nodes:
+                raise ValueError(f"Node {node} not found in graph")
+        best = fptas.run()
+    except ValueError as error:
+        return dict(result, error=str(error))
+    if best is None:
+        return dict(result, path=None)
+    reward, penalty, path = best
+    return dict(result, path=path, reward=reward, penalty=penalty)
+
+def run_worker(root, worker_id=None, poll=0.5, wait=True, on_ready=None):
+    """Claim and solve shards until the queue is finished (or empty, with wait=False).
+
+    The graph is loaded once; on_ready() is called once it passed the fingerprint
+    check, before the first claim. Returns the number of shards this worker completed.
+    """
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    queue = ShardQueue(root)
+    while not os.path.exists(os.path.join(root, 'job.json')):
+        time.sleep(poll)
+    job = queue.job()
+    graph = load_graph(job['input'], job['dims'], job['catalog'])
+    if graph_fingerprint(graph) != job['fingerprint']:
+        raise ValueError(f"Graph {job['input']} changed since the job was submitted")
+    if on_ready is not None:
+        on_ready()
+
+    completed = 0
+    while True:
+        task = queue.claim()
+        if task is None:
+            if not wait or queue.finished():
+                return completed
+            # Workers also requeue expired claims, so the queue keeps going without a coordinator
+            queue.requeue_expired(job['lease'], job['max_attempts'])
+            time.sleep(poll)
+            continue
+        shard = task['shard']
+        if os.path.exists(queue.path('results', shard, '.jsonl')):
+            # A retried shard whose first run finished after all
+            queue.complete(shard)
+            continue
+        part = queue.path('results', shard, f'.jsonl.{worker_id}.part')
+        try:
+            with open(part, 'w') as f:
+                for offset, (source, target, constraint_C) in enumerate(task['queries']):
+                    result = solve_query(graph, job['epsilon'], task['first'] + offset, source, target, constraint_C)
+                    f.write(json.dumps(result) + '\n')
+                    f.flush()
+                    queue.heartbeat(shard)
+        except Exception:
+            queue.release(task, job['max_attempts'])
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        queue.complete(shard, part)
+        completed += 1
+
+def _worker_main(root, worker_id, poll, events):
+    try:
+        run_worker(root, worker_id, poll, on_ready=lambda: events.put(('ready', worker_id)))
+    except Exception as error:
+        events.put(('error', worker_id, f"{type(error).__name__}: {error}"))
+        raise
+
+def run_coordinator(root, workers=0, poll=0.5, on_progress=None, max_restarts=10):
+    """Watch the queue until every shard is finished or failed, requeueing expired claims.
+
+    With workers > 0 the coordinator also starts that many local worker processes,
+    standing in for worker machines, and replaces any that die while work remains,
+    at most max_restarts times. A worker that dies before it is ready to claim
+    shards (say, the graph changed) would fail the same way when restarted, so
+    that stops the run at once. Both raise RuntimeError with the worker's error.
+    Returns the final status() counts.
+    """
+    queue = ShardQueue(root)
+    job = queue.job()
+    context = multiprocessing.get_context()
+    events = context.Queue()
+    processes = {}  # worker id -> process
+    ready = set()
+    errors = {}
+    started = restarts = 0
+
+    def start():
+        nonlocal started
+        worker_id = f'local-{started}'
+        started += 1
+        process = context.Process(target=_worker_main, args=(root, worker_id, poll, events))
+        process.start()
+        processes[worker_id] = process
+
+    def receive():
+        while True:
+            try:
+                event = events.get_nowait()
+            except Empty:
+                return
+            if event[0] == 'ready':
+                ready.add(event[1])
+            else:
+                errors[event[1]] = event[2]
+
+    for _ in range(workers):
+        start()
+    try:
+        while not queue.finished():
+            time.sleep(poll)
+            expired = queue.requeue_expired(job['lease'], job['max_attempts'])
+            for worker_id, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                receive()
+                del processes[worker_id]
+                if process.exitcode == 0:
+                    continue  # The queue was finished when the worker looked
+                error = errors.get(worker_id, f"exit code {process.exitcode}")
+                if worker_id not in ready:
+                    raise RuntimeError(f"Worker {worker_id} failed before claiming any shard: {error}")
+                if restarts >= max_restarts:
+                    raise RuntimeError(f"Workers died {restarts + 1} times, giving up; last error: {error}")
+                restarts += 1
+                start()
+            if on_progress is not None:
+                on_progress(queue.status(), expired)
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    return queue.status()
@@ -0,0 +1,150 @@
+"""LRU cache of FPTAS_RRP target frontiers keyed by graph content and query parameters."""
+import hashlib
+import pickle
+import sqlite3
+from collections import OrderedDict, defaultdict
+
+from pathproblems.fptas import FPTAS_RRP
+
+def graph_fingerprint(graph):
+    """Content hash of a graph[u][v] = (reward, penalty) dictionary, independent of insertion order."""
+    digest = hashlib.sha256()
+    edges = sorted((u, v, reward, penalty) for u in graph for v, (reward, penalty) in graph[u].items())
+    for u, v, reward, penalty in edges:
+        digest.update(f"{u},{v},{reward},{penalty}\n".encode())
+    return digest.hexdigest()
+
+def solve_frontier(graph, source, target, constraint_C, epsilon):
+    """Run FPTAS_RRP and return its target frontier instead of a single answer."""
+    fptas = FPTAS_RRP(graph, source, target, constraint_C, epsilon)
+    pareto_sets = fptas.initial_pareto_sets()
+    fptas.propagate(pareto_sets, [source])
+    return fptas.target_frontier(pareto_sets)
+
+def select_best(frontier, constraint_C):
+    """Pick the best feasible entry of a target frontier, with the same tie-breaking as FPTAS_RRP."""
+    best_reward = 0
+    best_entry = None
+    best_penalty = float('inf')
+
+    for reward, penalty, path in frontier:
+        if penalty <= constraint_C and reward > best_reward:
+            best_reward = reward
+            best_penalty = penalty
+            best_entry = (reward, penalty, list(path))
+        # Break ties in favor of lower penalty
+        elif penalty <= constraint_C and reward == best_reward and penalty < best_penalty:
+            best_penalty = penalty
+            best_entry = (reward, penalty, list(path))
+
+    return best_entry
+
+class QueryCache:
+    """LRU cache of target frontiers with entry- and byte-based eviction.
+
+    A frontier computed with budget C and approximation epsilon also answers any
+    query on the same graph and endpoints with a budget C' <= C and epsilon' >= epsilon,
+    because the penalty bound only prunes labels and a finer bucket grid keeps the guarantee.
+    """
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, db_path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (frontier, size in bytes)
+        self.by_endpoints = defaultdict(set)  # (fingerprint, source, target) -> {(C, epsilon)}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # Optional persistent second tier
+        self.db = None
+        if db_path is not None:
+            self.db = sqlite3.connect(db_path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS frontiers ("
+                "fingerprint TEXT, source TEXT, target TEXT, constraint_c REAL, epsilon REAL, frontier BLOB, "
+                "PRIMARY KEY (fingerprint, source, target, constraint_c, epsilon))"
+            )
+            self.db.commit()
+
+    def lookup(self, fingerprint, source, target, constraint_C, epsilon):
+        """Return a cached frontier valid for the query, or None."""
+        endpoints = (fingerprint, source, target)
+        key = endpoints + (constraint_C, epsilon)
+        if key not in self.entries:
+            # Smallest cached budget that still covers the query keeps the scan short
+            candidates = [(C, eps) for C, eps in self.by_endpoints.get(endpoints, ())
+                          if C >= constraint_C and eps <= epsilon]
+            key = endpoints + min(candidates) if candidates else None
+
+        if key is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT constraint_c, epsilon, frontier FROM frontiers "
+                "WHERE fingerprint = ? AND source = ? AND target = ? AND constraint_c >= ? AND epsilon <= ? "
+                "ORDER BY constraint_c, epsilon DESC LIMIT 1",
+                (fingerprint, source, target, constraint_C, epsilon),
+            ).fetchone()
+            if row is not None:
+                cached_C, cached_epsilon, blob = row
+                frontier = pickle.loads(blob)
+                self._insert(endpoints + (cached_C, cached_epsilon), frontier, len(blob))
+                self.hits += 1
+                return frontier
+
+        self.misses += 1
+        return None
+
+    def store(self, fingerprint, source, target, constraint_C, epsilon, frontier):
+        """Cache the target frontier of a finished solve."""
+        blob = pickle.dumps(frontier, protocol=pickle.HIGHEST_PROTOCOL)
+        self._insert((fingerprint, source, target, constraint_C, epsilon), frontier, len(blob))
+
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO frontiers VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, source, target, constraint_C, epsilon, blob),
+            )
+            self.db.commit()
+
+    def _insert(self, key, frontier, size):
+        if key in self.entries:
+            self._evict(key)
+        self.entries[key] = (frontier, size)
+        self.by_endpoints[key[:3]].add(key[3:])
+        self.total_bytes += size
+
+        # Evict least recently used entries, but always keep the newest one
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            self._evict(next(iter(self.entries)))
+
+    def _evict(self, key):
+        frontier, size = self.entries.pop(key)
+        self.total_bytes -= size
+        params = self.by_endpoints[key[:3]]
+        params.discard(key[3:])
+        if not params:
+            del self.by_endpoints[key[:3]]
+
+    def solve(self, graph, source, target, constraint_C, epsilon, fingerprint=None):
+        """Answer an FPTAS_RRP query from the cache, solving and storing it on a miss.
+
+        Returns (reward, penalty, path) or None, like FPTAS_RRP.run.
+        """
+        if fingerprint is None:
+            fingerprint = graph_fingerprint(graph)
+
+        frontier = self.lookup(fingerprint, source, target, constraint_C, epsilon)
+        if frontier is None:
+            frontier = solve_frontier(graph, source, target, constraint_C, epsilon)
+            self.store(fingerprint, source, target, constraint_C, epsilon, frontier)
+
+        return select_best(frontier, constraint_C)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
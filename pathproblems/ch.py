@@ -0,0 +1,270 @@
+"""Contraction index with Pareto shortcuts for repeated RRP queries on a static graph.
+
+ParetoShortcutIndex.build() contracts nodes one at a time, cheapest first
+(shortcuts added minus edges removed). Contracting v adds a shortcut u -> w for
+every remaining in-neighbor u and out-neighbor w, labelled with the combined
+(reward, penalty) of every pair of labels on u -> v and v -> w that keeps the
+path simple. Each edge keeps a bucketed Pareto set of labels: a label is dropped
+if another one with a lower penalty, a reward at least as high or in the same
+bucket floor(log(reward, 1 + delta)), and a subset of its inner nodes exists.
+No witness searches are run, so no shortcut is ever missing; contraction stops
+when the cheapest node would add more than max_shortcuts shortcuts, and the
+remaining nodes form the core.
+
+A query runs a forward label search from the source over edges to higher-ranked
+nodes plus the core edges, a backward one from the target over edges from
+higher-ranked nodes, and joins the two label sets at every node they share.
+Every path of the graph maps to such an up-core-down path of shortcuts, and
+between the index and the query a path of k edges goes through at most 2k
+bucket roundings. With delta = epsilon / (2 * (n - 1)), on a DAG the returned
+reward is therefore within the same factor (1 + epsilon / (n - 1))^(n - 1) of
+the best one as with FPTAS_RRP.
+
+On graphs with cycles there is no such factor. Like FPTAS_RRP, the searches keep
+paths simple by rejecting labels that revisit a node, so the label kept in a
+bucket may be unusable where a dropped one would have been. The index keeps one
+label per bucket over longer shortcut paths and again at the join, so this
+happens more often than with FPTAS_RRP and the index can return a worse path;
+the path it returns is always feasible and simple.
+
+The index is saved with pickle next to the graph (graph_data.csv.ch by default)
+together with the graph fingerprint; only load index files you wrote yourself.
+"""
+import heapq
+import math
+import pickle
+from collections import deque
+
+from pathproblems.cache import graph_fingerprint
+from pathproblems.csr import CSRGraph
+
+FORMAT = 1
+
+def index_path(graph_path):
+    """Default index file for a graph file."""
+    return graph_path + '.ch'
+
+def pareto_labels(labels, delta):
+    """Drop every label covered by another one through a subset of its inner nodes.
+
+    A label covers another if it has a lower penalty and either a higher reward or
+    a reward in the same bucket floor(log(reward, 1 + delta)). Requiring a subset of
+    the inner nodes keeps every extension of the dropped label open to the other.
+    """
+    def bucket(reward):
+        return 0 if reward <= 0 else math.floor(math.log(reward, 1 + delta))
+
+    kept = []
+    for label in sorted(labels, key=lambda label: (label[1], -label[0], len(label[5]))):
+        reward, penalty, inner = label[0], label[1], label[5]
+        if not any(other[5] <= inner and (other[0] >= reward or bucket(other[0]) == bucket(reward))
+                   for other in kept):
+            kept.append(label)
+    return kept
+
+class ParetoShortcutIndex:
+    """Edge label sets and contraction ranks of a graph.
+
+    labels[(u, w)] lists (reward, penalty, via, left, right, inner) for node ids u,
+    w: via is -1 for an original edge, otherwise the contracted node, with left and
+    right the label positions on (u, via) and (via, w); inner is the frozenset of
+    nodes strictly inside the path. rank[v] is the contraction order, len(nodes)
+    for core nodes.
+    """
+    def __init__(self, nodes, rank, labels, epsilon, fingerprint):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.rank = rank
+        self.labels = labels
+        self.epsilon = epsilon
+        self.delta = epsilon / (2 * max(len(nodes) - 1, 1))
+        self.fingerprint = fingerprint
+        core = len(nodes)
+        self.up = [[] for _ in nodes]  # Forward search edges
+        self.down = [[] for _ in nodes]  # Backward search edges, stored at their head
+        for u, w in labels:
+            if rank[w] > rank[u] or rank[u] == rank[w] == core:
+                self.up[u].append(w)
+            elif rank[u] > rank[w]:
+                self.down[w].append(u)
+        self.search_space = 0  # Labels created by the last query
+
+    @classmethod
+    def build(cls, graph, epsilon, max_shortcuts=64):
+        """Contract a graph[u][v] = (reward, penalty) dictionary into an index."""
+        csr = CSRGraph.from_dict(graph)
+        n = csr.num_nodes
+        delta = epsilon / (2 * max(n - 1, 1))
+        labels = {}
+        out_edges = [set() for _ in range(n)]
+        in_edges = [set() for _ in range(n)]
+        sources = csr.edge_sources()
+        for e in range(csr.num_edges):
+            u, v = sources[e], csr.targets[e]
+            if u != v:
+                labels[(u, v)] = [(csr.rewards[e], csr.penalties[e], -1, -1, -1, frozenset())]
+                out_edges[u].add(v)
+                in_edges[v].add(u)
+
+        def shortcuts(v):
+            return len(in_edges[v]) * len(out_edges[v]) - len(in_edges[v] & out_edges[v])
+
+        def cost(v):
+            return shortcuts(v) - len(in_edges[v]) - len(out_edges[v])
+
+        rank = [n] * n
+        heap = [(cost(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            priority, v = heapq.heappop(heap)
+            if rank[v] < n:
+                continue
+            current = cost(v)
+            if current > priority and heap and current > heap[0][0]:
+                # Degrees changed since v was queued
+                heapq.heappush(heap, (current, v))
+                continue
+            if shortcuts(v) > max_shortcuts:
+                break
+
+            for u in in_edges[v]:
+                for w in out_edges[v]:
+                    if u == w:
+                        continue
+                    combined = []
+                    for left, (r1, p1, _, _, _, inner1) in enumerate(labels[(u, v)]):
+                        if w in inner1:
+                            continue
+                        for right, (r2, p2, _, _, _, inner2) in enumerate(labels[(v, w)]):
+                            if u in inner2 or not inner1.isdisjoint(inner2):
+                                continue
+                            combined.append((r1 + r2, p1 + p2, v, left, right, inner1 | inner2 | {v}))
+                    if combined:
+                        labels[(u, w)] = pareto_labels(labels.get((u, w), []) + combined, delta)
+                        out_edges[u].add(w)
+                        in_edges[w].add(u)
+            for u in in_edges[v]:
+                out_edges[u].discard(v)
+            for w in out_edges[v]:
+                in_edges[w].discard(v)
+            rank[v] = order
+            order += 1
+            for neighbor in in_edges[v] | out_edges[v]:
+                heapq.heappush(heap, (cost(neighbor), neighbor))
+
+        return cls(csr.nodes, rank, labels, epsilon, graph_fingerprint(graph))
+
+    def summary(self):
+        core = sum(1 for r in self.rank if r == len(self.nodes))
+        shortcuts = sum(1 for labels in self.labels.values() if any(label[2] >= 0 for label in labels))
+        size = sum(len(labels) for labels in self.labels.values())
+        return (f"Index: {len(self.nodes)} nodes ({core} in the core), {len(self.labels)} edges "
+                f"({shortcuts} shortcuts), {size} labels, epsilon = {self.epsilon}")
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump({'format': FORMAT, 'nodes': self.nodes, 'rank': self.rank, 'labels': self.labels,
+                         'epsilon': self.epsilon, 'fingerprint': self.fingerprint}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, graph=None):
+        """Read an index; with graph, refuse an index that was built for different edges."""
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a version {FORMAT} index, rebuild it")
+        if graph is not None and graph_fingerprint(graph) != data['fingerprint']:
+            raise ValueError(f"{path} was built for a different graph, rebuild it")
+        return cls(data['nodes'], data['rank'], data['labels'], data['epsilon'], data['fingerprint'])
+
+    def search(self, start, adjacency, forward, constraint_C, end):
+        """Label-correcting search from start; labels[node][bucket] = (reward, penalty, visited, previous, edge).
+
+        end is the start of the opposite search. A label through end can only be joined
+        at end itself, so labels stop at end and edges with end inside are skipped;
+        kept, they would take the bucket of a label that can be joined.
+        """
+        labels = {start: {0: (0, 0, frozenset([start]), None, None)}}
+        queue = deque([start])
+        in_queue = {start}
+        while queue:
+            node = queue.popleft()
+            in_queue.remove(node)
+            if node == end:
+                continue
+            for label in list(labels[node].values()):
+                reward, penalty, visited = label[:3]
+                for neighbor in adjacency[node]:
+                    if neighbor in visited:
+                        continue
+                    key = (node, neighbor) if forward else (neighbor, node)
+                    for position, (edge_reward, edge_penalty, _, _, _, inner) in enumerate(self.labels[key]):
+                        new_penalty = penalty + edge_penalty
+                        if new_penalty > constraint_C:
+                            # Edge labels are sorted by penalty
+                            break
+                        if end in inner or not visited.isdisjoint(inner):
+                            continue
+                        new_reward = reward + edge_reward
+                        bucket = 0 if new_reward <= 0 else math.floor(math.log(new_reward, 1 + self.delta))
+                        frontier = labels.setdefault(neighbor, {})
+                        existing = frontier.get(bucket)
+                        if existing is not None and existing[1] <= new_penalty:
+                            continue
+                        frontier[bucket] = (new_reward, new_penalty, visited | inner | {neighbor}, label,
+                                            (key, position))
+                        self.search_space += 1
+                        if neighbor not in in_queue:
+                            queue.append(neighbor)
+                            in_queue.add(neighbor)
+        return labels
+
+    def unpack(self, key, position):
+        """Original node sequence of label position on edge key, without its first node."""
+        u, w = key
+        _, _, via, left, right, _ = self.labels[key][position]
+        if via < 0:
+            return [w]
+        return self.unpack((u, via), left) + self.unpack((via, w), right)
+
+    def trace(self, label, node, forward):
+        """Node ids of a search label's path: start to node (forward) or node to start (backward)."""
+        steps = []
+        while label[3] is not None:
+            key, position = label[4]
+            if forward:
+                steps[:0] = self.unpack(key, position)
+            else:
+                steps.extend(self.unpack(key, position))
+            label = label[3]
+        # Forward steps end at node and need the start in front; backward ones start after node
+        return [key[0]] + steps if forward and steps else [node] + steps
+
+    def query(self, source, target, constraint_C):
+        """Return (reward, penalty, path) like FPTAS_RRP.run(), or None."""
+        for node in (source, target):
+            if node not in self.index:
+                raise ValueError(f"Node {node} not found in graph")
+        s, t = self.index[source], self.index[target]
+        self.search_space = 0
+        forward = self.search(s, self.up, True, constraint_C, t)
+        backward = self.search(t, self.down, False, constraint_C, s)
+
+        best = None
+        for node in forward.keys() & backward.keys():
+            ends = sorted(backward[node].values(), key=lambda label: -label[0])
+            for f in forward[node].values():
+                for b in ends:
+                    # Backward labels are sorted by reward, so the first fit is the best for f
+                    if f[1] + b[1] <= constraint_C and len(f[2] & b[2]) == 1:
+                        reward, penalty = f[0] + b[0], f[1] + b[1]
+                        if best is None or (reward, -penalty) > (best[0], -best[1]):
+                            best = (reward, penalty, node, f, b)
+                        break
+        if best is None or best[0] < 0:
+            return None
+        reward, penalty, node, f, b = best
+        path = self.trace(f, node, True) + self.trace(b, node, False)[1:]
+        return reward, penalty, [self.nodes[i] for i in path]
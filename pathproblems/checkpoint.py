@@ -0,0 +1,139 @@
+"""Checkpoint and resume for FPTAS_RRP.run and FPTAS_BiObjectiveSP.solve.
+
+A checkpoint is two files next to each other:
+
+* ``<path>.log``: one packed record per stored label, in creation order:
+  (reward, penalty, record number of the predecessor, edge tail id, node id, bucket).
+  Both solvers only ever assign a new label to a (node, bucket) slot, so
+  replaying the log rebuilds every label and the bucket maps (last write wins).
+* ``<path>.state``: a small header with the graph/query fingerprint, the number
+  of valid log records, the current round (layered solver) and the queue of
+  nodes still to process (label-correcting solver).
+
+Labels created since the last checkpoint are buffered and appended to the log,
+then the state file is replaced atomically, so a checkpoint costs time in
+proportion to the work done since the previous one and nothing if nothing changed.
+Resuming replays the log in order, which recreates the same dictionaries in the
+same order, so a resumed run returns the same answer as an uninterrupted one.
+"""
+import hashlib
+import os
+import struct
+import time
+from array import array
+
+from pathproblems.labels import PathLabel
+
+RECORD = struct.Struct('<qqqqqq')  # reward, penalty, pred record, tail id, node id, bucket
+HEADER = struct.Struct('<4sI32sqqq')  # magic, version, fingerprint, records, round, queue length
+MAGIC = b'PPCK'
+VERSION = 1
+
+def query_fingerprint(graph, *params):
+    """Hash of the graph in iteration order plus the query parameters."""
+    digest = hashlib.sha256()
+    for u in graph:
+        for v, (reward, penalty) in graph[u].items():
+            digest.update(f"{u},{v},{reward},{penalty}\n".encode())
+    digest.update(repr(params).encode())
+    return digest.digest()
+
+class Checkpoint:
+    def __init__(self, path, interval=60.0, resume=False):
+        """Checkpoint under path every interval seconds; with resume, continue from an existing one."""
+        self.path = path
+        self.interval = interval
+        self.resume = resume
+        self.buffer = bytearray()
+        self.num_records = 0
+        self.last_save = time.monotonic()
+        self.last_state = None
+        self.nodes = None
+        self.node_ids = None
+        self.fingerprint = None
+
+    def bind(self, nodes, fingerprint):
+        """Fix the node numbering and fingerprint of the run using this checkpoint."""
+        self.nodes = list(nodes)
+        self.node_ids = {node: i for i, node in enumerate(self.nodes)}
+        self.fingerprint = fingerprint
+
+    def record(self, node, bucket, label):
+        """Log a label stored in (node, bucket)."""
+        pred = label.pred.record if label.pred is not None else -1
+        tail = self.node_ids[label.last_edge[0]] if label.last_edge is not None else -1
+        self.buffer += RECORD.pack(label.reward, label.penalty, pred, tail, self.node_ids[node], bucket)
+        label.record = self.num_records
+        self.num_records += 1
+
+    def due(self):
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, round_number=0, queue=()):
+        """Append the buffered labels and replace the state file."""
+        state = (self.num_records, round_number, tuple(queue))
+        if state == self.last_state:
+            return
+        with open(self.path + '.log', 'ab') as log:
+            log.write(self.buffer)
+            log.flush()
+            os.fsync(log.fileno())
+        self.buffer.clear()
+
+        queue_ids = array('q', (self.node_ids[node] for node in queue))
+        temporary = self.path + '.state.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.fingerprint, self.num_records, round_number, len(queue_ids)))
+            f.write(queue_ids.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path + '.state')
+        self.last_state = state
+        self.last_save = time.monotonic()
+
+    def start(self, root):
+        """Begin a run from the root label: returns (round, queue, assignments) to resume from, or None.
+
+        assignments is the list of (node, bucket, label) in log order; the first
+        record is the root label itself. On a fresh start, the caller records root.
+        """
+        if self.resume and os.path.exists(self.path + '.state'):
+            return self.load(root)
+        for suffix in ('.log', '.state'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        return None
+
+    def load(self, root):
+        with open(self.path + '.state', 'rb') as f:
+            data = f.read()
+        magic, version, fingerprint, num_records, round_number, queue_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path}.state is not a pathproblems checkpoint")
+        if fingerprint != self.fingerprint:
+            raise ValueError(f"Checkpoint {self.path} was written for a different graph or query")
+        queue_ids = array('q')
+        queue_ids.frombytes(data[HEADER.size:HEADER.size + 8 * queue_length])
+
+        # Records after num_records come from an interrupted checkpoint and are dropped
+        with open(self.path + '.log', 'r+b') as log:
+            log.truncate(num_records * RECORD.size)
+            records = log.read()
+
+        labels = []
+        assignments = []
+        for reward, penalty, pred, tail, node_id, bucket in RECORD.iter_unpack(records):
+            node = self.nodes[node_id]
+            if pred < 0:
+                label = root
+            else:
+                pred_label = labels[pred]
+                label = PathLabel(reward, penalty, pred_label, (self.nodes[tail], node), pred_label.visited_nodes)
+            label.record = len(labels)
+            labels.append(label)
+            assignments.append((node, bucket, label))
+
+        self.num_records = num_records
+        queue = [self.nodes[i] for i in queue_ids]
+        self.last_state = (num_records, round_number, tuple(queue))
+        return round_number, queue, assignments
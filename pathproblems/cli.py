@@ -0,0 +1,751 @@
+"""Command line entry point: ``pathproblems solve``, ``generate``, ``index``, ``catalog``,
+``batch``, ``score``, ``profile`` and ``serve``.
+
+Solver modules are imported inside the command handlers so that each command
+only pays for the backend it actually runs.
+
+Problem 1 is the shortest simple path (minimize reward - penalty), Problem 2 the
+Restricted Rewarding Path (maximize reward subject to penalty <= C).
+"""
+import argparse
+import math
+
+# Problems each algorithm can solve; the first one is the default
+ALGORITHM_PROBLEMS = {
+    'fptas': (2,),
+    'scaling': (2,),
+    'vector': (2,),
+    'dp': (1,),
+    'additive': (1,),
+    'ilp': (2, 1),
+    'larac': (2,),
+    'portfolio': (2,),
+    'ch': (2,),
+    'orienteering': (2,),
+}
+
+def add_graph_arguments(parser):
+    parser.add_argument('--input', '--file', dest='input', type=str, default='graph_data.csv',
+                        help='Input graph: CSV, Parquet or Arrow IPC file, or NAME[@VERSION] with --catalog')
+    parser.add_argument('--dims', type=int, choices=(1, 2), default=2,
+                        help='CSV layout: 1 = source,target,weight; 2 = source,target,reward,penalty')
+    parser.add_argument('--catalog', type=str, default=None, metavar='DIR',
+                        help='Open --input by name from this graph catalog')
+
+def add_query_arguments(parser):
+    parser.add_argument('--source', type=str, default='n0', help='Source node')
+    parser.add_argument('--target', type=str, default=None, help='Target node (defaults to last node)')
+    parser.add_argument('--constraint', type=float, default=50, help='Penalty constraint C (problem 2), travel budget (orienteering)')
+    parser.add_argument('--epsilon', type=float, default=0.1, help='Approximation parameter epsilon (fptas, scaling, vector, dp, additive)')
+
+def resolve_target(args, nodes):
+    from pathproblems.graph import default_target
+
+    return args.target or default_target(nodes)
+
+def print_result(result, constraint_C):
+    if result is None:
+        print("\nNo path found that satisfies the constraint.")
+        return
+    reward, penalty, path = result
+    print(f"\nBest path: {' -> '.join(path)}")
+    print(f"Total reward: {reward}")
+    print(f"Total penalty: {penalty}")
+    print(f"Constraint satisfied: {penalty <= constraint_C}")
+
+def print_shortest_path(path, value):
+    if path is None:
+        print("\nNo path found")
+        return
+    print(f"\nBest path: {' -> '.join(path)}")
+    print(f"Path value: {value:.2f}")
+
+def print_hop_table(results):
+    """Print the best path per hop limit from a list of (path, *values) or None indexed by the limit."""
+    print(f"\n{'hops':>6}  best path")
+    for hops, result in enumerate(results):
+        if result is None or result[0] is None:
+            print(f"{hops:>6}  -")
+        else:
+            values = ', '.join(f"{value:g}" for value in result[1:])
+            print(f"{hops:>6}  {values}: {' -> '.join(result[0])}")
+
+def reduce_for_query(args, graph, target, constraint_C=math.inf):
+    """Apply --reduce: return the graph to search and a function mapping its paths back to the input graph."""
+    if not args.reduce:
+        return graph, lambda path: path
+    from pathproblems.reduce import reduce_graph
+
+    try:
+        reduced = reduce_graph(graph, args.source, target, constraint_C)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    print(reduced.summary())
+    return reduced.graph, reduced.expand_path
+
+def lagrangian_bound(graph, source, target, constraint_C):
+    """Run LARAC for --lagrangian and print its bound; returns the solved LARAC_RRP."""
+    from pathproblems.lagrangian import LARAC_RRP
+
+    larac = LARAC_RRP(graph, source, target, constraint_C)
+    result = larac.run()
+    if result is not None:
+        print(f"Lagrangian bound: reward <= {result['upper_bound']:.2f}, incumbent {result['total_reward']} "
+              f"(gap {result['gap']:.2%})")
+    return larac
+
+def open_checkpoint(args):
+    """The Checkpoint requested by --checkpoint / --resume, or None."""
+    if args.checkpoint is None:
+        if args.resume:
+            raise SystemExit("--resume needs --checkpoint PATH")
+        return None
+    from pathproblems.checkpoint import Checkpoint
+
+    return Checkpoint(args.checkpoint, args.checkpoint_interval, args.resume)
+
+def solve_fptas(args):
+    from pathproblems.fptas import FPTAS_RRP
+    from pathproblems.graph import graph_nodes, load_graph
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    print(f"Running FPTAS for RRP from {args.source} to {target}")
+    print(f"Constraint C = {args.constraint}, Epsilon = {args.epsilon}")
+
+    if args.all_targets:
+        fptas = FPTAS_RRP(graph, args.source, target, args.constraint, args.epsilon)
+        table = fptas.run_all_targets()
+        print(f"\n{'node':>8} {'reward':>10} {'penalty':>10} {'pred':>8}")
+        for i, node in enumerate(table.nodes):
+            if table.reachable[i]:
+                pred = table.nodes[table.pred[i]] if table.pred[i] >= 0 else '-'
+                print(f"{node:>8} {table.reward[i]:>10g} {table.penalty[i]:>10g} {pred:>8}")
+        return None
+
+    if args.by_hops:
+        if args.max_hops is None:
+            raise SystemExit("--by-hops needs --max-hops H")
+        fptas = FPTAS_RRP(graph, args.source, target, args.constraint, args.epsilon, max_hops=args.max_hops)
+        results = fptas.run_by_hops()
+        print_hop_table([result and (result[2], result[0], result[1]) for result in results])
+        print_result(results[-1], args.constraint)
+        return results[-1] and results[-1][2]
+
+    search_graph, expand_path = reduce_for_query(args, graph, target, args.constraint)
+    max_memory = args.max_memory and int(args.max_memory * 2 ** 20)
+    fptas = FPTAS_RRP(search_graph, args.source, target, args.constraint, args.epsilon, max_memory, args.scratch_dir,
+                      args.engine, args.max_hops)
+    if args.lagrangian:
+        fptas.label_bound = lagrangian_bound(search_graph, args.source, target, args.constraint)
+    if args.deadline is not None or args.epsilon_schedule:
+        schedule = [float(e) for e in args.epsilon_schedule.split(',')] if args.epsilon_schedule else None
+        anytime = fptas.solve(args.deadline, schedule)
+        for epsilon, completed, seconds in anytime['passes']:
+            print(f"Pass epsilon = {epsilon}: {'completed' if completed else 'stopped at deadline'} in {seconds:.3f}s")
+        if anytime['epsilon'] is not None:
+            print(f"Finest completed pass: epsilon = {anytime['epsilon']}")
+        if anytime['upper_bound'] < math.inf:
+            print(f"Guarantee: reward >= {anytime['guarantee']:.4f} * OPT "
+                  f"(upper bound {anytime['upper_bound']:.2f})")
+        result = anytime['path'] and (anytime['total_reward'], anytime['total_penalty'], anytime['path'])
+    else:
+        try:
+            result = fptas.run(open_checkpoint(args))
+        except ValueError as error:
+            raise SystemExit(str(error))
+        if fptas.spill_stats:
+            stats = fptas.spill_stats
+            print(f"{stats['labels']} labels, {stats['spills']} frontier spills, {stats['loads']} loads, "
+                  f"{stats['scratch_bytes'] / 2 ** 20:.1f} MiB scratch")
+    if result:
+        result = (result[0], result[1], expand_path(result[2]))
+    print_result(result, args.constraint)
+    if result and args.details:
+        FPTAS_RRP(graph, args.source, target, args.constraint, args.epsilon).print_path_details(result[2])
+    return result and result[2]
+
+def solve_scaling(args):
+    from pathproblems.graph import graph_nodes, load_graph
+    from pathproblems.scaling import ScalingFPTAS_RRP
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    print(f"Running scaling FPTAS for RRP from {args.source} to {target}")
+    print(f"Constraint C = {args.constraint}, Epsilon = {args.epsilon}")
+
+    search_graph, expand_path = reduce_for_query(args, graph, target, args.constraint)
+    solver = ScalingFPTAS_RRP(search_graph, args.source, target, args.constraint, args.epsilon)
+    result = solver.run()
+    if result:
+        result = (result[0], result[1], expand_path(result[2]))
+    if solver.bounds:
+        lower = 'none' if solver.bounds[0] is None else f"{solver.bounds[0]:.2f}"
+        print(f"Heuristic reward bracket after {solver.num_tests} tests: [{lower}, {solver.bounds[1]:.2f}]")
+    print_result(result, args.constraint)
+    return result and result[2]
+
+def solve_vector(args):
+    from pathproblems.graph import default_target, graph_nodes, load_vector_graph_from_csv
+    from pathproblems.multiobjective import FPTAS_MultiObjective
+
+    graph, cost_names = load_vector_graph_from_csv(args.input)
+    target = args.target or default_target(graph_nodes(graph))
+    if args.budgets:
+        budgets = [float(b) for b in args.budgets.split(',')]
+    else:
+        budgets = [args.constraint] * len(cost_names)
+    if len(budgets) != len(cost_names):
+        raise SystemExit(f"Got {len(budgets)} budgets for {len(cost_names)} cost columns {cost_names}")
+    limits = ", ".join(f"{name} <= {b}" for name, b in zip(cost_names, budgets))
+    print(f"Running vector-cost FPTAS from {args.source} to {target}")
+    print(f"Budgets: {limits}, Epsilon = {args.epsilon}")
+
+    result = FPTAS_MultiObjective(graph, args.source, target, budgets, args.epsilon).run()
+    if result is None:
+        print("\nNo path found that satisfies the budgets.")
+        return None
+    reward, costs, path = result
+    print(f"\nBest path: {' -> '.join(path)}")
+    print(f"Total reward: {reward}")
+    for name, cost in zip(cost_names, costs):
+        print(f"Total {name}: {cost}")
+    return path
+
+def solve_dp(args):
+    from pathproblems.graph import graph_nodes, load_graph
+    from pathproblems.layered import FPTAS_BiObjectiveSP
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    print(f"Running layered FPTAS for the shortest path from {args.source} to {target}")
+    print(f"Epsilon = {args.epsilon}")
+
+    if args.by_hops:
+        if args.max_hops is None:
+            raise SystemExit("--by-hops needs --max-hops H")
+        results = FPTAS_BiObjectiveSP(graph, args.source, target, args.epsilon, max_hops=args.max_hops).solve_by_hops()
+        print_hop_table(results)
+        print_shortest_path(*results[-1])
+        return results[-1][0]
+
+    search_graph, expand_path = reduce_for_query(args, graph, target)
+    if args.workers is not None:
+        from pathproblems.parallel import ParallelBiObjectiveSP
+
+        if args.checkpoint is not None:
+            raise SystemExit("--checkpoint is not supported together with --workers")
+        path, value = ParallelBiObjectiveSP(search_graph, args.source, target, args.epsilon, args.workers,
+                                            args.max_hops).solve()
+    else:
+        try:
+            path, value = FPTAS_BiObjectiveSP(search_graph, args.source, target, args.epsilon,
+                                              args.engine, args.max_hops).solve(open_checkpoint(args))
+        except ValueError as error:
+            raise SystemExit(str(error))
+    path = path and expand_path(path)
+    print_shortest_path(path, value)
+    return path
+
+def solve_additive(args):
+    from pathproblems.additive import AdditiveFPTAS
+    from pathproblems.graph import graph_nodes, load_graph
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    print(f"Running additive FPTAS for the shortest path from {args.source} to {target}")
+    print(f"Epsilon = {args.epsilon}")
+
+    search_graph, expand_path = reduce_for_query(args, graph, target)
+    path, value = AdditiveFPTAS(search_graph, args.source, target, args.epsilon).run()
+    path = path and expand_path(path)
+    print_shortest_path(path, value)
+    return path
+
+def solve_ilp(args):
+    from pathproblems.graph import graph_nodes, load_graph, sort_nodes
+    from pathproblems.ilp import solve_min_weight_ilp, solve_rrp_ilp
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    edges = {(u, v): weights for u in graph for v, weights in graph[u].items()}
+    nodes = sort_nodes(graph_nodes(graph))
+    target = resolve_target(args, nodes)
+    if args.source not in nodes:
+        raise SystemExit(f"Source node {args.source} not found in graph")
+    if target not in nodes:
+        raise SystemExit(f"Target node {target} not found in graph")
+
+    if args.problem == 1:
+        print(f"Solving shortest path ILP from {args.source} to {target}")
+        result = solve_min_weight_ilp(edges, nodes, args.source, target, not args.no_presolve)
+        print_shortest_path(result and result['path'], result and result['total_weight'])
+    else:
+        print(f"Solving RRP ILP from {args.source} to {target}")
+        print(f"Maximum allowed penalty: {args.constraint}")
+        incumbent = upper_bound = None
+        if args.lagrangian:
+            larac = lagrangian_bound(graph, args.source, target, args.constraint)
+            if larac.best is not None:
+                incumbent, upper_bound = larac.best[2], larac.upper_bound
+        result = solve_rrp_ilp(edges, nodes, args.source, target, args.constraint, not args.no_presolve,
+                               incumbent, upper_bound)
+        print_result(result and (result['total_reward'], result['total_penalty'], result['path']), args.constraint)
+    return result and result['path']
+
+def solve_larac(args):
+    from pathproblems.graph import graph_nodes, load_graph
+    from pathproblems.lagrangian import LARAC_RRP
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    print(f"Running LARAC for RRP from {args.source} to {target}")
+    print(f"Constraint C = {args.constraint}")
+
+    try:
+        solver = LARAC_RRP(graph, args.source, target, args.constraint)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    result = solver.run()
+    if result is None:
+        print_result(None, args.constraint)
+        return None
+    print_result((result['total_reward'], result['total_penalty'], result['path']), args.constraint)
+    print(f"Upper bound: {result['upper_bound']:.2f} (gap {result['gap']:.2%}, "
+          f"multiplier {result['multiplier']}, {solver.iterations} iterations)")
+    return result['path']
+
+def solve_portfolio(args):
+    from pathproblems.graph import graph_nodes, load_graph
+    from pathproblems.portfolio import PortfolioRRP
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    target = resolve_target(args, graph_nodes(graph))
+    engines = args.engines.split(',')
+    print(f"Racing {', '.join(engines)} for RRP from {args.source} to {target}")
+    print(f"Constraint C = {args.constraint}, Epsilon = {args.epsilon}, Gap = {args.gap}")
+
+    try:
+        portfolio = PortfolioRRP(graph, args.source, target, args.constraint, args.epsilon, args.gap, engines)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    result = portfolio.solve(args.deadline)
+    for seconds, name, kind, value in portfolio.events:
+        if kind in ('incumbent', 'bound'):
+            print(f"{seconds:8.3f}s {name:>8} {kind} {value}")
+        elif kind == 'error':
+            print(f"{seconds:8.3f}s {name:>8} failed: {value}")
+    print_result(result['path'] and (result['total_reward'], result['total_penalty'], result['path']), args.constraint)
+    status = f"closed by {result['winner']}" if result['proven'] else "not closed"
+    print(f"Upper bound: {result['upper_bound']} (gap {result['gap']:.2%}, {status}, {result['seconds']:.3f}s)")
+    return result['path']
+
+def solve_ch(args):
+    import time
+
+    from pathproblems.ch import ParetoShortcutIndex, index_path
+    from pathproblems.graph import load_graph
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    path = args.index or index_path(args.input)
+    try:
+        index = ParetoShortcutIndex.load(path, graph)
+    except FileNotFoundError:
+        raise SystemExit(f"No index at {path}, build it with: pathproblems index --input {args.input}")
+    except ValueError as error:
+        raise SystemExit(str(error))
+    target = resolve_target(args, index.nodes)
+    print(f"Querying the contraction index for RRP from {args.source} to {target}")
+    print(f"Constraint C = {args.constraint}, Epsilon = {index.epsilon} (fixed when the index was built)")
+
+    start = time.perf_counter()
+    try:
+        result = index.query(args.source, target, args.constraint)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    print(f"Query: {index.search_space} labels in {time.perf_counter() - start:.4f}s")
+    print_result(result, args.constraint)
+    return result and result[2]
+
+def solve_orienteering(args):
+    from pathproblems.graph import graph_nodes, load_graph
+    from pathproblems.orienteering import Orienteering, load_prizes
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    nodes = graph_nodes(graph)
+    target = resolve_target(args, nodes)
+    # Without a prize file every node is worth one visit
+    prizes = load_prizes(args.prizes) if args.prizes else {node: 1 for node in nodes}
+    print(f"Running orienteering from {args.source} to {target}")
+    print(f"Travel budget = {args.constraint}")
+
+    try:
+        problem = Orienteering(graph, prizes, args.source, target, args.constraint)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    print(f"{len(problem.stops)} stops within the budget")
+    options = {'starts': args.starts, 'iterations': args.iterations, 'workers': args.workers}
+    if args.compare:
+        exact = problem.label_dp()
+        result = problem.local_search(**options)
+        if exact is not None and exact['prize'] > 0:
+            print(f"Local search: {result['prize']} of {exact['prize']} "
+                  f"({result['prize'] / exact['prize']:.2%} of the exact prize)")
+    else:
+        result = problem.solve(args.method, **options)
+    if result is None:
+        print("\nNo route reaches the target within the budget.")
+        return None
+    path = problem.expand(result['route'])
+    print(f"\nBest route ({result['method']}): {' -> '.join(result['route'])}")
+    print(f"Path: {' -> '.join(path)}")
+    print(f"Total prize: {result['prize']}")
+    print(f"Travel time: {result['time']}")
+    return path
+
+SOLVERS = {
+    'fptas': solve_fptas,
+    'scaling': solve_scaling,
+    'vector': solve_vector,
+    'dp': solve_dp,
+    'additive': solve_additive,
+    'ilp': solve_ilp,
+    'larac': solve_larac,
+    'portfolio': solve_portfolio,
+    'ch': solve_ch,
+    'orienteering': solve_orienteering,
+}
+
+def solve(args):
+    problems = ALGORITHM_PROBLEMS[args.algo]
+    if args.problem is None:
+        args.problem = problems[0]
+    elif args.problem not in problems:
+        raise SystemExit(f"--algo {args.algo} does not solve problem {args.problem}")
+
+    path = SOLVERS[args.algo](args)
+    if path and args.plot:
+        from pathproblems.graph import load_graph
+        from pathproblems.plot import plot_path
+
+        graph = load_graph(args.input, args.dims, args.catalog)
+        edges = {(u, v): weights for u in graph for v, weights in graph[u].items()}
+        plot_path(edges, path, title=f"{args.algo} path from {path[0]} to {path[-1]}")
+
+def generate(args):
+    from pathproblems.generate import generate_graph
+
+    filename, destination_node = generate_graph(args.nodes, args.edges, args.output, args.range, args.dims, args.seed,
+                                                 args.costs)
+    print(f"Graph data saved to {filename} with source: n0 and destination: {destination_node}")
+
+def build_index(args):
+    import time
+
+    from pathproblems.ch import ParetoShortcutIndex, index_path
+    from pathproblems.graph import load_graph
+
+    graph = load_graph(args.input, args.dims, args.catalog)
+    start = time.perf_counter()
+    index = ParetoShortcutIndex.build(graph, args.epsilon, args.max_shortcuts)
+    output = args.output or index_path(args.input)
+    index.save(output)
+    print(index.summary())
+    print(f"Built in {time.perf_counter() - start:.2f}s, saved to {output}")
+
+def catalog(args):
+    from pathproblems.columnar import GraphCatalog
+
+    graphs = GraphCatalog(args.catalog)
+    try:
+        if args.action == 'add':
+            if args.name is None or args.path is None:
+                raise SystemExit("catalog add needs NAME PATH")
+            entry = graphs.add(args.name, args.path, args.dims)
+            print(f"{args.name}@{entry['version']}: {entry['nodes']} nodes, {entry['edges']} edges ({entry['file']})")
+        elif args.action == 'remove':
+            if args.name is None:
+                raise SystemExit("catalog remove needs NAME or NAME@VERSION")
+            for entry in graphs.remove(args.name):
+                print(f"Removed {args.name.partition('@')[0]}@{entry['version']}")
+        else:
+            for name, versions in sorted(graphs.entries().items()):
+                for entry in versions:
+                    print(f"{name}@{entry['version']:<4} {entry['nodes']:>10} nodes {entry['edges']:>12} edges  "
+                          f"{entry['digest'][:12]}  {entry['source']}")
+    except ValueError as error:
+        raise SystemExit(str(error))
+
+def batch(args):
+    from pathproblems.batch import ShardQueue, read_queries, run_coordinator, run_worker
+
+    queue = ShardQueue(args.queue)
+    try:
+        if args.action == 'submit':
+            if args.queries is None:
+                raise SystemExit("batch submit needs --queries FILE")
+            queries = read_queries(args.queries, args.constraint)
+            job = queue.submit(args.input, queries, args.epsilon, args.shard_size, args.dims, args.catalog,
+                               args.max_attempts, args.lease)
+            print(f"Submitted {job['queries']} queries in {job['shards']} shards to {args.queue}")
+        elif args.action == 'work':
+            print(f"Completed {run_worker(args.queue, poll=args.poll)} shards")
+        elif args.action == 'run':
+            def progress(status, expired):
+                if expired:
+                    print(f"Requeued expired shards {expired}")
+                print(f"pending {status['pending']}, running {status['running']}, done {status['results']}, "
+                      f"failed {status['failed']}")
+
+            status = run_coordinator(args.queue, args.workers, args.poll, progress)
+            print(f"Finished: {status['results']} shards done, {status['failed']} failed")
+        elif args.action == 'status':
+            status = queue.status()
+            print(' '.join(f"{state} {count}" for state, count in status.items()))
+        else:
+            import json
+            import sys
+
+            output = open(args.output, 'w') if args.output else sys.stdout
+            try:
+                for result in queue.results():
+                    output.write(json.dumps(result) + '\n')
+            finally:
+                if args.output:
+                    output.close()
+    except (ValueError, FileNotFoundError, RuntimeError) as error:
+        raise SystemExit(str(error))
+
+def score(args):
+    import time
+
+    from pathproblems.columnar import load_csr
+    from pathproblems.scoring import PathScorer, encode_paths, read_paths
+
+    if args.catalog is not None:
+        from pathproblems.columnar import GraphCatalog
+
+        csr = GraphCatalog(args.catalog).open(args.input)
+    else:
+        csr = load_csr(args.input, args.dims)
+    scorer = PathScorer(csr)
+    if args.paths.endswith('.npz'):
+        import numpy as np
+
+        arrays = np.load(args.paths)
+        if 'offsets' in arrays:
+            ids, offsets = arrays['ids'], arrays['offsets']
+        else:
+            ids, offsets = arrays['paths'], None
+        paths = None
+    else:
+        paths = read_paths(args.paths)
+        ids, offsets = encode_paths(csr, paths)
+
+    start = time.perf_counter()
+    try:
+        result = scorer.score(ids, offsets, args.constraint)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    elapsed = time.perf_counter() - start
+    count = len(result['valid'])
+    print(f"Scored {count} paths in {elapsed:.3f}s")
+    print(f"Valid simple paths: {int(result['valid'].sum())}, missing edges: {int((~result['edges_exist']).sum())}, "
+          f"repeated nodes: {int((~result['simple']).sum())}")
+    if args.constraint is not None:
+        print(f"Within C = {args.constraint}: {int(result['feasible'].sum())}")
+    if args.output:
+        import csv
+
+        columns = [column for column in ('reward', 'penalty', 'edges_exist', 'simple', 'valid', 'feasible')
+                   if column in result]
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['path'] + columns)
+            for i in range(count):
+                writer.writerow([i] + [result[column][i].item() for column in columns])
+        print(f"Per-path results written to {args.output}")
+
+def profile(args):
+    import json
+
+    from pathproblems.profiler import SOLVERS, profile_sweep, report
+
+    solvers = args.solvers.split(',')
+    for name in solvers:
+        if name not in SOLVERS:
+            raise SystemExit(f"Unknown solver {name!r}, expected one of {', '.join(SOLVERS)}")
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    records = profile_sweep([int(n) for n in args.nodes.split(',')], [float(e) for e in args.epsilons.split(',')],
+                            solvers, args.density, args.constraint, args.repeat, args.top, args.seed)
+    if not records:
+        raise SystemExit("Every run failed")
+    print(report(records, args.top))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(records, f, indent=1)
+
+def serve(args):
+    from pathproblems.service import run_server
+
+    graphs = dict(spec.split('=', 1) for spec in args.graph)
+    run_server(args.host, args.port, graphs, args.workers, args.max_pending, args.cache_db, args.dims,
+               args.graph_root)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='pathproblems', description='Restricted path problem solvers')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solver = commands.add_parser('solve', help='Solve a single source-target query')
+    solver.add_argument('--algo', choices=sorted(SOLVERS), default='fptas', help='Solver to run')
+    solver.add_argument('--problem', type=int, choices=(1, 2), default=None,
+                        help='1 = shortest simple path, 2 = restricted rewarding path (default depends on --algo)')
+    add_graph_arguments(solver)
+    add_query_arguments(solver)
+    solver.add_argument('--budgets', type=str, default=None,
+                        help='Comma-separated budget per cost column (vector, default: --constraint for each)')
+    solver.add_argument('--all-targets', action='store_true',
+                        help='Print the best feasible path value to every node instead of one target (fptas)')
+    solver.add_argument('--details', action='store_true', help='Print the weight of every edge on the path (fptas)')
+    solver.add_argument('--deadline', type=float, default=None,
+                        help='Anytime mode: stop refining after this many seconds and report the best path so far (fptas, portfolio)')
+    solver.add_argument('--epsilon-schedule', type=str, default=None,
+                        help='Anytime mode: comma-separated epsilons, coarse to fine (fptas, default: 1.0 halved down to --epsilon)')
+    solver.add_argument('--max-memory', type=float, default=None, metavar='MIB',
+                        help='Cap resident label storage and spill cold frontiers to a scratch file (fptas)')
+    solver.add_argument('--scratch-dir', type=str, default=None,
+                        help='Directory for the --max-memory scratch file (default: system temp dir)')
+    solver.add_argument('--checkpoint', type=str, default=None, metavar='PATH',
+                        help='Save solver state to PATH.log / PATH.state while running (fptas, dp)')
+    solver.add_argument('--checkpoint-interval', type=float, default=60.0,
+                        help='Seconds between checkpoints (default: 60)')
+    solver.add_argument('--resume', action='store_true', help='Continue from the state saved under --checkpoint')
+    solver.add_argument('--workers', type=int, default=None,
+                        help='Relax each Bellman-Ford round in this many processes over shared memory (dp), '
+                             'or run the local search starts in this many processes (orienteering)')
+    solver.add_argument('--no-presolve', action='store_true',
+                        help='Build the MTZ model on the whole graph, without dropping irrelevant edges (ilp)')
+    solver.add_argument('--engine', choices=('python', 'jit'), default='python',
+                        help='Label loop implementation; jit needs Numba and falls back to python without it (fptas, dp)')
+    solver.add_argument('--max-hops', type=int, default=None, metavar='H',
+                        help='Only consider paths of at most H edges (fptas, dp)')
+    solver.add_argument('--by-hops', action='store_true',
+                        help='Print the best path for every hop limit up to --max-hops from one run (fptas, dp)')
+    solver.add_argument('--gap', type=float, default=0.0,
+                        help='Stop once the best path is within this relative gap of the best bound (portfolio)')
+    solver.add_argument('--engines', type=str, default='fptas,scaling,ilp',
+                        help='Comma-separated engines to race: fptas, scaling, ilp, larac (portfolio)')
+    solver.add_argument('--lagrangian', action='store_true',
+                        help='Run LARAC first: prune labels with its bound (fptas) or use it as cutoff and bound (ilp)')
+    solver.add_argument('--reduce', action='store_true',
+                        help='Prune edges that cannot lie on a feasible path and contract chains first '
+                             '(fptas, scaling, dp, additive)')
+    solver.add_argument('--index', type=str, default=None, metavar='PATH',
+                        help='Contraction index built by the index command (ch, default: INPUT.ch)')
+    solver.add_argument('--prizes', type=str, default=None, metavar='FILE',
+                        help='node,prize CSV of the node prizes (orienteering, default: 1 per node)')
+    solver.add_argument('--method', choices=('auto', 'exact', 'local'), default='auto',
+                        help='Exact label DP, local search, or exact only for few stops (orienteering)')
+    solver.add_argument('--starts', type=int, default=8, help='Local search starts (orienteering, default: 8)')
+    solver.add_argument('--iterations', type=int, default=200,
+                        help='Remove-and-repair steps per local search start (orienteering, default: 200)')
+    solver.add_argument('--compare', action='store_true',
+                        help='Run the exact DP and the local search and print the local prize against the exact one '
+                             '(orienteering)')
+    solver.add_argument('--plot', action='store_true', help='Plot the graph with the path highlighted')
+    solver.set_defaults(handler=solve)
+
+    generator = commands.add_parser('generate', help='Write a random graph CSV')
+    generator.add_argument('--nodes', type=int, default=20, help='Number of nodes in the graph (default: 20)')
+    generator.add_argument('--edges', type=int, default=100, help='Number of edges in the graph (default: 100)')
+    generator.add_argument('--range', type=int, default=10, help='Largest absolute edge weight (default: 10)')
+    generator.add_argument('--dims', type=int, choices=(1, 2), default=2, help='CSV layout to write')
+    generator.add_argument('--costs', type=int, default=1, help='Number of cost columns for --dims 2 (default: 1)')
+    generator.add_argument('--output', type=str, default='graph_data.csv', help='Output CSV file')
+    generator.add_argument('--seed', type=int, default=None, help='Random seed')
+    generator.set_defaults(handler=generate)
+
+    indexer = commands.add_parser('index', help='Build the contraction index used by solve --algo ch')
+    add_graph_arguments(indexer)
+    indexer.add_argument('--epsilon', type=float, default=0.1, help='Approximation parameter of the queries')
+    indexer.add_argument('--max-shortcuts', type=int, default=64,
+                         help='Leave nodes that would add more shortcuts than this in the core (default: 64)')
+    indexer.add_argument('--output', type=str, default=None, help='Index file (default: INPUT.ch)')
+    indexer.set_defaults(handler=build_index)
+
+    cataloger = commands.add_parser('catalog', help='Add, list or remove named graph versions in a catalog')
+    cataloger.add_argument('action', choices=('add', 'list', 'remove'), help='Catalog operation')
+    cataloger.add_argument('name', nargs='?', default=None, help='Graph name (NAME@VERSION for remove)')
+    cataloger.add_argument('path', nargs='?', default=None, help='CSV, Parquet or Arrow IPC file to add')
+    cataloger.add_argument('--catalog', type=str, required=True, metavar='DIR', help='Catalog directory')
+    cataloger.add_argument('--dims', type=int, choices=(1, 2), default=2, help='Layout of a CSV file to add')
+    cataloger.set_defaults(handler=catalog)
+
+    batcher = commands.add_parser('batch', help='Sharded FPTAS batch over a filesystem work queue')
+    batcher.add_argument('action', choices=('submit', 'work', 'run', 'status', 'collect'),
+                         help='submit queries, work on shards, run the coordinator, show status or collect results')
+    batcher.add_argument('--queue', type=str, required=True, metavar='DIR', help='Queue directory shared by all nodes')
+    add_graph_arguments(batcher)
+    batcher.add_argument('--queries', type=str, default=None,
+                         help='source,target[,constraint] CSV of the queries (submit)')
+    batcher.add_argument('--constraint', type=float, default=None,
+                         help='Penalty constraint for queries without a constraint column (submit)')
+    batcher.add_argument('--epsilon', type=float, default=0.1, help='Approximation parameter epsilon (submit)')
+    batcher.add_argument('--shard-size', type=int, default=1000, help='Queries per shard (submit, default: 1000)')
+    batcher.add_argument('--max-attempts', type=int, default=3,
+                         help='Attempts per shard before it is marked failed (submit, default: 3)')
+    batcher.add_argument('--lease', type=float, default=60.0,
+                         help='Seconds without progress before a claimed shard is retried (submit, default: 60)')
+    batcher.add_argument('--workers', type=int, default=0,
+                         help='Local worker processes started by the coordinator (run, default: 0)')
+    batcher.add_argument('--poll', type=float, default=0.5, help='Seconds between queue checks (work, run)')
+    batcher.add_argument('--output', type=str, default=None, help='JSON lines file of the results (collect)')
+    batcher.set_defaults(handler=batch)
+
+    scorer = commands.add_parser('score', help='Score and validate many paths at once with NumPy')
+    add_graph_arguments(scorer)
+    scorer.add_argument('--paths', type=str, required=True,
+                        help='One path per line (nodes separated by commas or ->), or an .npz file with ids and '
+                             'offsets arrays or a padded paths array (pad -1)')
+    scorer.add_argument('--constraint', type=float, default=None, help='Penalty budget C to check')
+    scorer.add_argument('--output', type=str, default=None, help='CSV file of the per-path results')
+    scorer.set_defaults(handler=score)
+
+    profiler = commands.add_parser('profile', help='Per-phase time and memory scaling of the solvers')
+    profiler.add_argument('--nodes', type=str, default='20,40,80',
+                          help='Comma-separated graph sizes in nodes (default: 20,40,80)')
+    profiler.add_argument('--density', type=int, default=5, help='Edges per node (default: 5)')
+    profiler.add_argument('--epsilons', type=str, default='0.5,0.25',
+                          help='Comma-separated epsilons; the first one is used for the size sweep (default: 0.5,0.25)')
+    profiler.add_argument('--solvers', type=str, default='fptas,ilp',
+                          help='Comma-separated solvers: fptas, dp, ilp (default: fptas,ilp; dp is slow beyond '
+                               '~40 nodes)')
+    profiler.add_argument('--constraint', type=float, default=20, help='Penalty constraint C (fptas, ilp)')
+    profiler.add_argument('--repeat', type=int, default=3,
+                          help='Timed runs per point, the best is kept (default: 3)')
+    profiler.add_argument('--top', type=int, default=5, help='Allocation sites and functions listed per phase')
+    profiler.add_argument('--seed', type=int, default=1, help='Random seed of the generated graphs')
+    profiler.add_argument('--json', type=str, default=None, help='Write the raw measurements to this file')
+    profiler.set_defaults(handler=profile)
+
+    server = commands.add_parser('serve', help='Run the asyncio query server')
+    server.add_argument('--host', type=str, default='127.0.0.1', help='Address to listen on')
+    server.add_argument('--port', type=int, default=8765, help='TCP port to listen on')
+    server.add_argument('--workers', type=int, default=None, help='Solver processes (default: CPU count)')
+    server.add_argument('--max-pending', type=int, default=64, help='Maximum distinct solves in flight')
+    server.add_argument('--graph', action='append', default=[], metavar='NAME=PATH',
+                        help='Graph to preload, may be repeated')
+    server.add_argument('--dims', type=int, choices=(1, 2), default=2, help='CSV layout of the graphs')
+    server.add_argument('--cache-db', type=str, default=None, help='Optional sqlite file for the result cache')
+    server.add_argument('--graph-root', type=str, default=None, metavar='DIR',
+                        help='Directory clients may load graph files from (default: none, only reloads)')
+    server.set_defaults(handler=serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Columnar graph input: Parquet and Arrow IPC files, and a catalog of named graphs.
+
+Edge tables have the columns ``source, target, reward, penalty`` (or ``source,
+target, weight`` like the dims=1 CSV layout). read_csr() maps them into a
+CSRGraph without going through Python tuples: node names are dictionary encoded
+by Arrow, the dictionary entries are interned in sort_nodes order, and the edges
+are ordered by (source id, target id) with NumPy. When a table is already in that
+order, as every catalog file is, the target, reward and penalty columns of the
+CSRGraph are views of the Arrow buffers (memory-mapped for IPC files) and no
+edge data is copied.
+
+GraphCatalog keeps such files under one directory, by name and version:
+
+    root/catalog.json            {"roads": [{"version": 1, "file": ..., ...}, ...]}
+    root/roads/v1.arrow          Arrow IPC file in CSR order
+
+add() stores a new version only when the edges changed, and open() maps the
+latest (or a given) version back into a CSRGraph.
+
+Arrow comes from pyarrow: pip install 'pathproblems[arrow]'.
+"""
+import json
+import os
+import re
+import time
+
+from pathproblems.csr import CSRGraph
+from pathproblems.graph import read_edges, sort_nodes
+
+SUFFIXES = ('.parquet', '.arrow', '.feather', '.ipc')
+MANIFEST = 'catalog.json'
+# Graph names become directory names under the catalog root
+NAME = re.compile(r'[A-Za-z0-9_][A-Za-z0-9_.-]*')
+
+def import_pyarrow():
+    """Import pyarrow on demand, with a readable error when it is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError as e:
+        raise ImportError("Columnar graph files need pyarrow: pip install 'pathproblems[arrow]'") from e
+    return pa, pc
+
+def read_table(path):
+    """Read an edge table; Arrow IPC files are memory-mapped."""
+    pa, _ = import_pyarrow()
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        # Keep the node names dictionary encoded as stored instead of expanding them to strings
+        return pq.read_table(path, memory_map=True, read_dictionary=['source', 'target'])
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+def _int64_view(column):
+    """Zero-copy memoryview of 64-bit integers over a NumPy array."""
+    return memoryview(column).cast('B').cast('q')
+
+def _weights(table, np):
+    """Reward and penalty columns as int64 NumPy arrays, from reward/penalty or a signed weight."""
+    names = table.column_names
+    if 'reward' in names and 'penalty' in names:
+        columns = [table.column('reward'), table.column('penalty')]
+    elif 'weight' in names:
+        columns = [table.column('weight')]
+    else:
+        raise ValueError(f"Invalid edge table {names}. Expected: source,target,reward,penalty or source,target,weight")
+    arrays = []
+    for column in columns:
+        if column.null_count:
+            raise ValueError("Edge weights must not be null")
+        values = column.combine_chunks().to_numpy(zero_copy_only=False)
+        if values.dtype.kind == 'f' and not np.all(values == np.round(values)):
+            raise ValueError("Edge weights must be integers")
+        arrays.append(values if values.dtype == np.int64 else values.astype(np.int64))
+    if len(arrays) == 1:
+        # split_weight() of the dims=1 layout, vectorized
+        weight = arrays[0]
+        return np.maximum(weight, 0), -np.minimum(weight, 0)
+    return arrays[0], arrays[1]
+
+def csr_from_table(table):
+    """Build a CSRGraph from an Arrow edge table (see the module docstring)."""
+    import numpy as np
+
+    pa, _ = import_pyarrow()
+    encoded = []
+    for name in ('source', 'target'):
+        column = table.column(name).combine_chunks()
+        if column.null_count:
+            raise ValueError(f"Edge table column {name} must not be null")
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        # Node names are strings, as in the CSV files; integer ids are read as their decimal form
+        encoded.append((column.indices.to_numpy(zero_copy_only=False),
+                        [str(name) for name in column.dictionary.to_pylist()]))
+
+    # Intern the names of both dictionaries; only the dictionaries go through Python, not the edges
+    nodes = sort_nodes(set(encoded[0][1]) | set(encoded[1][1]))
+    index = {node: i for i, node in enumerate(nodes)}
+    ids = []
+    for indices, dictionary in encoded:
+        if dictionary == nodes:
+            ids.append(indices.astype(np.int64, copy=False))
+        else:
+            ids.append(np.array([index[name] for name in dictionary], dtype=np.int64)[indices])
+    sources, targets = ids
+    rewards, penalties = _weights(table, np)
+
+    order = np.lexsort((targets, sources))
+    if not np.array_equal(order, np.arange(len(order))):
+        sources, targets, rewards, penalties = sources[order], targets[order], rewards[order], penalties[order]
+    # A repeated edge keeps its last row, like load_graph_from_csv()
+    last = np.ones(len(sources), dtype=bool)
+    last[:-1] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    if not last.all():
+        sources, targets, rewards, penalties = sources[last], targets[last], rewards[last], penalties[last]
+
+    offsets = np.searchsorted(sources, np.arange(len(nodes) + 1)).astype(np.int64)
+    return CSRGraph(nodes, _int64_view(offsets), _int64_view(np.ascontiguousarray(targets)),
+                    _int64_view(np.ascontiguousarray(rewards)), _int64_view(np.ascontiguousarray(penalties)))
+
+def read_csr(path):
+    """Read a Parquet or Arrow IPC edge file into a CSRGraph."""
+    return csr_from_table(read_table(path))
+
+def csr_to_table(csr):
+    """Arrow edge table of a CSRGraph in CSR order, with the node list as the shared dictionary."""
+    import numpy as np
+
+    pa, _ = import_pyarrow()
+    dictionary = pa.array(csr.nodes, pa.string())
+    counts = np.diff(np.frombuffer(csr.offsets, dtype=np.int64))
+    sources = np.repeat(np.arange(csr.num_nodes, dtype=np.int64), counts)
+    targets = np.frombuffer(csr.targets, dtype=np.int64)
+    return pa.table({
+        'source': pa.DictionaryArray.from_arrays(pa.array(sources), dictionary),
+        'target': pa.DictionaryArray.from_arrays(pa.array(targets), dictionary),
+        'reward': pa.array(np.frombuffer(csr.rewards, dtype=np.int64)),
+        'penalty': pa.array(np.frombuffer(csr.penalties, dtype=np.int64)),
+    })
+
+def load_csr(path, dims=2):
+    """CSRGraph of a columnar file, or of a CSV file in the given layout."""
+    if path.endswith(SUFFIXES):
+        return read_csr(path)
+    edges = list(read_edges(path, dims))
+    nodes = sort_nodes({u for u, _, _, _ in edges} | {v for _, v, _, _ in edges})
+    # Repeated edges keep their last row
+    return CSRGraph.from_edges(nodes, {(u, v): (u, v, r, p) for u, v, r, p in edges}.values())
+
+def edges_digest(csr):
+    """Content hash of a CSRGraph, the same for every file the edges were read from."""
+    import hashlib
+
+    import numpy as np
+
+    digest = hashlib.sha256()
+    digest.update('\n'.join(csr.nodes).encode())
+    for column in (csr.offsets, csr.targets, csr.rewards, csr.penalties):
+        digest.update(np.frombuffer(column, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+class GraphCatalog:
+    """Directory of named, versioned graphs stored as Arrow IPC files in CSR order."""
+    def __init__(self, root):
+        self.root = root
+        self.manifest = os.path.join(root, MANIFEST)
+
+    def entries(self):
+        """{name: [version entries, oldest first]} from the manifest."""
+        if not os.path.exists(self.manifest):
+            return {}
+        with open(self.manifest, 'r') as f:
+            return json.load(f)
+
+    def add(self, name, path, dims=2):
+        """Store the graph of a CSV, Parquet or Arrow file as the next version of name.
+
+        Returns the version entry; if the edges equal the latest version, that entry is
+        returned and nothing is written.
+        """
+        if not NAME.fullmatch(name) or name == MANIFEST:
+            raise ValueError(f"Invalid graph name {name!r}: use letters, digits, '_', '-' and '.', "
+                             f"not starting with '.' or '-'")
+        pa, _ = import_pyarrow()
+        csr = load_csr(path, dims)
+        digest = edges_digest(csr)
+        entries = self.entries()
+        versions = entries.setdefault(name, [])
+        if versions and versions[-1]['digest'] == digest:
+            return versions[-1]
+
+        version = versions[-1]['version'] + 1 if versions else 1
+        filename = os.path.join(name, f'v{version}.arrow')
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        table = csr_to_table(csr)
+        temporary = os.path.join(self.root, filename + '.tmp')
+        with pa.OSFile(temporary, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporary, os.path.join(self.root, filename))
+
+        entry = {'version': version, 'file': filename, 'digest': digest, 'nodes': csr.num_nodes,
+                 'edges': csr.num_edges, 'source': os.path.abspath(path), 'added': time.time()}
+        versions.append(entry)
+        self.write(entries)
+        return entry
+
+    def write(self, entries):
+        temporary = self.manifest + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(entries, f, indent=1)
+        os.replace(temporary, self.manifest)
+
+    def resolve(self, spec):
+        """Version entry of NAME or NAME@VERSION (the latest version without one)."""
+        name, _, version = spec.partition('@')
+        versions = self.entries().get(name)
+        if not versions:
+            raise ValueError(f"No graph named {name!r} in the catalog at {self.root}")
+        if not version:
+            return versions[-1]
+        for entry in versions:
+            if str(entry['version']) == version:
+                return entry
+        raise ValueError(f"Graph {name!r} has no version {version} (versions: "
+                         f"{', '.join(str(entry['version']) for entry in versions)})")
+
+    def open(self, spec):
+        """Memory-map NAME or NAME@VERSION into a CSRGraph."""
+        return read_csr(os.path.join(self.root, self.resolve(spec)['file']))
+
+    def remove(self, spec):
+        """Drop one version (NAME@VERSION) or every version (NAME) of a graph."""
+        name, _, version = spec.partition('@')
+        entries = self.entries()
+        dropped = [entry for entry in entries.get(name, []) if not version or str(entry['version']) == version]
+        if not dropped:
+            raise ValueError(f"No graph {spec!r} in the catalog at {self.root}")
+        entries[name] = [entry for entry in entries[name] if entry not in dropped]
+        if not entries[name]:
+            del entries[name]
+        self.write(entries)
+        for entry in dropped:
+            os.remove(os.path.join(self.root, entry['file']))
+        return dropped
@@ -0,0 +1,91 @@
+"""Compressed sparse row (CSR) form of a (reward, penalty) graph.
+
+Node names are interned to ids 0..n-1 (in sort_nodes order), and the out-edges of
+node u are the edge ids offsets[u] to offsets[u+1] - 1. The columns are stdlib
+arrays of 64-bit integers, so NumPy can wrap them without copying
+(numpy.frombuffer(csr.targets, dtype=numpy.int64)).
+"""
+from array import array
+
+from pathproblems.graph import graph_nodes, sort_nodes
+
+class CSRGraph:
+    def __init__(self, nodes, offsets, targets, rewards, penalties):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = offsets
+        self.targets = targets
+        self.rewards = rewards
+        self.penalties = penalties
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        """Build from node names and (u, v, reward, penalty) tuples with u, v names."""
+        index = {node: i for i, node in enumerate(nodes)}
+        rows = sorted((index[u], index[v], reward, penalty) for u, v, reward, penalty in edges)
+
+        offsets = array('q', [0] * (len(nodes) + 1))
+        for u, _, _, _ in rows:
+            offsets[u + 1] += 1
+        for u in range(len(nodes)):
+            offsets[u + 1] += offsets[u]
+
+        return cls(
+            nodes, offsets,
+            array('q', (v for _, v, _, _ in rows)),
+            array('q', (reward for _, _, reward, _ in rows)),
+            array('q', (penalty for _, _, _, penalty in rows)),
+        )
+
+    @classmethod
+    def from_dict(cls, graph):
+        """Build from a graph[u][v] = (reward, penalty) dictionary."""
+        edges = [(u, v, reward, penalty) for u in graph for v, (reward, penalty) in graph[u].items()]
+        return cls.from_edges(sort_nodes(graph_nodes(graph)), edges)
+
+    def to_dict(self):
+        """Convert back to the graph[u][v] = (reward, penalty) dictionary used by the label solvers."""
+        graph = {node: {} for node in self.nodes}
+        for u, node in enumerate(self.nodes):
+            for e in range(self.offsets[u], self.offsets[u + 1]):
+                graph[node][self.nodes[self.targets[e]]] = (self.rewards[e], self.penalties[e])
+        return graph
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def out_edges(self, u):
+        """Edge ids leaving node id u."""
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def edge_sources(self):
+        """Tail node id of every edge, as an array aligned with targets."""
+        sources = array('q', bytes(8 * self.num_edges))
+        for u in range(self.num_nodes):
+            for e in self.out_edges(u):
+                sources[e] = u
+        return sources
+
+    def reverse(self):
+        """Return (reverse CSR, edge_map) where reverse edge i is forward edge edge_map[i]."""
+        sources = self.edge_sources()
+        order = sorted(range(self.num_edges), key=lambda e: (self.targets[e], sources[e]))
+
+        offsets = array('q', [0] * (self.num_nodes + 1))
+        for e in order:
+            offsets[self.targets[e] + 1] += 1
+        for v in range(self.num_nodes):
+            offsets[v + 1] += offsets[v]
+
+        reverse = CSRGraph(
+            self.nodes, offsets,
+            array('q', (sources[e] for e in order)),
+            array('q', (self.rewards[e] for e in order)),
+            array('q', (self.penalties[e] for e in order)),
+        )
+        return reverse, array('q', order)
@@ -0,0 +1,126 @@
+"""Dynamic (reward, penalty) graph with incremental FPTAS_RRP re-solves."""
+from collections import defaultdict
+
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.graph import load_graph_from_csv
+
+class DynamicGraph:
+    """Mutable 2D graph that logs edge changes so solvers can repair their labels."""
+    def __init__(self, graph=None):
+        self.graph = {}  # graph[u][v] = (reward, penalty), every endpoint is a key
+        self.predecessors = defaultdict(set)  # predecessors[v] = {u : (u, v) is an edge}
+        self.version = 0
+        self.change_log = []  # List of (version, (u, v)) in modification order
+
+        if graph:
+            for u in graph:
+                for v, (reward, penalty) in graph[u].items():
+                    self._set_edge(u, v, reward, penalty)
+
+    @classmethod
+    def from_csv(cls, filename, dims=2):
+        """Load a dynamic graph from a graph CSV file."""
+        return cls(load_graph_from_csv(filename, dims))
+
+    def _set_edge(self, u, v, reward, penalty):
+        self.graph.setdefault(u, {})
+        self.graph.setdefault(v, {})
+        self.graph[u][v] = (reward, penalty)
+        self.predecessors[v].add(u)
+
+    def _record(self, u, v):
+        self.version += 1
+        self.change_log.append((self.version, (u, v)))
+
+    def has_edge(self, u, v):
+        return u in self.graph and v in self.graph[u]
+
+    def add_edge(self, u, v, reward, penalty):
+        """Insert a new edge (u, v)."""
+        if self.has_edge(u, v):
+            raise ValueError(f"Edge {u} -> {v} already exists, use update_edge")
+        self._set_edge(u, v, reward, penalty)
+        self._record(u, v)
+
+    def update_edge(self, u, v, reward, penalty):
+        """Change the reward and penalty of an existing edge (u, v)."""
+        if not self.has_edge(u, v):
+            raise ValueError(f"Edge {u} -> {v} not found in graph")
+        if self.graph[u][v] == (reward, penalty):
+            return
+        self.graph[u][v] = (reward, penalty)
+        self._record(u, v)
+
+    def remove_edge(self, u, v):
+        """Delete edge (u, v). Its endpoints stay in the graph."""
+        if not self.has_edge(u, v):
+            raise ValueError(f"Edge {u} -> {v} not found in graph")
+        del self.graph[u][v]
+        self.predecessors[v].discard(u)
+        self._record(u, v)
+
+    def changes_since(self, version):
+        """Return the set of edges modified after the given version."""
+        return {edge for edge_version, edge in self.change_log if edge_version > version}
+
+class IncrementalFPTAS_RRP(FPTAS_RRP):
+    """FPTAS_RRP that keeps its per-node Pareto sets between runs and only
+    recomputes the labels downstream of edges changed in the DynamicGraph."""
+    def __init__(self, dynamic_graph, source, target, constraint_C, epsilon):
+        super().__init__(dynamic_graph.graph, source, target, constraint_C, epsilon)
+        self.dynamic_graph = dynamic_graph
+        self.pareto_sets = None
+        self.solved_version = None
+
+    def run(self):
+        """Solve from scratch on the first call, repair the previous labels afterwards."""
+        if self.pareto_sets is None or len(self.graph) != self.n:
+            # The bucket width depends on n, so new nodes require a full solve
+            self.nodes = set(self.graph)
+            self.n = len(self.nodes)
+            self.set_epsilon(self.epsilon)
+            self.pareto_sets = self.initial_pareto_sets()
+            self.propagate(self.pareto_sets, [self.source])
+        else:
+            changed_edges = self.dynamic_graph.changes_since(self.solved_version)
+            if changed_edges:
+                self.repair(changed_edges)
+
+        self.solved_version = self.dynamic_graph.version
+        return self.best_result(self.pareto_sets)
+
+    def repair(self, changed_edges):
+        """Drop every label whose path uses a changed edge and re-propagate around the gaps."""
+        stale_memo = {}
+        touched_nodes = set()
+
+        for node, buckets in self.pareto_sets.items():
+            for bucket, label in list(buckets.items()):
+                if self.is_stale(label, changed_edges, stale_memo):
+                    del buckets[bucket]
+                    touched_nodes.add(node)
+
+        # Buckets emptied at a node can be refilled from any of its predecessors,
+        # and the tail of a changed edge must re-extend its labels over it.
+        start_nodes = {u for u, v in changed_edges if u in self.graph}
+        for node in touched_nodes:
+            start_nodes.update(self.dynamic_graph.predecessors[node])
+        start_nodes = [node for node in start_nodes if self.pareto_sets[node]]
+
+        self.propagate(self.pareto_sets, start_nodes)
+
+    @staticmethod
+    def is_stale(label, changed_edges, memo):
+        """Check whether any edge on the label's path is in changed_edges."""
+        # Walk up to the first label with a known answer, then fill the chain top-down
+        chain = []
+        current = label
+        while current is not None and id(current) not in memo:
+            chain.append(current)
+            current = current.pred
+        stale = memo[id(current)] if current is not None else False
+
+        for chain_label in reversed(chain):
+            stale = stale or chain_label.last_edge in changed_edges
+            memo[id(chain_label)] = stale
+        return memo[id(label)]
@@ -0,0 +1,460 @@
+"""FPTAS for the Restricted Rewarding Path problem on (reward, penalty) graphs.
+
+Labels are kept per node in buckets of geometrically growing reward, so every
+node stores at most one label per (1 + delta) reward interval.
+
+solve() is the anytime variant: it runs one pass per epsilon of a coarse-to-fine
+schedule until a deadline and returns the best path found together with the
+epsilon of the finest completed pass.
+"""
+import math
+import time
+from collections import deque
+
+from pathproblems.graph import graph_nodes, sort_nodes
+from pathproblems.labels import PathLabel
+
+class TargetTable:
+    """Best feasible label from the source to every node, as NumPy columns.
+
+    Row i describes nodes[i]: reward and penalty are NaN for unreachable nodes,
+    and pred is the row of the previous node on the best path (-1 for the source
+    and unreachable nodes). pred only gives the last hop, since the best path to
+    a node need not extend the best path to its predecessor; use path() for the
+    full node sequence.
+    """
+    def __init__(self, nodes, reward, penalty, pred, labels):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.reward = reward
+        self.penalty = penalty
+        self.pred = pred
+        self.labels = labels
+
+    @property
+    def reachable(self):
+        """Boolean mask of the nodes with a feasible path from the source."""
+        import numpy as np
+
+        return ~np.isnan(self.reward)
+
+    def path(self, node):
+        """Full best path from the source to node ([] if unreachable)."""
+        label = self.labels[self.index[node]]
+        if label is None:
+            return []
+        # The source label has no edge to rebuild the path from
+        return label.reconstruct_path() or [node]
+
+    def __len__(self):
+        return len(self.nodes)
+
+class FPTAS_RRP:
+    def __init__(self, graph, source, target, constraint_C, epsilon, max_memory=None, scratch_dir=None,
+                 engine="python", max_hops=None):
+        """Initialize the FPTAS algorithm for the RRP problem.
+
+        With max_memory (bytes), run() caps resident label storage and spills cold
+        frontiers to a scratch file in scratch_dir (see pathproblems.spill).
+        engine="jit" runs the label loop compiled with Numba when it is installed
+        (see pathproblems.jit); the answer is the same as with engine="python".
+        Setting label_bound to a solved pathproblems.lagrangian.LARAC_RRP makes run()
+        skip labels that cannot beat its feasible path, which it returns if better.
+
+        With max_hops, only paths of at most max_hops edges are searched. Labels are
+        then kept per (hops, bucket) and delta = epsilon / max_hops, so the work
+        grows with max_hops instead of n, and run_by_hops() returns the best path
+        for every smaller hop limit too.
+        """
+        if engine not in ("python", "jit"):
+            raise ValueError(f"Unknown engine {engine!r}, expected 'python' or 'jit'")
+        if max_hops is not None and max_hops < 0:
+            raise ValueError(f"max_hops must be at least 0, got {max_hops}")
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.C = constraint_C
+        self.nodes = graph_nodes(graph)
+        self.n = len(self.nodes)
+        self.max_hops = max_hops
+        self.set_epsilon(epsilon)
+        # Optional pruning used by solve(): min penalty from each node to the target
+        # and a valid upper bound on the reward of any feasible path (LARAC or ILP)
+        self.penalty_to_target = None
+        self.reward_cap = math.inf
+        self.label_bound = None
+        self.max_memory = max_memory
+        self.scratch_dir = scratch_dir
+        self.spill_stats = None
+        self.engine = engine
+    
+    def set_epsilon(self, epsilon):
+        """Set epsilon and the bucket width delta = epsilon / max_edges for the current node count."""
+        self.epsilon = epsilon
+        # Edges on the longest path searched
+        self.max_edges = max(1, self.n - 1 if self.max_hops is None else min(self.max_hops, self.n - 1))
+        self.delta = epsilon / self.max_edges
+
+    def get_bucket(self, reward):
+        """Determine which bucket a reward value belongs to."""
+        if reward <= 0:
+            return 0
+        return math.floor(math.log(reward, 1 + self.delta))
+    
+    def run(self, checkpoint=None):
+        """Run the FPTAS algorithm to find the approximate optimal path.
+
+        With a pathproblems.checkpoint.Checkpoint, the labels and the queue are saved
+        periodically and a run started with resume=True continues from the last save.
+        """
+        if self.max_hops is not None and (self.max_memory is not None or checkpoint is not None):
+            raise ValueError("max_hops is not supported together with max_memory or checkpoints")
+        if self.max_memory is not None:
+            if checkpoint is not None:
+                raise ValueError("Checkpoints are not supported together with max_memory")
+            from pathproblems.spill import run_with_spill
+
+            return self.bounded(run_with_spill(self, self.max_memory, self.scratch_dir))
+        if self.engine == "jit" and checkpoint is None and self.label_bound is None and self.max_hops is None:
+            from pathproblems import jit
+
+            if jit.available():
+                return jit.run_rrp(self)
+        # Dictionary to store labels for each node and bucket
+        # Format: pareto_sets[node][bucket] = PathLabel
+        pareto_sets = self.initial_pareto_sets()
+        start_nodes = [self.source]
+        if checkpoint is not None:
+            start_nodes = self.restore(pareto_sets, checkpoint)
+        self.propagate(pareto_sets, start_nodes, checkpoint=checkpoint)
+        return self.bounded(self.best_result(pareto_sets))
+
+    def bounded(self, result):
+        """Return the better of result and the feasible path of self.label_bound."""
+        if self.label_bound is None or self.label_bound.best is None:
+            return result
+        incumbent = self.label_bound.best
+        if result is None or (incumbent[0], -incumbent[1]) > (result[0], -result[1]):
+            return incumbent
+        return result
+
+    def restore(self, pareto_sets, checkpoint):
+        """Load the last saved labels into pareto_sets; returns the queue to continue with."""
+        from pathproblems.checkpoint import query_fingerprint
+
+        checkpoint.bind(sort_nodes(self.nodes),
+                        query_fingerprint(self.graph, 'rrp', self.source, self.target, self.C, self.epsilon))
+        root = pareto_sets[self.source][0]
+        resumed = checkpoint.start(root)
+        if resumed is None:
+            checkpoint.record(self.source, 0, root)
+            return [self.source]
+        _, queue, assignments = resumed
+        for node, bucket, label in assignments:
+            pareto_sets[node][bucket] = label
+        return queue
+
+    def initial_pareto_sets(self):
+        """Create empty label sets with the empty path stored at the source."""
+        pareto_sets = {node: {} for node in self.nodes}
+        
+        # Initialize the source node with an empty path
+        initial_label = PathLabel(0, 0, None, None)
+        initial_label.visited_nodes.add(self.source)  # Add source node to visited set
+        pareto_sets[self.source][0 if self.max_hops is None else (0, 0)] = initial_label
+        return pareto_sets
+    
+    def propagate(self, pareto_sets, start_nodes, deadline=None, checkpoint=None):
+        """Extend the labels of start_nodes until no bucket can be improved.
+
+        Returns False if time.monotonic() passed deadline before the search finished.
+        """
+        to_target = self.penalty_to_target
+        label_bound = self.label_bound
+        max_hops = self.max_hops
+        # Queue for nodes to process
+        queue = deque(start_nodes)
+        in_queue = set(start_nodes)
+        
+        while queue:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save(queue=queue)
+            node = queue.popleft()
+            in_queue.remove(node)
+            
+            # Process each label at the current node
+            for bucket, label in list(pareto_sets[node].items()):
+                reward, penalty = label.reward, label.penalty
+                if max_hops is not None and label.hops >= max_hops:
+                    continue
+                
+                # Process each neighbor
+                for neighbor, (edge_reward, edge_penalty) in self.graph.get(node, {}).items():
+                    # O(1) cycle check using the visited_nodes set
+                    if neighbor in label.visited_nodes:
+                        continue
+                    
+                    # Calculate new reward and penalty
+                    new_reward = reward + edge_reward
+                    new_penalty = penalty + edge_penalty
+                    
+                    # Skip if the new penalty exceeds the constraint
+                    if new_penalty > self.C:
+                        continue
+                    # Skip if the target is out of budget or the reward beats the upper bound
+                    if to_target is not None and (new_penalty + to_target[neighbor] > self.C or
+                                                  new_reward > self.reward_cap):
+                        continue
+                    # Skip if the Lagrangian bound rules out beating its feasible path
+                    if label_bound is not None and label_bound.prunes(neighbor, new_reward, new_penalty):
+                        continue
+                    
+                    # Get the bucket for the new reward
+                    new_bucket = self.get_bucket(new_reward)
+                    
+                    # Check if we already have a path for this bucket
+                    is_dominated = False
+                    
+                    if max_hops is not None:
+                        # A label with as few hops can be extended at least as far
+                        hops = label.hops + 1
+                        is_dominated = any(
+                            (h, new_bucket) in pareto_sets[neighbor] and
+                            pareto_sets[neighbor][h, new_bucket].penalty <= new_penalty for h in range(hops + 1))
+                        new_bucket = (hops, new_bucket)
+                    elif new_bucket in pareto_sets[neighbor]:
+                        existing_label = pareto_sets[neighbor][new_bucket]
+                        if existing_label.penalty <= new_penalty:
+                            is_dominated = True
+                    
+                    if not is_dominated:
+                        # Create a new label for the extended path
+                        new_label = PathLabel(new_reward, new_penalty, label, (node, neighbor), label.visited_nodes)
+                        pareto_sets[neighbor][new_bucket] = new_label
+                        if checkpoint is not None:
+                            checkpoint.record(neighbor, new_bucket, new_label)
+                        
+                        # Add the neighbor to the queue for processing
+                        if neighbor not in in_queue:
+                            queue.append(neighbor)
+                            in_queue.add(neighbor)
+        if checkpoint is not None:
+            checkpoint.save()
+        return True
+    
+    def solve(self, deadline=None, epsilon_schedule=None, on_pass=None):
+        """Anytime solve: one pass per epsilon in epsilon_schedule until deadline seconds have passed.
+
+        The default schedule halves epsilon from 1.0 down to self.epsilon. Passes
+        skip labels that cannot reach the target within the budget. A pass does not
+        bound OPT, since the visited-set check drops labels heuristically, so the
+        upper_bound is the one of label_bound, or else of a LARAC_RRP run first,
+        whose feasible path also becomes an incumbent. on_pass(result) may lower it,
+        and passes skip labels whose reward exceeds it. Rewards are assumed
+        non-negative.
+
+        on_pass(result) is called after every completed pass and may offer a better
+        path or a lower valid upper_bound found elsewhere by updating result in place.
+        With max_memory or engine="jit", every pass is a run() and the deadline is
+        only checked between passes.
+
+        Returns a dict with path, total_reward, total_penalty (path is None if no
+        feasible path is known), epsilon (of the finest completed pass, None if none
+        completed), upper_bound on the optimal reward (inf if none is known),
+        guarantee = total_reward / upper_bound (0.0 without a bound), and passes:
+        (epsilon, completed, seconds) per pass started.
+        """
+        from pathproblems.csr import CSRGraph
+        from pathproblems.lagrangian import LARAC_RRP
+        from pathproblems.reduce import min_penalty_distances
+        from pathproblems.scaling import ScalingFPTAS_RRP
+
+        start = time.monotonic()
+        stop = start + deadline if deadline is not None else None
+        if epsilon_schedule is None:
+            epsilon_schedule = []
+            epsilon = 1.0
+            while epsilon > self.epsilon:
+                epsilon_schedule.append(epsilon)
+                epsilon /= 2
+            epsilon_schedule.append(self.epsilon)
+
+        result = {'path': None, 'total_reward': 0, 'total_penalty': math.inf, 'epsilon': None,
+                  'upper_bound': math.inf, 'guarantee': 0.0, 'passes': []}
+        if self.label_bound is not None:
+            result['upper_bound'] = self.label_bound.upper_bound
+        csr = CSRGraph.from_dict(self.graph)
+        if self.source not in csr.index or self.target not in csr.index:
+            return result
+        reverse, _ = csr.reverse()
+        distances = min_penalty_distances(reverse, csr.index[self.target])
+        if distances[csr.index[self.source]] > self.C:
+            result['upper_bound'] = 0
+            return result
+
+        def offer(reward, penalty, path):
+            if (reward, -penalty) > (result['total_reward'], -result['total_penalty']):
+                result.update(path=path, total_reward=reward, total_penalty=penalty)
+
+        # The min-penalty path is the first incumbent, so there is an answer even if no pass completes
+        label = ScalingFPTAS_RRP(self.graph, self.source, self.target, self.C, self.epsilon).min_penalty_path()
+        path = label.reconstruct_path()
+        if self.max_hops is None or len(path) - 1 <= self.max_hops:
+            offer(label.reward, label.penalty, path)
+        if self.label_bound is None:
+            # The LARAC bound relaxes the hop limit too, so it holds with max_hops
+            larac = LARAC_RRP(self.graph, self.source, self.target, self.C).run()
+            if larac is not None:
+                result['upper_bound'] = larac['upper_bound']
+                if self.max_hops is None or len(larac['path']) - 1 <= self.max_hops:
+                    offer(larac['total_reward'], larac['total_penalty'], larac['path'])
+
+        def reward_cap():
+            # Slack so that float rounding in the bound never prunes an optimal label
+            return result['upper_bound'] + 1e-6 * (1 + abs(result['upper_bound']))
+
+        epsilon = self.epsilon
+        self.penalty_to_target = {node: distances[i] for i, node in enumerate(csr.nodes)}
+        self.reward_cap = reward_cap()
+        try:
+            for pass_epsilon in epsilon_schedule:
+                if stop is not None and time.monotonic() > stop:
+                    break
+                pass_start = time.monotonic()
+                self.set_epsilon(pass_epsilon)
+                if self.max_memory is not None or self.engine == "jit":
+                    # Spilling and compiled passes run to the end
+                    best = self.run()
+                    completed = True
+                else:
+                    pareto_sets = self.initial_pareto_sets()
+                    completed = self.propagate(pareto_sets, [self.source], stop)
+                    best = self.bounded(self.best_result(pareto_sets))
+                if best:
+                    offer(*best)
+                result['passes'].append((pass_epsilon, completed, time.monotonic() - pass_start))
+                if not completed:
+                    break
+
+                if result['epsilon'] is None or pass_epsilon < result['epsilon']:
+                    result['epsilon'] = pass_epsilon
+                if on_pass is not None:
+                    on_pass(result)
+                self.reward_cap = reward_cap()
+        finally:
+            self.set_epsilon(epsilon)
+            self.penalty_to_target = None
+            self.reward_cap = math.inf
+
+        if result['upper_bound'] == 0:
+            result['guarantee'] = 1.0
+        elif result['upper_bound'] < math.inf:
+            result['guarantee'] = min(1.0, result['total_reward'] / result['upper_bound'])
+        return result
+
+    def best_result(self, pareto_sets):
+        """Return (reward, penalty, path) of the best feasible label at the target, or None."""
+        # Find the best path to the target that satisfies the constraint
+        best_reward = 0
+        best_label = None
+        best_penalty = float('inf')
+        
+        for bucket, label in pareto_sets.get(self.target, {}).items():
+            if label.penalty <= self.C and label.reward > best_reward:
+                best_reward = label.reward
+                best_penalty = label.penalty
+                best_label = label
+            # Break ties in favor of lower penalty
+            elif label.penalty <= self.C and label.reward == best_reward and label.penalty < best_penalty:
+                best_penalty = label.penalty
+                best_label = label
+        
+        if best_label:
+            best_path = best_label.reconstruct_path()
+            return (best_reward, best_penalty, best_path)
+        else:
+            return None
+        
+    def run_by_hops(self):
+        """Search once with max_hops and return the best (reward, penalty, path) or None for
+        every hop limit 0..max_hops, as a list indexed by the hop limit."""
+        if self.max_hops is None:
+            raise ValueError("run_by_hops() needs max_hops")
+        pareto_sets = self.initial_pareto_sets()
+        self.propagate(pareto_sets, [self.source])
+        best_by_hops = []
+        best = None
+        # Limits above n - 1 find nothing new, but the list still covers every limit asked for
+        for hops in range(self.max_hops + 1):
+            for (label_hops, _), label in pareto_sets.get(self.target, {}).items():
+                if label_hops == hops and label.penalty <= self.C and label.reward >= 0 and (
+                        best is None or (label.reward, -label.penalty) > (best.reward, -best.penalty)):
+                    best = label
+            best_by_hops.append(best and (best.reward, best.penalty, best.reconstruct_path()))
+        return best_by_hops
+
+    def target_frontier(self, pareto_sets):
+        """Return every (reward, penalty, path) label kept at the target, sorted by penalty."""
+        frontier = [(label.reward, label.penalty, label.reconstruct_path())
+                    for label in pareto_sets.get(self.target, {}).values()]
+        frontier.sort(key=lambda entry: (entry[1], -entry[0]))
+        return frontier
+        
+    def run_all_targets(self):
+        """Solve once from the source and return a TargetTable with the best label of every node."""
+        pareto_sets = self.initial_pareto_sets()
+        self.propagate(pareto_sets, [self.source])
+        return self.target_table(pareto_sets)
+
+    def target_table(self, pareto_sets):
+        """Pick the best feasible label per node with the same rule as best_result, as NumPy arrays."""
+        import numpy as np
+
+        nodes = sort_nodes(self.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        reward = np.full(len(nodes), np.nan)
+        penalty = np.full(len(nodes), np.nan)
+        pred = np.full(len(nodes), -1, dtype=np.int64)
+        labels = [None] * len(nodes)
+
+        for node, buckets in pareto_sets.items():
+            best_label = None
+            for label in buckets.values():
+                if label.penalty > self.C:
+                    continue
+                # Highest reward, ties broken in favor of lower penalty
+                if best_label is None or (label.reward, -label.penalty) > (best_label.reward, -best_label.penalty):
+                    best_label = label
+            if best_label is None:
+                continue
+
+            i = index[node]
+            reward[i] = best_label.reward
+            penalty[i] = best_label.penalty
+            if best_label.last_edge is not None:
+                pred[i] = index[best_label.last_edge[0]]
+            labels[i] = best_label
+
+        return TargetTable(nodes, reward, penalty, pred, labels)
+
+    def print_path_details(self, path):
+        """Print detailed information about a path, including edge weights."""
+        if not path or len(path) < 2:
+            return
+            
+        print("\nDetailed path information:")
+        total_reward = 0
+        total_penalty = 0
+        
+        for i in range(len(path) - 1):
+            u, v = path[i], path[i+1]
+            edge_reward, edge_penalty = self.graph[u][v]
+            
+            print(f"  {u} -> {v}: +{edge_reward} (reward), {edge_penalty} (penalty)")
+            total_reward += edge_reward
+            total_penalty += edge_penalty
+        
+        print(f"\nSum of rewards: {total_reward}")
+        print(f"Sum of penalties: {total_penalty}")
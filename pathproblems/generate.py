@@ -0,0 +1,40 @@
+"""Random graph generators writing the CSV layouts read by pathproblems.graph."""
+import csv
+import random
+
+def generate_graph(num_nodes, num_edges, filename="graph_data.csv", weight_range=10, dims=2, seed=None,
+                   num_costs=1):
+    """Write a random simple digraph on n0..n{num_nodes-1} and return (filename, destination node).
+
+    dims=1 draws signed weights in [-weight_range, weight_range]; dims=2 draws
+    the reward and num_costs cost columns independently in [0, weight_range].
+    """
+    if num_edges > num_nodes * (num_nodes - 1):
+        raise ValueError(f"A simple digraph on {num_nodes} nodes has at most {num_nodes * (num_nodes - 1)} edges")
+
+    rng = random.Random(seed)
+    nodes = [f'n{i}' for i in range(num_nodes)]
+    edges = []
+    seen = set()
+
+    while len(edges) < num_edges:
+        u = rng.choice(nodes)
+        v = rng.choice(nodes)
+        if u != v and (u, v) not in seen:
+            seen.add((u, v))
+            if dims == 1:
+                edges.append((u, v, rng.randint(-weight_range, weight_range)))
+            else:
+                edges.append((u, v) + tuple(rng.randint(0, weight_range) for _ in range(1 + num_costs)))
+
+    destination_node = nodes[-1]  # The last node is the destination
+
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        if dims == 1:
+            writer.writerow(["source", "target", "weight"])
+        else:
+            writer.writerow(["source", "target", "reward", "penalty"] + [f"cost{j}" for j in range(2, num_costs + 1)])
+        writer.writerows(edges)
+
+    return filename, destination_node
@@ -0,0 +1,100 @@
+"""Graph input for the path solvers.
+
+Two CSV layouts are supported:
+
+* ``dims=2``: ``source,target,reward,penalty``
+* ``dims=1``: ``source,target,weight``, where a positive weight is a reward and a
+  negative weight is a penalty of the same magnitude
+
+Both are loaded into the same (reward, penalty) representation, so every solver
+works on either layout. load_graph() also reads Parquet and Arrow IPC edge tables
+and catalog entries (see pathproblems.columnar).
+"""
+import csv
+from collections import defaultdict
+
+def split_weight(weight):
+    """Turn a signed 1D weight into a (reward, penalty) pair."""
+    return (max(weight, 0), -min(weight, 0))
+
+def read_edges(filename, dims=2):
+    """Yield (u, v, reward, penalty) for every row of a graph CSV file."""
+    expected_columns = 3 if dims == 1 else 4
+    with open(filename, 'r') as f:
+        reader = csv.reader(f)
+        next(reader)  # Skip header
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != expected_columns:
+                layout = "source,target,weight" if dims == 1 else "source,target,reward,penalty"
+                raise ValueError(f"Invalid CSV format. Expected: {layout}")
+            if dims == 1:
+                yield (row[0], row[1]) + split_weight(int(row[2]))
+            else:
+                yield row[0], row[1], int(row[2]), int(row[3])
+
+def load_graph_from_csv(filename, dims=2):
+    """Load a graph[u][v] = (reward, penalty) dictionary from a CSV file."""
+    graph = defaultdict(dict)
+    for u, v, reward, penalty in read_edges(filename, dims):
+        graph[u][v] = (reward, penalty)
+    return graph
+
+def load_graph(filename, dims=2, catalog=None):
+    """Load a graph dictionary from a CSV, Parquet or Arrow IPC file, or from the
+    catalog directory as NAME or NAME@VERSION."""
+    from pathproblems.columnar import SUFFIXES, GraphCatalog, read_csr
+
+    if catalog is not None:
+        return GraphCatalog(catalog).open(filename).to_dict()
+    if filename.endswith(SUFFIXES):
+        return read_csr(filename).to_dict()
+    return load_graph_from_csv(filename, dims)
+
+def read_graph(filename="graph_data.csv", dims=2):
+    """Read the graph as an edge dictionary {(u, v): (reward, penalty)} plus the sorted node list."""
+    edges = {}
+    nodes = set()
+    for u, v, reward, penalty in read_edges(filename, dims):
+        edges[(u, v)] = (reward, penalty)
+        nodes.update([u, v])
+    return edges, sort_nodes(nodes)
+
+def sort_nodes(nodes):
+    """Sort node names by numeric suffix (n0, n1, ..., n10), falling back to lexicographic order."""
+    try:
+        return sorted(nodes, key=lambda x: int(x[1:]))
+    except ValueError:
+        return sorted(nodes)
+
+def graph_nodes(graph):
+    """Return every node of a graph dictionary, including nodes without outgoing edges."""
+    nodes = set(graph)
+    for u in graph:
+        nodes.update(graph[u])
+    return nodes
+
+def default_target(nodes):
+    """The generators write n0 as the source and the highest-numbered node as the destination."""
+    return sort_nodes(nodes)[-1]
+
+def load_vector_graph_from_csv(filename):
+    """Load a graph with any number of cost columns: ``source,target,reward,cost_1,...,cost_d``.
+
+    Returns (graph, cost_names) with graph[u][v] = (reward, (cost_1, ..., cost_d)).
+    """
+    graph = defaultdict(dict)
+    with open(filename, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        if len(header) < 4:
+            raise ValueError("Invalid CSV format. Expected: source,target,reward,cost_1[,cost_2,...]")
+        cost_names = header[3:]
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"Expected {len(header)} columns, got {len(row)}: {row}")
+            graph[row[0]][row[1]] = (int(row[2]), tuple(int(cost) for cost in row[3:]))
+    return graph, cost_names
@@ -0,0 +1,247 @@
+"""MTZ integer programs for the Restricted Rewarding Path problem.
+
+gurobipy is imported when a model is built, not when this module is imported.
+Before a model is built, presolve() drops the edges and nodes that cannot lie on
+a feasible source-target path and bounds the MTZ position of every node.
+"""
+import math
+from collections import deque
+
+def import_gurobi():
+    """Import gurobipy on demand, with a readable error when it is not installed."""
+    try:
+        import gurobipy as gp
+        from gurobipy import GRB
+    except ImportError as e:
+        raise ImportError("The ILP solvers need gurobipy: pip install 'pathproblems[ilp]'") from e
+    return gp, GRB
+
+def hop_distances(graph, start):
+    """BFS edge counts from start in a graph[u][v] dictionary."""
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        u = queue.popleft()
+        for v in graph.get(u, {}):
+            if v not in depth:
+                depth[v] = depth[u] + 1
+                queue.append(v)
+    return depth
+
+def presolve(edges, nodes, source, target, constraint_C=math.inf):
+    """Shrink an MTZ model to the part that can hold a feasible source-target path.
+
+    Drops every edge with d_s(u) + p(u,v) + d_t(v) > C (min-penalty distances from
+    the source and to the target), edges into the source or out of the target, and
+    nodes that are unreachable in either direction or too many hops away to fit on
+    a simple path. Returns (edges, nodes, bounds) where bounds[node] = (lb, ub) is
+    the range of the MTZ position of every node but the source: a node k hops from
+    the source and l hops from the target sits between k - 1 and len(nodes) - 1 - l.
+    """
+    from pathproblems.reduce import reduce_graph
+
+    graph = {node: {} for node in nodes}
+    for (u, v), weights in edges.items():
+        graph[u][v] = weights
+
+    while True:
+        graph = reduce_graph(graph, source, target, constraint_C, contract_chains=False).graph
+        reverse = {node: {} for node in graph}
+        for u in graph:
+            for v in graph[u]:
+                reverse[v][u] = True
+        from_source = hop_distances(graph, source)
+        to_target = hop_distances(reverse, target)
+        limit = len(graph) - 1
+        if target not in from_source:
+            break
+
+        # A simple path has at most limit edges
+        far = {node for node in graph if node not in (source, target) and
+               from_source.get(node, math.inf) + to_target.get(node, math.inf) > limit}
+        if not far:
+            break
+        graph = {u: {v: w for v, w in graph[u].items() if v not in far} for u in graph if u not in far}
+
+    kept_edges = {(u, v): weights for u in graph for v, weights in graph[u].items()}
+    kept_nodes = [node for node in nodes if node in graph]
+    bounds = {node: (max(0, from_source.get(node, 1) - 1), max(0, limit - to_target.get(node, 0)))
+              for node in kept_nodes if node != source}
+    return kept_edges, kept_nodes, bounds
+
+def solve_rrp_ilp(edges, nodes, source, target, constraint_C, presolve_model=True, incumbent=None,
+                  upper_bound=None, callback=None):
+    """Solve Restricted Rewarding Path problem using ILP
+
+    incumbent is a known feasible path, given to Gurobi as MIP start and as cutoff
+    so that worse branches are dropped; upper_bound (e.g. the LARAC dual bound)
+    caps the objective. callback(model, where) is passed to Gurobi, with the edge
+    variables in model._x.
+    """
+    bounds = {}
+    if presolve_model:
+        edges, nodes, bounds = presolve(edges, nodes, source, target, constraint_C)
+    m = build_rrp_model(edges, nodes, source, target, constraint_C, bounds, incumbent, upper_bound)
+    m.optimize(callback)
+    return rrp_solution(m, edges, source, target, constraint_C)
+
+def build_rrp_model(edges, nodes, source, target, constraint_C, bounds=None, incumbent=None, upper_bound=None):
+    """Build the MTZ model of solve_rrp_ilp, with the edge variables in model._x.
+
+    bounds are the MTZ position bounds returned by presolve().
+    """
+    gp, GRB = import_gurobi()
+    bounds = bounds or {}
+    m = gp.Model("RRP_ILP")
+    
+    # Decision variables
+    x = {(u, v): m.addVar(vtype=GRB.BINARY, name=f"x_{u}_{v}") for u, v in edges}
+    
+    # MTZ position variables (exclude source)
+    u_pos = {n: m.addVar(lb=bounds.get(n, (0,))[0], ub=bounds.get(n, (0, len(nodes)-1))[1],
+                         vtype=GRB.INTEGER, name=f"pos_{n}")
+             for n in nodes if n != source}
+
+    # Objective: Maximize total reward
+    objective = gp.quicksum(x[u,v] * reward for (u,v), (reward, _) in edges.items())
+    m.setObjective(objective, GRB.MAXIMIZE)
+
+    # Constraints
+    # 1. Source has exactly one outgoing edge
+    m.addConstr(gp.quicksum(x[source,v] for u,v in edges if u == source) == 1, "source_out")
+    
+    # 2. Target has exactly one incoming edge
+    m.addConstr(gp.quicksum(x[u,target] for u,v in edges if v == target) == 1, "target_in")
+    
+    # 3. Flow conservation for intermediate nodes
+    for node in nodes:
+        if node not in [source, target]:
+            outgoing = gp.quicksum(x[node,v] for v in nodes if (node,v) in edges)
+            incoming = gp.quicksum(x[u,node] for u in nodes if (u,node) in edges)
+            m.addConstr(outgoing == incoming, f"flow_conservation_{node}")
+            m.addConstr(outgoing <= 1, f"out_degree_{node}")
+
+    # 4. Penalty constraint
+    m.addConstr(gp.quicksum(x[u,v] * penalty for (u,v), (_, penalty) in edges.items()) <= constraint_C, 
+               "penalty_limit")
+
+    # 5. MTZ subtour elimination constraints
+    for (u, v) in edges:
+        if u != source and v != source and u != v:
+            m.addConstr(u_pos[u] - u_pos[v] + len(nodes)*x[u,v] <= len(nodes)-1, f"mtz_{u}_{v}")
+
+    # Set target position
+    if target in u_pos:
+        m.addConstr(u_pos[target] == len(nodes)-1, "target_position")
+
+    # 6. Known bounds on the optimum
+    if incumbent is not None:
+        incumbent_edges = set(zip(incumbent, incumbent[1:]))
+        for (u, v), var in x.items():
+            var.Start = 1 if (u, v) in incumbent_edges else 0
+        incumbent_reward = sum(edges[e][0] for e in incumbent_edges)
+        m.Params.Cutoff = incumbent_reward - 1e-6 * (1 + abs(incumbent_reward))
+    if upper_bound is not None and upper_bound < math.inf:
+        m.addConstr(objective <= upper_bound + 1e-6 * (1 + abs(upper_bound)), "dual_bound")
+
+    m._x = x
+    return m
+
+def rrp_solution(m, edges, source, target, constraint_C):
+    """Path of an optimized solve_rrp_ilp model as a result dictionary, or None."""
+    _, GRB = import_gurobi()
+    x = m._x
+    # Process results
+    if m.status == GRB.OPTIMAL:
+        path = [source]
+        current = source
+        total_reward = 0
+        total_penalty = 0
+        
+        while current != target:
+            next_nodes = [v for u,v in edges if u == current and x[u,v].X > 0.5]
+            if not next_nodes:
+                break
+            current = next_nodes[0]
+            path.append(current)
+            total_reward += edges[(path[-2], current)][0]
+            total_penalty += edges[(path[-2], current)][1]
+
+        return {
+            'path': path,
+            'total_reward': total_reward,
+            'total_penalty': total_penalty,
+            'constraint_satisfied': total_penalty <= constraint_C
+        }
+    return None
+
+def solve_min_weight_ilp(edges, nodes, source, target, presolve_model=True):
+    """Find the simple source-target path of minimum reward - penalty with an MTZ ILP.
+
+    Returns a dictionary like solve_rrp_ilp (plus 'path_edges' and 'total_weight') or None.
+    """
+    gp, GRB = import_gurobi()
+    bounds = {}
+    if presolve_model:
+        edges, nodes, bounds = presolve(edges, nodes, source, target)
+    m = gp.Model("ShortestPath_ILP")
+
+    # Variables: x[u,v] indicates if edge (u,v) is used
+    x = {(u, v): m.addVar(vtype=GRB.BINARY, name=f"x_{u}_{v}") for u, v in edges}
+
+    # MTZ position variables (exclude source)
+    u_pos = {i: m.addVar(lb=bounds.get(i, (0,))[0], ub=bounds.get(i, (0, len(nodes)-1))[1],
+                         vtype=GRB.INTEGER, name=f"u_pos_{i}")
+             for i in nodes if i != source}
+
+    # Objective: Minimize total signed weight
+    m.setObjective(gp.quicksum(x[u, v] * (reward - penalty) for (u, v), (reward, penalty) in edges.items()),
+                   GRB.MINIMIZE)
+
+    # Constraints
+    # 1. Source has one outgoing edge
+    m.addConstr(gp.quicksum(x[source, v] for v in nodes if (source, v) in edges) == 1, "c1")
+
+    # 2. Target has one incoming edge
+    m.addConstr(gp.quicksum(x[u, target] for u in nodes if (u, target) in edges) == 1, "c2")
+
+    # 3. Flow conservation and degree constraints for intermediate nodes
+    for p in nodes:
+        if p not in [source, target]:
+            outgoing = gp.quicksum(x[p, q] for q in nodes if (p, q) in edges)
+            incoming = gp.quicksum(x[r, p] for r in nodes if (r, p) in edges)
+            m.addConstr(outgoing - incoming == 0, f"flow_{p}")
+            m.addConstr(outgoing <= 1, f"out_deg_{p}")
+            m.addConstr(incoming <= 1, f"in_deg_{p}")
+
+    # MTZ constraints to prevent subtours
+    for (i, j) in edges:
+        if i != source and j != source and i != j:
+            m.addConstr(u_pos[i] - u_pos[j] + len(nodes)*x[i, j] <= len(nodes)-1, f"mtz_{i}_{j}")
+
+    # Set target's position to last
+    if target in u_pos:
+        m.addConstr(u_pos[target] == len(nodes) - 1, "pos_target")
+
+    m.optimize()
+
+    if m.status != GRB.OPTIMAL:
+        return None
+
+    path_edges = [(u, v) for u, v in edges if x[u, v].X > 0.5]
+    solution_edges = {u: v for u, v in path_edges}
+
+    # Reconstruct the ordered path
+    path = [source]
+    while path[-1] != target and path[-1] in solution_edges:
+        path.append(solution_edges[path[-1]])
+
+    total_reward = sum(edges[u, v][0] for u, v in zip(path, path[1:]))
+    total_penalty = sum(edges[u, v][1] for u, v in zip(path, path[1:]))
+    return {
+        'path': path,
+        'path_edges': path_edges,
+        'total_reward': total_reward,
+        'total_penalty': total_penalty,
+        'total_weight': total_reward - total_penalty,
+    }
@@ -0,0 +1,82 @@
+"""Path labels shared by the label-setting and label-correcting solvers."""
+
+class PathLabel:
+    """Represents a path using the label structure with efficient cycle detection."""
+    def __init__(self, reward, penalty, pred=None, last_edge=None, visited_nodes=None):
+        self.reward = reward
+        self.penalty = penalty
+        self.pred = pred  # Pointer to predecessor label
+        self.last_edge = last_edge  # Tuple (u, v) representing the last edge
+        self.hops = pred.hops + 1 if pred is not None else 0  # Number of edges on the path
+        self.record = None  # Record number in a checkpoint log, set by Checkpoint.record()
+        
+        # Set of nodes visited along this path
+        if visited_nodes is None:
+            self.visited_nodes = set()
+        else:
+            self.visited_nodes = visited_nodes.copy()  # Create a copy to avoid shared references
+            
+        # Add the current edge's nodes to visited_nodes
+        if last_edge:
+            self.visited_nodes.add(last_edge[0])
+            self.visited_nodes.add(last_edge[1])
+    
+    def get_value(self):
+        """Signed path weight, the objective of the shortest path problem."""
+        return self.reward - self.penalty
+    
+    def get_cost_tuple(self):
+        """Return the cost tuple (reward, penalty)."""
+        return (self.reward, self.penalty)
+    
+    def reconstruct_path(self):
+        """Reconstruct the full path by following predecessor pointers."""
+        edges = []
+        current = self
+        while current is not None and current.last_edge is not None:
+            edges.append(current.last_edge)
+            current = current.pred
+        if not edges:
+            return []
+        
+        path = [edges[-1][0]]
+        for u, v in reversed(edges):
+            path.append(v)
+        return path
+
+class PredecessorLabel:
+    """Compact label holding only its costs, its node and a pointer to the previous label.
+
+    Extending a label is O(1) in time and memory; the path and the nodes on it
+    are recovered by walking the predecessor chain when needed.
+    """
+    __slots__ = ('reward', 'penalty', 'node', 'pred')
+
+    def __init__(self, reward, penalty, node, pred=None):
+        self.reward = reward
+        self.penalty = penalty
+        self.node = node
+        self.pred = pred
+
+    def get_value(self):
+        """Signed path weight, the objective of the shortest path problem."""
+        return self.reward - self.penalty
+
+    def contains(self, node):
+        """Check whether node lies on the path of this label."""
+        current = self
+        while current is not None:
+            if current.node == node:
+                return True
+            current = current.pred
+        return False
+
+    def reconstruct_path(self):
+        """Return the node sequence from the source to this label's node."""
+        path = []
+        current = self
+        while current is not None:
+            path.append(current.node)
+            current = current.pred
+        path.reverse()
+        return path
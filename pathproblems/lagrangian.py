@@ -0,0 +1,218 @@
+"""Lagrangian relaxation (LARAC) for the Restricted Rewarding Path problem.
+
+Relaxing the budget with a multiplier lam >= 0 gives
+
+    L(lam) = lam * C + max over paths of sum(reward - lam * penalty),
+
+an upper bound on the best feasible reward. The inner problem is a longest path,
+which is only tractable when no cycle has positive reduced weight, so lam is
+restricted to lam >= lam*, the largest reward / penalty ratio of a cycle that can
+lie on a source-target path (found by bisection with positive-cycle detection).
+For such lam, a queue-based Bellman-Ford returns the best path.
+
+LARAC (Juttner et al., 2001) then keeps a feasible path p_c and an infeasible one
+p_r and moves lam to the point where both have the same reduced weight, until
+that lam is optimal. The result is a feasible path, the smallest bound L(lam)
+seen and the gap between them. After run(), prunes() tells a label search which
+labels cannot complete to a path better than the feasible one.
+"""
+import math
+from collections import deque
+
+from pathproblems.reduce import reduce_graph
+
+def reachable(graph, start):
+    """Set of nodes reachable from start in a graph[u][v] dictionary."""
+    seen = {start}
+    stack = [start]
+    while stack:
+        for v in graph.get(stack.pop(), {}):
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return seen
+
+class LARAC_RRP:
+    def __init__(self, graph, source, target, constraint_C, tolerance=1e-9, max_iterations=100):
+        self.source = source
+        self.target = target
+        self.C = constraint_C
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        # Only edges that fit on some feasible source-target path matter for the bound
+        graph = reduce_graph(graph, source, target, constraint_C, contract_chains=False).graph
+        reverse = {node: {} for node in graph}
+        for u in graph:
+            for v, weights in graph[u].items():
+                reverse[v][u] = weights
+        # Pruning can leave cycles cut off from the source; they must not count as positive cycles
+        keep = reachable(graph, source) & reachable(reverse, target)
+        self.graph = {u: {v: w for v, w in graph[u].items() if v in keep} for u in graph if u in keep}
+        self.reverse = {v: {u: w for u, w in reverse[v].items() if u in keep} for v in reverse if v in keep}
+
+        self.multiplier = None
+        self.upper_bound = math.inf
+        self.best = None  # (reward, penalty, path) of the best feasible path found
+        self.to_target = None  # Best reduced weight from every node to the target at self.multiplier
+        self.iterations = 0
+
+    def best_reduced(self, lam, graph, start):
+        """Largest sum(reward - lam * penalty) from start to every node, with predecessors.
+
+        Returns None if a cycle of positive reduced weight is reachable from start.
+        """
+        value = {start: 0.0}
+        pred = {start: None}
+        count = {start: 0}
+        queue = deque([start])
+        in_queue = {start}
+        n = len(graph)
+        while queue:
+            u = queue.popleft()
+            in_queue.remove(u)
+            for v, (reward, penalty) in graph[u].items():
+                new_value = value[u] + reward - lam * penalty
+                if new_value > value.get(v, -math.inf) + self.tolerance * (1 + abs(new_value)):
+                    value[v] = new_value
+                    pred[v] = u
+                    count[v] = count.get(v, 0) + 1
+                    if count[v] >= n:
+                        return None
+                    if v not in in_queue:
+                        queue.append(v)
+                        in_queue.add(v)
+        return value, pred
+
+    def path_at(self, lam):
+        """Best source-target path for multiplier lam as (reward, penalty, path, reduced weight), or None
+        on a positive cycle.
+
+        Near lam* a cycle of reduced weight within the tolerance can close the chain of
+        predecessors; path is then a walk that repeats a node (see simple()), but the
+        reduced weight of the target still bounds every path.
+        """
+        result = self.best_reduced(lam, self.graph, self.source)
+        if result is None:
+            return None
+        value, pred = result
+        if self.target not in pred:
+            return None
+        path = [self.target]
+        seen = {self.target}
+        while pred[path[-1]] is not None:
+            path.append(pred[path[-1]])
+            if path[-1] in seen:
+                break
+            seen.add(path[-1])
+        path.reverse()
+        reward = sum(self.graph[u][v][0] for u, v in zip(path, path[1:]))
+        penalty = sum(self.graph[u][v][1] for u, v in zip(path, path[1:]))
+        return reward, penalty, path, value[self.target]
+
+    def simple(self, path):
+        """True if path starts at the source and visits no node twice."""
+        return path[0] == self.source and len(set(path)) == len(path)
+
+    def critical_multiplier(self):
+        """Smallest lam (up to the tolerance) without a positive reduced cycle, or None if there is none."""
+        if self.best_reduced(0.0, self.graph, self.source) is not None:
+            return 0.0
+        rewards = sum(r for u in self.graph for r, p in self.graph[u].values() if r > 0)
+        penalties = [p for u in self.graph for r, p in self.graph[u].values() if p > 0]
+        if not penalties:
+            return None
+        # A cycle with positive penalty has a ratio below this; one with zero penalty makes every lam fail
+        high = (rewards + 1) / min(penalties)
+        if self.best_reduced(high, self.graph, self.source) is None:
+            return None
+        low = 0.0
+        while high - low > self.tolerance * max(1.0, high):
+            middle = (low + high) / 2
+            if self.best_reduced(middle, self.graph, self.source) is None:
+                low = middle
+            else:
+                high = middle
+        # Stay clear of the tolerance used to detect the positive cycles
+        return high + self.tolerance * max(1.0, high)
+
+    def offer(self, candidate):
+        reward, penalty, path = candidate[:3]
+        if penalty <= self.C and (self.best is None or (reward, -penalty) > (self.best[0], -self.best[1])):
+            self.best = (reward, penalty, path)
+
+    def bound(self, lam, candidate):
+        """Record L(lam) from the best reduced weight at lam, the last entry of a path_at() candidate."""
+        value = lam * self.C + candidate[3]
+        if value < self.upper_bound:
+            self.upper_bound = value
+            self.multiplier = lam
+
+    def run(self):
+        """Return a dict with path, total_reward, total_penalty, upper_bound, gap and multiplier, or None."""
+        if self.target not in self.graph or self.source == self.target:
+            return None
+        # The min-penalty path is the first feasible path (lam -> infinity)
+        feasible = self.path_at_min_penalty()
+        if feasible is None or feasible[1] > self.C:
+            return None
+        self.offer(feasible)
+
+        critical = lam = self.critical_multiplier()
+        if lam is not None:
+            infeasible = self.path_at(lam)
+            self.bound(lam, infeasible)
+            # A walk that repeats a node is no path: the bound stands, and the min-penalty path stays the incumbent
+            if self.simple(infeasible[2]):
+                self.offer(infeasible)
+            while infeasible[1] > self.C and self.simple(infeasible[2]) and self.iterations < self.max_iterations:
+                self.iterations += 1
+                # Multiplier at which both paths have the same reduced weight
+                lam = (infeasible[0] - feasible[0]) / (infeasible[1] - feasible[1])
+                if lam <= critical:
+                    # Both paths meet below lam*, where L is not defined: L(lam*) is the bound
+                    break
+                candidate = self.path_at(lam)
+                self.bound(lam, candidate)
+                if not self.simple(candidate[2]):
+                    break
+                reduced = candidate[0] - lam * candidate[1]
+                if reduced <= feasible[0] - lam * feasible[1] + self.tolerance * (1 + abs(reduced)):
+                    break
+                if candidate[1] <= self.C:
+                    feasible = candidate
+                    self.offer(candidate)
+                else:
+                    infeasible = candidate
+
+        reward, penalty, path = self.best
+        if self.multiplier is not None:
+            # None only if rounding at lam* lets a positive cycle through, then there is no pruning
+            to_target = self.best_reduced(self.multiplier, self.reverse, self.target)
+            self.to_target = to_target and to_target[0]
+        upper_bound = max(self.upper_bound, reward)
+        return {
+            'path': path,
+            'total_reward': reward,
+            'total_penalty': penalty,
+            'constraint_satisfied': True,
+            'upper_bound': upper_bound,
+            'gap': (upper_bound - reward) / upper_bound if 0 < upper_bound < math.inf else (0.0 if upper_bound == 0 else math.inf),
+            'multiplier': self.multiplier,
+        }
+
+    def path_at_min_penalty(self):
+        """Min-penalty path (largest reward among ties) as (reward, penalty, path), or None."""
+        from pathproblems.scaling import ScalingFPTAS_RRP
+
+        label = ScalingFPTAS_RRP(self.graph, self.source, self.target, self.C, 1).min_penalty_path()
+        return label and (label.reward, label.penalty, label.reconstruct_path())
+
+    def prunes(self, node, reward, penalty):
+        """True if a label with this reward and penalty at node cannot complete to a better path than self.best."""
+        if self.to_target is None:
+            return False
+        to_target = self.to_target.get(node)
+        if to_target is None:
+            return True
+        lam = self.multiplier
+        return reward - lam * penalty + lam * self.C + to_target < self.best[0] - self.tolerance * (1 + self.best[0])
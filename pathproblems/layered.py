@@ -0,0 +1,152 @@
+"""Layered Bellman-Ford FPTAS for the shortest simple path problem (Problem 1).
+
+Each edge carries a (reward, penalty) pair and a path is worth reward - penalty,
+which equals the sum of the signed weights of a 1D graph. Round i keeps, for
+every node, one label per reward bucket among the paths with at most i edges.
+With max_hops = H only H rounds are run, and solve_by_hops() reads the best
+path for every hop limit 0..H off the target after each round.
+"""
+import math
+from collections import defaultdict
+
+from pathproblems.graph import graph_nodes, sort_nodes
+from pathproblems.labels import PathLabel
+
+class FPTAS_BiObjectiveSP:
+    def __init__(self, graph, source, target, epsilon, engine="python", max_hops=None):
+        """engine="jit" runs the rounds compiled with Numba when it is installed (see pathproblems.jit).
+
+        max_hops limits paths to that many edges; the weight bounds and delta then
+        scale with max_hops instead of n - 1.
+        """
+        if engine not in ("python", "jit"):
+            raise ValueError(f"Unknown engine {engine!r}, expected 'python' or 'jit'")
+        self.engine = engine
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.epsilon = epsilon
+
+        # Collect all nodes
+        self.nodes = graph_nodes(graph)
+        self.n = len(self.nodes)
+        self.max_hops = max_hops
+        self.rounds = self.n - 1 if max_hops is None else max(0, min(max_hops, self.n - 1))
+        self.delta = epsilon / self.rounds if self.rounds > 0 else 0
+
+        self.max_reward, self.max_penalty = self.find_max_values()
+
+        self.Wx = self.max_reward * self.rounds
+        self.Wy = self.max_penalty * self.rounds
+        self.num_buckets = math.ceil(self.Wx / self.delta) + 1 if self.delta > 0 else 1
+
+    def find_max_values(self):
+        max_reward = 0
+        max_penalty = 0
+        for u in self.graph:
+            for v, (r, p) in self.graph[u].items():
+                max_reward = max(max_reward, r)
+                max_penalty = max(max_penalty, p)
+        return max_reward, max_penalty
+
+    def get_bucket(self, reward):
+        if self.delta == 0:
+            return 0
+        return min(int((reward + 1e-9) / self.delta), self.num_buckets - 1)
+
+    def solve(self, checkpoint=None):
+        """Return (path, value) of the best source-target path, or (None, inf).
+
+        With a pathproblems.checkpoint.Checkpoint, the layer is saved between rounds
+        and a run started with resume=True continues from the last saved round.
+        """
+        if self.engine == "jit" and checkpoint is None:
+            from pathproblems import jit
+
+            if jit.available():
+                return jit.solve_layered(self)
+
+        layer = None
+        for _, layer in self.run_rounds(checkpoint):
+            pass
+        return self.best_at_target(layer)
+
+    def solve_by_hops(self):
+        """Return [(path, value)] of the best path with at most h edges for h = 0..rounds, from one run."""
+        return [self.best_at_target(layer) for _, layer in self.run_rounds()]
+
+    def run_rounds(self, checkpoint=None):
+        """Yield (i, layer) after round i, starting with the layer of round 0 (or the resumed round)."""
+        # Round i only reads layer i-1, so two layers are kept
+        layer = defaultdict(dict)
+        source_label = PathLabel(0, 0)
+        layer[self.source][0] = source_label
+        first_round = 1
+        if checkpoint is not None:
+            first_round = self.restore(layer, source_label, checkpoint) + 1
+        yield first_round - 1, layer
+
+        for i in range(first_round, self.rounds + 1):
+            previous = layer
+            layer = defaultdict(dict)
+            for v in previous:
+                layer[v].update(previous[v])
+
+            for u in self.graph:
+                if u not in previous:
+                    continue
+                for v, (r_edge, p_edge) in self.graph[u].items():
+                    for bucket, label in previous[u].items():
+                        if v in label.visited_nodes:
+                            continue
+                        new_reward = label.reward + r_edge
+                        new_penalty = label.penalty + p_edge
+                        if new_reward > self.Wx or new_penalty > self.Wy:
+                            continue
+                        new_label = PathLabel(
+                            new_reward, new_penalty,
+                            label, (u, v), label.visited_nodes
+                        )
+                        new_bucket = self.get_bucket(new_reward)
+                        if (new_bucket not in layer[v] or
+                            layer[v][new_bucket].penalty < new_penalty):
+                            layer[v][new_bucket] = new_label
+                            if checkpoint is not None:
+                                checkpoint.record(v, new_bucket, new_label)
+
+            if checkpoint is not None and (checkpoint.due() or i == self.rounds):
+                checkpoint.save(round_number=i)
+            yield i, layer
+
+    def best_at_target(self, layer):
+        """(path, value) of the lowest-value label at the target in layer, or (None, inf)."""
+        if self.target not in layer or not layer[self.target]:
+            return None, float('inf')
+
+        min_value = float('inf')
+        best_label = None
+        for bucket, label in layer[self.target].items():
+            if label.get_value() < min_value:
+                min_value = label.get_value()
+                best_label = label
+
+        if best_label:
+            return best_label.reconstruct_path(), min_value
+        return None, float('inf')
+
+    def restore(self, layer, source_label, checkpoint):
+        """Load the last saved layer into layer; returns the last completed round (0 on a fresh start)."""
+        from pathproblems.checkpoint import query_fingerprint
+
+        params = (self.source, self.target, self.epsilon)
+        if self.max_hops is not None:
+            params += (self.max_hops,)
+        checkpoint.bind(sort_nodes(self.nodes), query_fingerprint(self.graph, 'layered', *params))
+        resumed = checkpoint.start(source_label)
+        if resumed is None:
+            checkpoint.record(self.source, 0, source_label)
+            return 0
+        round_number, _, assignments = resumed
+        for node, bucket, label in assignments:
+            layer[node][bucket] = label
+        return round_number
@@ -0,0 +1,216 @@
+"""Vector-cost FPTAS: maximize reward subject to one budget per cost column.
+
+Generalizes FPTAS_RRP from a single penalty to d cost columns (penalty, time,
+risk, ...). Rewards are bucketed geometrically as in FPTAS_RRP, and every node
+keeps the Pareto frontier of (reward bucket, cost vector) over its labels:
+
+* with one cost column the frontier is a list sorted by bucket, searched with bisect;
+* with two or more, dominance is checked against the whole frontier at once with
+  NumPy (skyline test over the bucket column and all cost columns).
+
+Labels live in a flat pool with predecessor indices, and each label is extended
+exactly once, when its node is popped after the label was created.
+"""
+import math
+from bisect import bisect_left
+from collections import deque
+
+from pathproblems.graph import graph_nodes
+
+def import_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("Vector costs with two or more columns need NumPy: pip install 'pathproblems[numpy]'") from e
+    return np
+
+class SortedFrontier:
+    """Pareto frontier for one cost: buckets ascending and costs strictly ascending."""
+    def __init__(self):
+        self.buckets = []
+        self.costs = []
+        self.ids = []
+
+    def insert(self, bucket, costs, label_id):
+        """Add a label unless it is dominated; returns the ids of labels it dominates, or None if rejected."""
+        cost = costs[0]
+        i = bisect_left(self.buckets, bucket)
+        # The cheapest label with bucket >= the new one is the first at or after i
+        if i < len(self.buckets) and self.costs[i] <= cost:
+            return None
+
+        # Labels with a bucket <= the new one and a cost >= the new one end right before i
+        # (or at i, for an equal bucket with a higher cost)
+        end = i + 1 if i < len(self.buckets) and self.buckets[i] == bucket else i
+        start = end
+        while start > 0 and self.costs[start - 1] >= cost:
+            start -= 1
+        removed = self.ids[start:end]
+        self.buckets[start:end] = [bucket]
+        self.costs[start:end] = [cost]
+        self.ids[start:end] = [label_id]
+        return removed
+
+    def label_ids(self):
+        return list(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+class SkylineFrontier:
+    """Pareto frontier for several costs, stored in growable NumPy arrays."""
+    def __init__(self, num_costs):
+        np = import_numpy()
+        self.buckets = np.empty(8, dtype=np.int64)
+        self.costs = np.empty((8, num_costs), dtype=np.float64)
+        self.ids = np.empty(8, dtype=np.int64)
+        self.size = 0
+
+    def insert(self, bucket, costs, label_id):
+        """Add a label unless it is dominated; returns the ids of labels it dominates, or None if rejected."""
+        np = import_numpy()
+        size = self.size
+        buckets = self.buckets[:size]
+        frontier_costs = self.costs[:size]
+        cost_vector = np.asarray(costs, dtype=np.float64)
+
+        if size and np.any((buckets >= bucket) & np.all(frontier_costs <= cost_vector, axis=1)):
+            return None
+
+        removed = []
+        if size:
+            dominated = (buckets <= bucket) & np.all(frontier_costs >= cost_vector, axis=1)
+            if dominated.any():
+                removed = self.ids[:size][dominated].tolist()
+                keep = ~dominated
+                size = int(keep.sum())
+                self.buckets[:size] = buckets[keep]
+                self.costs[:size] = frontier_costs[keep]
+                self.ids[:size] = self.ids[:self.size][keep]
+
+        if size == len(self.ids):
+            self.buckets = np.resize(self.buckets, 2 * size)
+            self.costs = np.resize(self.costs, (2 * size, self.costs.shape[1]))
+            self.ids = np.resize(self.ids, 2 * size)
+        self.buckets[size] = bucket
+        self.costs[size] = cost_vector
+        self.ids[size] = label_id
+        self.size = size + 1
+        return removed
+
+    def label_ids(self):
+        return self.ids[:self.size].tolist()
+
+    def __len__(self):
+        return self.size
+
+class FPTAS_MultiObjective:
+    def __init__(self, graph, source, target, budgets, epsilon):
+        """graph[u][v] = (reward, (cost_1, ..., cost_d)); budgets holds one limit per cost."""
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.budgets = tuple(budgets)
+        self.num_costs = len(self.budgets)
+        self.epsilon = epsilon
+        self.nodes = graph_nodes(graph)
+        self.n = len(self.nodes)
+        self.delta = epsilon / (self.n - 1) if self.n > 1 else epsilon
+        self.log_base = math.log(1 + self.delta)
+
+        # Label pool: parallel lists indexed by label id
+        self.label_node = []
+        self.label_pred = []
+        self.label_reward = []
+        self.label_costs = []
+        self.label_alive = []
+
+    def get_bucket(self, reward):
+        """Determine which bucket a reward value belongs to."""
+        if reward <= 0:
+            return 0
+        return math.floor(math.log(reward) / self.log_base)
+
+    def new_frontier(self):
+        if self.num_costs == 1:
+            return SortedFrontier()
+        return SkylineFrontier(self.num_costs)
+
+    def add_label(self, node, pred, reward, costs):
+        self.label_node.append(node)
+        self.label_pred.append(pred)
+        self.label_reward.append(reward)
+        self.label_costs.append(costs)
+        self.label_alive.append(True)
+        return len(self.label_node) - 1
+
+    def on_path(self, label_id, node):
+        """Check whether node lies on the path of label_id by walking the predecessor indices."""
+        while label_id is not None:
+            if self.label_node[label_id] == node:
+                return True
+            label_id = self.label_pred[label_id]
+        return False
+
+    def reconstruct_path(self, label_id):
+        path = []
+        while label_id is not None:
+            path.append(self.label_node[label_id])
+            label_id = self.label_pred[label_id]
+        path.reverse()
+        return path
+
+    def run(self):
+        """Return (reward, costs, path) of the best path within every budget, or None."""
+        frontiers = {}
+        pending = {self.source: [self.add_label(self.source, None, 0, (0,) * self.num_costs)]}
+        frontiers[self.source] = self.new_frontier()
+        frontiers[self.source].insert(0, self.label_costs[0], 0)
+
+        queue = deque([self.source])
+        while queue:
+            node = queue.popleft()
+            new_labels = pending.pop(node)
+
+            for label_id in new_labels:
+                if not self.label_alive[label_id]:
+                    continue
+                reward = self.label_reward[label_id]
+                costs = self.label_costs[label_id]
+
+                for neighbor, (edge_reward, edge_costs) in self.graph.get(node, {}).items():
+                    new_costs = tuple(c + e for c, e in zip(costs, edge_costs))
+                    if any(c > b for c, b in zip(new_costs, self.budgets)):
+                        continue
+                    # Skip if the neighbor is already in the path (avoid cycles)
+                    if self.on_path(label_id, neighbor):
+                        continue
+
+                    new_reward = reward + edge_reward
+                    frontier = frontiers.get(neighbor)
+                    if frontier is None:
+                        frontier = frontiers[neighbor] = self.new_frontier()
+                    new_id = len(self.label_node)
+                    removed = frontier.insert(self.get_bucket(new_reward), new_costs, new_id)
+                    if removed is None:
+                        continue
+
+                    self.add_label(neighbor, label_id, new_reward, new_costs)
+                    for dominated_id in removed:
+                        self.label_alive[dominated_id] = False
+                    if neighbor not in pending:
+                        pending[neighbor] = []
+                        queue.append(neighbor)
+                    pending[neighbor].append(new_id)
+
+        # Best reward at the target, ties broken by lower costs
+        best_id = None
+        target_frontier = frontiers.get(self.target)
+        for label_id in target_frontier.label_ids() if target_frontier else []:
+            if best_id is None or (self.label_reward[label_id], [-c for c in self.label_costs[label_id]]) > \
+                    (self.label_reward[best_id], [-c for c in self.label_costs[best_id]]):
+                best_id = label_id
+
+        if best_id is None or self.label_reward[best_id] < 0:
+            return None
+        return (self.label_reward[best_id], self.label_costs[best_id], self.reconstruct_path(best_id))
@@ -0,0 +1,235 @@
+"""Orienteering: collect the largest total node prize on a route within a travel budget.
+
+The penalty column of the graph is the travel time. Routes are sequences of stops
+(the source, nodes with a positive prize, the target) and consecutive stops are
+joined by their shortest travel-time path, so Orienteering works on the travel
+time matrix between the stops; expand() turns a route back into graph nodes,
+which may pass through a node more than once (only the stops collect prizes).
+The source and the target may be the same node for a closed tour.
+
+Two engines share the route format:
+
+* label_dp() is the label DP of FPTAS_RRP over the stops: PathLabel rewards are
+  the prizes collected, penalties the travel time, and a label is kept per stop.
+  With epsilon = 0 a label is only dropped for one with at least the prize, at
+  most the time and a subset of its visited stops, which is exact but exponential
+  in the number of stops. With epsilon > 0 a stop keeps one label per reward
+  bucket floor(log(prize, 1 + delta)) as in FPTAS_RRP.
+* local_search() runs independent randomized starts in a process pool. Each
+  start builds a route by cheapest insertion (prize per extra travel time),
+  shortens it with 2-opt, fills the freed time with insertions, and then
+  alternates removing a few stops with the same repair for a fixed number of
+  iterations, keeping the best route found.
+"""
+import csv
+import math
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from pathproblems.csr import CSRGraph
+from pathproblems.labels import PathLabel
+from pathproblems.reduce import min_penalty_distances, min_penalty_tree, tree_path
+
+def load_prizes(filename):
+    """Read a node,prize CSV file (with a header line) into a dictionary."""
+    with open(filename, 'r') as f:
+        reader = csv.reader(f)
+        next(reader)  # Skip the header
+        return {row[0]: float(row[1]) for row in reader if row}
+
+def route_time(distance, route):
+    return sum(distance[a][b] for a, b in zip(route, route[1:]))
+
+def route_prize(prize, route):
+    return sum(prize[stop] for stop in set(route))
+
+def _insert(distance, prize, budget, route, rng, choices):
+    """Insert unvisited stops while the budget allows, picking among the choices best by prize per extra time."""
+    elapsed = route_time(distance, route)
+    while True:
+        visited = set(route)
+        candidates = []
+        for v in range(len(prize)):
+            if v in visited or prize[v] <= 0:
+                continue
+            for i in range(1, len(route)):
+                extra = distance[route[i - 1]][v] + distance[v][route[i]] - distance[route[i - 1]][route[i]]
+                if elapsed + extra <= budget:
+                    candidates.append((prize[v] / (extra + 1e-9), v, i, extra))
+        if not candidates:
+            return route
+        candidates.sort(reverse=True)
+        _, v, i, extra = candidates[rng.randrange(min(choices, len(candidates)))]
+        route.insert(i, v)
+        elapsed += extra
+
+def _two_opt(distance, route):
+    """Reverse interior segments while that shortens the route."""
+    elapsed = route_time(distance, route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 2):
+            for j in range(i + 1, len(route) - 1):
+                candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                candidate_time = route_time(distance, candidate)
+                if candidate_time < elapsed - 1e-9:
+                    route, elapsed = candidate, candidate_time
+                    improved = True
+    return route
+
+def _local_search(distance, prize, target, budget, seed, iterations):
+    """One randomized start; returns (prize, time, route) of the best route found."""
+    rng = random.Random(seed)
+    # The first start is the plain greedy construction
+    choices = 1 if seed == 0 else 3
+    route = _insert(distance, prize, budget, [0, target], rng, choices)
+    route = _insert(distance, prize, budget, _two_opt(distance, route), rng, choices)
+    best = (route_prize(prize, route), -route_time(distance, route), route)
+
+    for _ in range(iterations):
+        route = list(best[2])
+        interior = len(route) - 2
+        if interior > 0:
+            for _ in range(rng.randint(1, max(1, interior // 5))):
+                del route[rng.randint(1, len(route) - 2)]
+                if len(route) == 2:
+                    break
+        route = _two_opt(distance, route)
+        route = _insert(distance, prize, budget, route, rng, 3)
+        route = _insert(distance, prize, budget, _two_opt(distance, route), rng, 1)
+        candidate = (route_prize(prize, route), -route_time(distance, route), route)
+        if candidate[:2] > best[:2]:
+            best = candidate
+    return best[0], -best[1], best[2]
+
+class Orienteering:
+    def __init__(self, graph, prizes, source, target, budget):
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.budget = budget
+        csr = CSRGraph.from_dict(graph)
+        for node in (source, target):
+            if node not in csr.index:
+                raise ValueError(f"Node {node} not found in graph")
+        s, t = csr.index[source], csr.index[target]
+        from_source = min_penalty_distances(csr, s)
+        reverse, _ = csr.reverse()
+        to_target = min_penalty_distances(reverse, t)
+
+        # Stops that fit on a route within the budget; the source is stop 0
+        self.stops = [source] + [node for node in csr.nodes if node not in (source, target) and
+                                 prizes.get(node, 0) > 0 and
+                                 from_source[csr.index[node]] + to_target[csr.index[node]] <= budget]
+        if target != source:
+            self.stops.append(target)
+        self.target_stop = len(self.stops) - 1 if target != source else 0
+        self.prize = [prizes.get(node, 0) for node in self.stops]
+        self.distance = []
+        self.nodes = csr.nodes
+        self.index = csr.index
+        self.pred = {}  # Stop name -> predecessor ids of its shortest path tree, for expand()
+        for node in self.stops:
+            distances, self.pred[node] = min_penalty_tree(csr, csr.index[node])
+            self.distance.append([distances[csr.index[other]] for other in self.stops])
+
+    def result(self, route, method):
+        return {
+            'route': [self.stops[stop] for stop in route],
+            'prize': route_prize(self.prize, route),
+            'time': route_time(self.distance, route),
+            'method': method,
+        }
+
+    def label_dp(self, epsilon=0):
+        """Best route by the label DP (exact with epsilon = 0), or None if the target is out of budget."""
+        if self.distance[0][self.target_stop] > self.budget:
+            return None
+        n = len(self.stops)
+        delta = epsilon / max(n - 1, 1)
+        target = self.target_stop
+        root = PathLabel(self.prize[0], 0, None, None)
+        root.visited_nodes.add(0)
+        labels = [[] for _ in range(n)]
+        buckets = [{} for _ in range(n)]
+        labels[0].append(root)
+        dropped = set()  # Labels replaced before they were extended
+        queue = deque([root])
+        best = None
+
+        while queue:
+            label = queue.popleft()
+            if label in dropped:
+                continue
+            u = label.last_edge[1] if label.last_edge else 0
+            # Close the route here: travel on to the target
+            finish = label.penalty + self.distance[u][target]
+            if finish <= self.budget:
+                reward = label.reward + (self.prize[target] if target not in label.visited_nodes else 0)
+                if best is None or (reward, -finish) > (best[0], -best[1]):
+                    best = (reward, finish, label)
+
+            for v in range(n):
+                if v in label.visited_nodes or v == target:
+                    continue
+                new_penalty = label.penalty + self.distance[u][v]
+                # The target must stay reachable within the budget
+                if new_penalty + self.distance[v][target] > self.budget:
+                    continue
+                new_reward = label.reward + self.prize[v]
+                if epsilon > 0:
+                    bucket = 0 if new_reward <= 0 else math.floor(math.log(new_reward, 1 + delta))
+                    existing = buckets[v].get(bucket)
+                    if existing is not None and existing.penalty <= new_penalty:
+                        continue
+                    new_label = PathLabel(new_reward, new_penalty, label, (u, v), label.visited_nodes)
+                    if existing is not None:
+                        dropped.add(existing)
+                    buckets[v][bucket] = new_label
+                else:
+                    new_label = PathLabel(new_reward, new_penalty, label, (u, v), label.visited_nodes)
+                    if any(other.reward >= new_reward and other.penalty <= new_penalty and
+                           other.visited_nodes <= new_label.visited_nodes for other in labels[v]):
+                        continue
+                    kept = []
+                    for other in labels[v]:
+                        if (new_reward >= other.reward and new_penalty <= other.penalty and
+                                new_label.visited_nodes <= other.visited_nodes):
+                            dropped.add(other)
+                        else:
+                            kept.append(other)
+                    labels[v] = kept + [new_label]
+                queue.append(new_label)
+
+        # Labels never end at the target, the route is closed by the last leg
+        route = (best[2].reconstruct_path() or [0]) + [target]
+        return self.result(route, 'exact' if epsilon == 0 else f'label DP, epsilon = {epsilon}')
+
+    def local_search(self, starts=8, iterations=200, workers=None, seed=0):
+        """Best route over independent randomized starts run in a process pool, or None."""
+        if self.distance[0][self.target_stop] > self.budget:
+            return None
+        args = (self.distance, self.prize, self.target_stop, self.budget)
+        if workers == 1:
+            runs = [_local_search(*args, seed + k, iterations) for k in range(starts)]
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                futures = [executor.submit(_local_search, *args, seed + k, iterations) for k in range(starts)]
+                runs = [future.result() for future in futures]
+        _, _, route = max(runs, key=lambda run: (run[0], -run[1]))
+        return self.result(route, f'local search, {starts} starts')
+
+    def solve(self, method='auto', exact_limit=12, **options):
+        """label_dp() if method is 'exact' (or 'auto' with at most exact_limit stops), else local_search()."""
+        if method == 'exact' or (method == 'auto' and len(self.stops) <= exact_limit):
+            return self.label_dp()
+        return self.local_search(**options)
+
+    def expand(self, route):
+        """Graph nodes of a route of stop names, joining the stops by min travel-time paths."""
+        path = [route[0]]
+        for a, b in zip(route, route[1:]):
+            path.extend(self.nodes[v] for v in tree_path(self.pred[a], self.index[a], self.index[b])[1:])
+        return path
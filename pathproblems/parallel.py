@@ -0,0 +1,251 @@
+"""Multi-process rounds for the layered Bellman-Ford FPTAS (FPTAS_BiObjectiveSP).
+
+Round i of FPTAS_BiObjectiveSP builds the layer of every node v from layer i-1
+alone, so destination nodes can be relaxed independently. ParallelBiObjectiveSP
+keeps the solver state in multiprocessing.shared_memory blocks:
+
+* a label pool of (node, pred, reward, penalty) columns, grown by doubling;
+* the previous layer as CSR arrays: the buckets and label ids of node v are the
+  entries layer_offsets[v] to layer_offsets[v+1] - 1, in bucket insertion order.
+
+Each round the destination nodes with a changed in-neighbor are split into
+chunks of roughly equal in-edge counts. Workers relax the in-edges of their chunk
+(reverse adjacency in the graph's own edge order) and return the new bucket list
+of every node that changed. Chunks cover disjoint nodes, so the parent merges the
+results into the next layer without locks. Candidates are tried in the same order
+as the sequential solver, so the returned path and value are identical.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from pathproblems.graph import sort_nodes
+from pathproblems.layered import FPTAS_BiObjectiveSP
+
+# Reverse adjacency and bucketing parameters, set once per worker by _init_worker
+_worker_state = {}
+# Shared memory blocks attached in this worker, by name
+_worker_blocks = {}
+
+def _attach(name):
+    block = _worker_blocks.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks[name] = block
+    return block
+
+def _columns(names, formats):
+    return [_attach(name).buf.cast(fmt) for name, fmt in zip(names, formats)]
+
+POOL_FORMATS = ('q', 'q', 'q', 'q')  # node, pred, reward, penalty
+LAYER_FORMATS = ('q', 'q', 'q')  # offsets, buckets, label ids
+
+def _init_worker(in_offsets, in_sources, in_rewards, in_penalties, delta, num_buckets, Wx, Wy):
+    _worker_state.update(in_offsets=in_offsets, in_sources=in_sources, in_rewards=in_rewards,
+                         in_penalties=in_penalties, delta=delta, num_buckets=num_buckets, Wx=Wx, Wy=Wy)
+
+def _relax_chunk(pool_names, layer_names, nodes):
+    """Relax the in-edges of nodes against the previous layer; returns [(v, entries)] for changed nodes.
+
+    entries lists (bucket, label id or -1 for a new label, reward, penalty, pred) in bucket order.
+    """
+    # Blocks of earlier rounds have been replaced by the parent
+    for name in set(_worker_blocks) - set(pool_names) - set(layer_names):
+        _worker_blocks.pop(name).close()
+    label_node, label_pred, label_reward, label_penalty = _columns(pool_names, POOL_FORMATS)
+    offsets, buckets, labels = _columns(layer_names, LAYER_FORMATS)
+    state = _worker_state
+    in_offsets, in_sources = state['in_offsets'], state['in_sources']
+    in_rewards, in_penalties = state['in_rewards'], state['in_penalties']
+    delta, num_buckets, Wx, Wy = state['delta'], state['num_buckets'], state['Wx'], state['Wy']
+
+    changed = []
+    for v in nodes:
+        entries = {}
+        for k in range(offsets[v], offsets[v + 1]):
+            label = labels[k]
+            entries[buckets[k]] = (label, label_reward[label], label_penalty[label], label_pred[label])
+        updated = False
+
+        for e in range(in_offsets[v], in_offsets[v + 1]):
+            u = in_sources[e]
+            for k in range(offsets[u], offsets[u + 1]):
+                label = labels[k]
+                # Skip if v is already on the path; the bare source label has an empty path
+                on_path = False
+                current = label if label_pred[label] >= 0 else -1
+                while current >= 0:
+                    if label_node[current] == v:
+                        on_path = True
+                        break
+                    current = label_pred[current]
+                if on_path:
+                    continue
+
+                new_reward = label_reward[label] + in_rewards[e]
+                new_penalty = label_penalty[label] + in_penalties[e]
+                if new_reward > Wx or new_penalty > Wy:
+                    continue
+                new_bucket = 0 if delta == 0 else min(int((new_reward + 1e-9) / delta), num_buckets - 1)
+                existing = entries.get(new_bucket)
+                if existing is None or existing[2] < new_penalty:
+                    entries[new_bucket] = (-1, new_reward, new_penalty, label)
+                    updated = True
+
+        if updated:
+            changed.append((v, [(bucket,) + entry for bucket, entry in entries.items()]))
+    return changed
+
+class SharedColumns:
+    """Typed columns in one shared memory block each, with a fixed capacity."""
+    def __init__(self, formats, capacity):
+        self.formats = formats
+        self.capacity = max(capacity, 1)
+        self.blocks = [shared_memory.SharedMemory(create=True, size=8 * self.capacity) for _ in formats]
+        self.columns = [block.buf.cast(fmt) for block, fmt in zip(self.blocks, formats)]
+
+    @property
+    def names(self):
+        return [block.name for block in self.blocks]
+
+    def release(self):
+        for column in self.columns:
+            column.release()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+class ParallelBiObjectiveSP(FPTAS_BiObjectiveSP):
+    def __init__(self, graph, source, target, epsilon, workers=None, max_hops=None):
+        super().__init__(graph, source, target, epsilon, max_hops=max_hops)
+        self.workers = workers or os.cpu_count() or 1
+        self.node_list = sort_nodes(self.nodes)
+        self.node_ids = {node: i for i, node in enumerate(self.node_list)}
+
+    def reverse_adjacency(self):
+        """In-edges of every node as CSR arrays, in the order the sequential solver visits them."""
+        incoming = [[] for _ in self.node_list]
+        for u in self.graph:
+            for v, (reward, penalty) in self.graph[u].items():
+                incoming[self.node_ids[v]].append((self.node_ids[u], reward, penalty))
+        offsets = array('q', [0])
+        for edges in incoming:
+            offsets.append(offsets[-1] + len(edges))
+        edges = [edge for node_edges in incoming for edge in node_edges]
+        return (offsets, array('q', (u for u, _, _ in edges)),
+                array('q', (r for _, r, _ in edges)), array('q', (p for _, _, p in edges)))
+
+    def chunks(self, nodes, in_offsets):
+        """Split nodes into about 4 chunks per worker with similar in-edge counts."""
+        total = sum(in_offsets[v + 1] - in_offsets[v] for v in nodes) + len(nodes)
+        size = max(1, total // (4 * self.workers))
+        chunk, weight = [], 0
+        for v in nodes:
+            chunk.append(v)
+            weight += in_offsets[v + 1] - in_offsets[v] + 1
+            if weight >= size:
+                yield chunk
+                chunk, weight = [], 0
+        if chunk:
+            yield chunk
+
+    def solve(self):
+        """Return (path, value) of the best source-target path, or (None, inf)."""
+        if self.target not in self.node_ids:
+            return None, float('inf')
+        n = len(self.node_list)
+        in_offsets, in_sources, in_rewards, in_penalties = self.reverse_adjacency()
+        in_neighbors = [set(in_sources[in_offsets[v]:in_offsets[v + 1]]) for v in range(n)]
+
+        source = self.node_ids[self.source]
+        pool = SharedColumns(POOL_FORMATS, 1024)
+        pool.columns[0][0], pool.columns[1][0], pool.columns[2][0], pool.columns[3][0] = source, -1, 0, 0
+        num_labels = 1
+        layer = SharedColumns(LAYER_FORMATS, n + 1)
+        for v in range(n + 1):
+            layer.columns[0][v] = 0 if v <= source else 1
+        layer.columns[1][0] = 0
+        layer.columns[2][0] = 0
+        changed_nodes = {source}
+
+        executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                       initargs=(in_offsets, in_sources, in_rewards, in_penalties,
+                                                 self.delta, self.num_buckets, self.Wx, self.Wy))
+        try:
+            for _ in range(self.rounds):
+                # Only nodes with an in-neighbor that changed in the last round can change now
+                dirty = [v for v in range(n) if not in_neighbors[v].isdisjoint(changed_nodes)]
+                if not dirty:
+                    break
+                futures = [executor.submit(_relax_chunk, pool.names, layer.names, chunk)
+                           for chunk in self.chunks(dirty, in_offsets)]
+                updates = {}
+                for future in futures:
+                    updates.update(future.result())
+                changed_nodes = set(updates)
+
+                # Merge: new labels go to the pool, then the next layer is written in node order
+                num_new = sum(1 for entries in updates.values() for entry in entries if entry[1] < 0)
+                if num_labels + num_new > pool.capacity:
+                    grown = SharedColumns(POOL_FORMATS, 2 * (num_labels + num_new))
+                    for old, new in zip(pool.columns, grown.columns):
+                        new[:num_labels] = old[:num_labels]
+                    pool.release()
+                    pool = grown
+                label_node, label_pred, label_reward, label_penalty = pool.columns
+
+                offsets, buckets, labels = layer.columns
+                size = offsets[n] + sum(len(entries) - (offsets[v + 1] - offsets[v]) for v, entries in updates.items())
+                next_layer = SharedColumns(LAYER_FORMATS, max(size, n + 1))
+                next_offsets, next_buckets, next_labels = next_layer.columns
+                k = 0
+                for v in range(n):
+                    next_offsets[v] = k
+                    entries = updates.get(v)
+                    if entries is None:
+                        count = offsets[v + 1] - offsets[v]
+                        next_buckets[k:k + count] = buckets[offsets[v]:offsets[v + 1]]
+                        next_labels[k:k + count] = labels[offsets[v]:offsets[v + 1]]
+                        k += count
+                        continue
+                    for bucket, label, reward, penalty, pred in entries:
+                        if label < 0:
+                            label = num_labels
+                            label_node[label], label_pred[label] = v, pred
+                            label_reward[label], label_penalty[label] = reward, penalty
+                            num_labels += 1
+                        next_buckets[k] = bucket
+                        next_labels[k] = label
+                        k += 1
+                next_offsets[n] = k
+                layer.release()
+                layer = next_layer
+
+            offsets, buckets, labels = layer.columns
+            target = self.node_ids[self.target]
+            min_value = float('inf')
+            best_label = None
+            for k in range(offsets[target], offsets[target + 1]):
+                label = labels[k]
+                value = pool.columns[2][label] - pool.columns[3][label]
+                if value < min_value:
+                    min_value = value
+                    best_label = label
+            if best_label is None:
+                return None, float('inf')
+
+            path = []
+            label = best_label
+            while label >= 0:
+                path.append(self.node_list[pool.columns[0][label]])
+                label = pool.columns[1][label]
+            path.reverse()
+            if len(path) < 2:
+                # The bare source label stands for the empty path, as in PathLabel.reconstruct_path
+                path = []
+            return path, min_value
+        finally:
+            executor.shutdown()
+            pool.release()
+            layer.release()
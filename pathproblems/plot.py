@@ -0,0 +1,16 @@
+"""Optional path plotting (needs networkx and matplotlib)."""
+
+def plot_path(edges, path, title=None):
+    """Draw the graph {(u, v): (reward, penalty)} with the path highlighted."""
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
+    G = nx.DiGraph()
+    G.add_edges_from(edges)
+    pos = nx.spring_layout(G)
+    nx.draw(G, pos, with_labels=True, node_size=700, node_color="lightblue", arrowsize=20)
+    nx.draw_networkx_edges(G, pos, edgelist=list(zip(path, path[1:])), edge_color='r', width=2)
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=dict(edges))
+    if title:
+        plt.title(title)
+    plt.show()
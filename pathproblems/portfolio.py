@@ -0,0 +1,225 @@
+"""Solver portfolio for the Restricted Rewarding Path problem.
+
+PortfolioRRP starts several engines on the same query, each in its own process
+(forked, so the graph is shared copy-on-write), and exchanges what they learn:
+
+* fptas    FPTAS_RRP.solve() with its epsilon schedule; reports the incumbent
+           after every pass and prunes later passes with its own LARAC bound
+           or the better bound found by the ilp or larac engine.
+* scaling  ScalingFPTAS_RRP, the scaled reward DP; reports its path.
+* ilp      the MTZ model of solve_rrp_ilp; better paths from the other engines
+           are injected as MIP solutions, its best bound is reported back.
+* larac    LARAC_RRP; reports its feasible path and the Lagrangian bound.
+
+Every engine sends ('incumbent', ...) and ('done', ...) messages to the
+coordinator, which forwards new incumbents and bounds to the other engines.
+Only ('bound', ...) messages close the race or prune other engines, so only
+engines with a valid bound send them: the ILP best bound, the Lagrangian
+bound, and a proof that no feasible path exists. The fptas and scaling DPs
+drop labels with a visited-set heuristic, so their reward brackets are not
+bounds on the optimum and are never sent. As soon as the best path is within the requested relative gap
+of the best bound (gap=0: proven optimal), or every engine is done, or the
+deadline passes, the remaining processes are killed.
+"""
+import math
+import multiprocessing
+import queue
+import time
+
+def _drain(inbox):
+    """Non-blocking read of every message waiting in inbox."""
+    messages = []
+    while True:
+        try:
+            messages.append(inbox.get_nowait())
+        except queue.Empty:
+            return messages
+
+def _run_fptas(graph, source, target, constraint_C, epsilon, outbox, inbox):
+    from pathproblems.fptas import FPTAS_RRP
+
+    def on_pass(result):
+        if result['path'] is not None:
+            outbox.put(('incumbent', 'fptas', result['total_reward'], result['total_penalty'], result['path']))
+        for message in _drain(inbox):
+            if message[0] == 'incumbent' and (message[2], -message[3]) > (result['total_reward'],
+                                                                           -result['total_penalty']):
+                result.update(path=message[4], total_reward=message[2], total_penalty=message[3])
+            elif message[0] == 'bound':
+                # Slack so that float rounding of another engine's bound never prunes an optimal label
+                bound = message[2] + 1e-6 * (1 + abs(message[2]))
+                result['upper_bound'] = min(result['upper_bound'], bound)
+
+    FPTAS_RRP(graph, source, target, constraint_C, epsilon).solve(on_pass=on_pass)
+
+def _run_scaling(graph, source, target, constraint_C, epsilon, outbox, inbox):
+    from pathproblems.scaling import ScalingFPTAS_RRP
+
+    solver = ScalingFPTAS_RRP(graph, source, target, constraint_C, epsilon)
+    result = solver.run()
+    if result is None:
+        outbox.put(('bound', 'scaling', -math.inf))
+        return
+    outbox.put(('incumbent', 'scaling', *result))
+    if solver.bounds is None and result[0] <= 0:
+        # No positive reward on any edge
+        outbox.put(('bound', 'scaling', 0))
+
+def _run_ilp(graph, source, target, constraint_C, epsilon, outbox, inbox):
+    from pathproblems.graph import graph_nodes, sort_nodes
+    from pathproblems.ilp import import_gurobi, solve_rrp_ilp
+
+    gp, GRB = import_gurobi()
+    gp.setParam('OutputFlag', 0)
+    edges = {(u, v): weights for u in graph for v, weights in graph[u].items()}
+    best = [-math.inf]  # Reward of the last injected path
+    bounds = [math.inf]  # Last reported bound
+
+    def callback(model, where):
+        if where == GRB.Callback.MIPSOL:
+            values = model.cbGetSolution(model._x)
+            successor = {u: v for (u, v), value in values.items() if value > 0.5}
+            path = [source]
+            while path[-1] != target and path[-1] in successor and len(path) <= len(successor):
+                path.append(successor[path[-1]])
+            steps = list(zip(path, path[1:]))
+            outbox.put(('incumbent', 'ilp', sum(edges[e][0] for e in steps), sum(edges[e][1] for e in steps), path))
+        elif where == GRB.Callback.MIP:
+            bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+            if bound < bounds[0]:
+                bounds[0] = bound
+                outbox.put(('bound', 'ilp', bound))
+        elif where == GRB.Callback.MIPNODE:
+            for message in _drain(inbox):
+                if message[0] != 'incumbent' or message[2] <= best[0]:
+                    continue
+                best[0] = message[2]
+                path_edges = set(zip(message[4], message[4][1:]))
+                model.cbSetSolution(list(model._x.values()), [1.0 if e in path_edges else 0.0 for e in model._x])
+                model.cbUseSolution()
+
+    result = solve_rrp_ilp(edges, sort_nodes(graph_nodes(graph)), source, target, constraint_C, callback=callback)
+    if result is None:
+        outbox.put(('bound', 'ilp', -math.inf))
+    else:
+        outbox.put(('incumbent', 'ilp', result['total_reward'], result['total_penalty'], result['path']))
+        outbox.put(('bound', 'ilp', result['total_reward']))
+
+def _run_larac(graph, source, target, constraint_C, epsilon, outbox, inbox):
+    from pathproblems.lagrangian import LARAC_RRP
+
+    result = LARAC_RRP(graph, source, target, constraint_C).run()
+    if result is None:
+        outbox.put(('bound', 'larac', -math.inf))
+        return
+    outbox.put(('incumbent', 'larac', result['total_reward'], result['total_penalty'], result['path']))
+    # With positive cycles the bound can be infinite, which bounds nothing
+    if math.isfinite(result['upper_bound']):
+        outbox.put(('bound', 'larac', result['upper_bound']))
+
+ENGINES = {
+    'fptas': _run_fptas,
+    'scaling': _run_scaling,
+    'ilp': _run_ilp,
+    'larac': _run_larac,
+}
+
+def _engine_main(name, args, outbox, inbox):
+    try:
+        ENGINES[name](*args, outbox, inbox)
+    except Exception as error:
+        outbox.put(('error', name, f"{type(error).__name__}: {error}"))
+    finally:
+        outbox.put(('done', name))
+
+class PortfolioRRP:
+    def __init__(self, graph, source, target, constraint_C, epsilon=0.1, gap=0.0,
+                 engines=('fptas', 'scaling', 'ilp')):
+        for name in engines:
+            if name not in ENGINES:
+                raise ValueError(f"Unknown engine {name!r}, expected one of {sorted(ENGINES)}")
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.C = constraint_C
+        self.epsilon = epsilon
+        self.gap = gap
+        self.engines = tuple(engines)
+        # With integer rewards, a bound can be rounded down to an integer
+        self.integral = all(float(r).is_integer() for u in graph for r, p in graph[u].values())
+        self.events = []  # (seconds, engine, message kind, value) in arrival order, engine errors included
+
+    def closed(self, result):
+        return (result['upper_bound'] < math.inf and
+                result['total_reward'] >= (1 - self.gap) * result['upper_bound'] - 1e-9)
+
+    def solve(self, deadline=None):
+        """Race the engines; returns a dict with path, total_reward, total_penalty, upper_bound,
+        gap, proven (the gap was met), winner (the engine that closed it) and seconds."""
+        start = time.monotonic()
+        context = multiprocessing.get_context()
+        outbox = context.Queue()
+        inboxes = {name: context.Queue() for name in self.engines}
+        query = (self.graph, self.source, self.target, self.C, self.epsilon)
+        processes = {name: context.Process(target=_engine_main, args=(name, query, outbox, inboxes[name]),
+                                           daemon=True)
+                     for name in self.engines}
+        for process in processes.values():
+            process.start()
+
+        result = {'path': None, 'total_reward': -math.inf, 'total_penalty': math.inf, 'upper_bound': math.inf,
+                  'winner': None}
+        running = set(self.engines)
+        try:
+            while running and not self.closed(result):
+                timeout = None
+                if deadline is not None:
+                    timeout = start + deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                try:
+                    message = outbox.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                kind, name = message[0], message[1]
+                self.events.append((time.monotonic() - start, name, kind, message[2] if len(message) > 2 else None))
+                if kind == 'done':
+                    running.discard(name)
+                elif kind == 'incumbent':
+                    _, _, reward, penalty, path = message
+                    if penalty <= self.C and (reward, -penalty) > (result['total_reward'], -result['total_penalty']):
+                        result.update(path=path, total_reward=reward, total_penalty=penalty, winner=name)
+                        self.forward(inboxes, name, message)
+                elif kind == 'bound':
+                    bound = message[2]
+                    if self.integral and -math.inf < bound < math.inf:
+                        bound = math.floor(bound + 1e-6)
+                    if bound < result['upper_bound']:
+                        result.update(upper_bound=bound, winner=name)
+                        self.forward(inboxes, name, ('bound', name, bound))
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.kill()
+            for process in processes.values():
+                process.join()
+
+        if result['path'] is None:
+            # No engine found a feasible path; a -inf bound proves there is none
+            result.update(total_reward=0, total_penalty=0)
+        result['proven'] = self.closed(result) or result['upper_bound'] == -math.inf
+        if result['upper_bound'] in (-math.inf, math.inf) or result['path'] is None:
+            result['gap'] = 0.0 if result['proven'] else math.inf
+        elif result['upper_bound'] > 0:
+            result['gap'] = max(0.0, (result['upper_bound'] - result['total_reward']) / result['upper_bound'])
+        else:
+            result['gap'] = 0.0
+        if not result['proven']:
+            result['winner'] = None
+        result['seconds'] = time.monotonic() - start
+        return result
+
+    def forward(self, inboxes, sender, message):
+        for name, inbox in inboxes.items():
+            if name != sender:
+                inbox.put(message)
@@ -0,0 +1,259 @@
+"""Empirical scaling profile: per-phase time and memory of the solvers across input sizes.
+
+    pathproblems profile --nodes 20,40,80 --epsilons 0.5,0.25 --solvers fptas,ilp
+
+For every graph size (generated with generate_graph, --density edges per node) and
+epsilon, each solver runs as a sequence of phases:
+
+* fptas  load, transform (FPTAS_RRP setup), search (propagate), reconstruct
+* dp     load, transform, search (the Bellman-Ford rounds), reconstruct
+* ilp    load, transform (presolve), model build, optimize, reconstruct
+
+and every phase is measured three times: plain wall time (best of --repeat runs, so
+first-call costs such as imports and the Gurobi environment stay out),
+peak memory above the start of the phase under tracemalloc together with the
+allocation sites that grew most, and cProfile statistics. The report fits the
+growth exponent k of time and peak memory against the edge count (value ~ m^k, a
+least squares line on log-log axes) and against 1 / epsilon, and lists the top
+allocation sites and hottest functions of the largest instance. --json keeps the
+raw measurements.
+
+The dp keeps O(n^2 / epsilon) reward buckets per round and takes minutes from
+about 60 nodes on, so it is not in the default sweep; profile it on small sizes.
+"""
+import cProfile
+import math
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+
+PHASES = ('load', 'transform', 'search', 'model build', 'optimize', 'reconstruct')
+
+def fptas_phases(filename, target, constraint_C, epsilon):
+    from pathproblems.fptas import FPTAS_RRP
+    from pathproblems.graph import load_graph
+
+    yield 'load'
+    graph = load_graph(filename)
+    yield 'transform'
+    fptas = FPTAS_RRP(graph, 'n0', target, constraint_C, epsilon)
+    pareto_sets = fptas.initial_pareto_sets()
+    yield 'search'
+    fptas.propagate(pareto_sets, [fptas.source])
+    yield 'reconstruct'
+    fptas.best_result(pareto_sets)
+
+def dp_phases(filename, target, constraint_C, epsilon):
+    from pathproblems.graph import load_graph
+    from pathproblems.layered import FPTAS_BiObjectiveSP
+
+    yield 'load'
+    graph = load_graph(filename)
+    yield 'transform'
+    solver = FPTAS_BiObjectiveSP(graph, 'n0', target, epsilon)
+    yield 'search'
+    layer = None
+    for _, layer in solver.run_rounds():
+        pass
+    yield 'reconstruct'
+    solver.best_at_target(layer)
+
+def ilp_phases(filename, target, constraint_C, epsilon):
+    from pathproblems.graph import read_graph
+    from pathproblems.ilp import build_rrp_model, import_gurobi, presolve, rrp_solution
+
+    gp, _ = import_gurobi()
+    gp.setParam('OutputFlag', 0)
+    yield 'load'
+    edges, nodes = read_graph(filename)
+    yield 'transform'
+    edges, nodes, bounds = presolve(edges, nodes, 'n0', target, constraint_C)
+    yield 'model build'
+    m = build_rrp_model(edges, nodes, 'n0', target, constraint_C, bounds)
+    m.update()  # Gurobi adds the pending variables and constraints lazily
+    yield 'optimize'
+    m.optimize()
+    yield 'reconstruct'
+    rrp_solution(m, edges, 'n0', target, constraint_C)
+
+SOLVERS = {
+    'fptas': fptas_phases,
+    'dp': dp_phases,
+    'ilp': ilp_phases,
+}
+
+# Solvers whose running time depends on epsilon
+APPROXIMATE = ('fptas', 'dp')
+
+def run_phases(steps, begin, end):
+    """Drive a phase generator, calling begin(phase) before and end(phase) after every phase."""
+    phase = next(steps)
+    while phase is not None:
+        begin(phase)
+        following = next(steps, None)
+        end(phase)
+        phase = following
+
+def measure_time(phases, repeat):
+    """Best wall time of every phase over repeat runs."""
+    best = {}
+    for _ in range(repeat):
+        starts = {}
+        run_phases(phases(), lambda phase: starts.__setitem__(phase, time.perf_counter()),
+                   lambda phase: best.__setitem__(phase, min(best.get(phase, math.inf),
+                                                             time.perf_counter() - starts[phase])))
+    return best
+
+def measure_memory(phases, top):
+    """Peak traced bytes of every phase above its starting point, and the sites that grew most."""
+    peaks, sites = {}, {}
+    state = {}
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen *>'),
+              tracemalloc.Filter(False, __file__)]
+
+    def begin(phase):
+        state['snapshot'] = tracemalloc.take_snapshot().filter_traces(ignore)
+        state['current'] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end(phase):
+        peaks[phase] = max(0, tracemalloc.get_traced_memory()[1] - state['current'])
+        growth = tracemalloc.take_snapshot().filter_traces(ignore).compare_to(state['snapshot'], 'lineno')
+        sites[phase] = [(str(stat.traceback[0]), stat.size_diff) for stat in growth[:top] if stat.size_diff > 0]
+
+    tracemalloc.start()
+    try:
+        run_phases(phases(), begin, end)
+    finally:
+        tracemalloc.stop()
+    return peaks, sites
+
+def measure_profile(phases, top):
+    """The top functions by own time of every phase as (function, calls, own seconds, cumulative seconds)."""
+    profiles = {}
+
+    def begin(phase):
+        profiles[phase] = cProfile.Profile()
+        profiles[phase].enable()
+
+    run_phases(phases(), begin, lambda phase: profiles[phase].disable())
+    hottest = {}
+    for phase, profile in profiles.items():
+        rows = []
+        body = [f'({phase} phase body)', 1, 0.0, 0.0]
+        for (filename, line, function), (_, calls, own, cumulative, _) in pstats.Stats(profile).stats.items():
+            if function in ("<built-in method builtins.next>", "<method 'disable' of '_lsprof.Profiler' objects>"):
+                continue  # Resuming the phase generator and stopping the profiler
+            if filename == __file__:
+                # Time in the phase body itself, including native calls such as Gurobi's optimize
+                body[2] += own
+                body[3] = max(body[3], cumulative)
+                continue
+            rows.append((f"{os.path.basename(filename)}:{line}({function})", calls, own, cumulative))
+        rows.append(tuple(body))
+        hottest[phase] = sorted(rows, key=lambda row: -row[2])[:top]
+    return hottest
+
+def growth_exponent(points):
+    """Least squares slope of log(value) over log(size) for (size, value) points, or None."""
+    points = [(math.log(size), math.log(value)) for size, value in points if size > 0 and value > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+def profile_sweep(sizes, epsilons, solvers, density=5, constraint_C=20, repeat=3, top=5, seed=1, log=print):
+    """Run every solver on every size and epsilon; returns a list of measurement dictionaries."""
+    from pathproblems.generate import generate_graph
+
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for nodes in sizes:
+            filename = os.path.join(directory, f'graph_{nodes}.csv')
+            filename, target = generate_graph(nodes, density * nodes, filename, seed=seed)
+            for name in solvers:
+                for epsilon in (epsilons if name in APPROXIMATE else epsilons[:1]):
+                    def phases():
+                        return SOLVERS[name](filename, target, constraint_C, epsilon)
+
+                    record = {'solver': name, 'nodes': nodes, 'edges': density * nodes, 'epsilon': epsilon}
+                    try:
+                        record['seconds'] = measure_time(phases, repeat)
+                        record['peak'], record['sites'] = measure_memory(phases, top)
+                        record['hottest'] = measure_profile(phases, top)
+                    except Exception as error:
+                        # e.g. a size-limited Gurobi license on the larger models
+                        log(f"{name}, {nodes} nodes, epsilon {epsilon}: skipped ({type(error).__name__}: {error})")
+                        continue
+                    log(f"{name}, {nodes} nodes, epsilon {epsilon}: {sum(record['seconds'].values()):.3f}s")
+                    records.append(record)
+    return records
+
+def exponents(records, solver, axis):
+    """{phase: (time exponent, memory exponent)} of one solver along 'edges' (at the first epsilon)
+    or 'epsilon' (1 / epsilon, at the largest size)."""
+    rows = [record for record in records if record['solver'] == solver]
+    if not rows:
+        return {}
+    if axis == 'edges':
+        epsilon = rows[0]['epsilon']
+        rows = [record for record in rows if record['epsilon'] == epsilon]
+        size = lambda record: record['edges']
+    else:
+        largest = max(record['nodes'] for record in rows)
+        rows = [record for record in rows if record['nodes'] == largest]
+        size = lambda record: 1 / record['epsilon']
+    result = {}
+    for phase in PHASES:
+        if phase in rows[0]['seconds']:
+            result[phase] = (growth_exponent([(size(record), record['seconds'][phase]) for record in rows]),
+                             growth_exponent([(size(record), record['peak'][phase]) for record in rows]))
+    return result
+
+def format_exponent(value):
+    return '    -' if value is None else f"{value:5.2f}"
+
+def report(records, top=5):
+    """Text report of a profile_sweep()."""
+    lines = []
+    solvers = list(dict.fromkeys(record['solver'] for record in records))
+    for solver in solvers:
+        lines.append(f"\n{solver}")
+        lines.append(f"{'nodes':>7} {'edges':>7} {'epsilon':>8} {'phase':<12} {'seconds':>10} {'peak KiB':>10}")
+        for record in records:
+            if record['solver'] != solver:
+                continue
+            for phase, seconds in record['seconds'].items():
+                lines.append(f"{record['nodes']:>7} {record['edges']:>7} {record['epsilon']:>8g} {phase:<12} "
+                             f"{seconds:>10.4f} {record['peak'][phase] / 1024:>10.1f}")
+
+    lines.append("\nGrowth exponents k (value ~ x^k): time / peak memory")
+    lines.append(f"{'solver':<7} {'phase':<12} {'x = edges':>13}   {'x = 1/epsilon':>13}")
+    for solver in solvers:
+        by_edges = exponents(records, solver, 'edges')
+        by_epsilon = exponents(records, solver, 'epsilon') if solver in APPROXIMATE else {}
+        for phase, (seconds, peak) in by_edges.items():
+            epsilon_seconds, epsilon_peak = by_epsilon.get(phase, (None, None))
+            lines.append(f"{solver:<7} {phase:<12} {format_exponent(seconds)} / {format_exponent(peak)} "
+                         f"  {format_exponent(epsilon_seconds)} / {format_exponent(epsilon_peak)}")
+
+    for solver in solvers:
+        rows = [record for record in records if record['solver'] == solver]
+        # Largest instance, at the smallest epsilon
+        largest = max(rows, key=lambda record: (record['edges'], 1 / record['epsilon']))
+        lines.append(f"\n{solver}, {largest['nodes']} nodes, epsilon {largest['epsilon']}: "
+                     f"top allocation sites (net growth per phase)")
+        for phase, sites in largest['sites'].items():
+            for site, size in sites[:top]:
+                lines.append(f"  {phase:<12} {size / 1024:>10.1f} KiB  {site}")
+        lines.append(f"{solver}, {largest['nodes']} nodes, epsilon {largest['epsilon']}: hottest functions (own time)")
+        for phase, functions in largest['hottest'].items():
+            for function, calls, own, cumulative in functions[:top]:
+                lines.append(f"  {phase:<12} {own:>8.4f}s own {cumulative:>8.4f}s cum {calls:>9} calls  {function}")
+    return '\n'.join(lines)
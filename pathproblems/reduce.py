@@ -0,0 +1,155 @@
+"""Source-target graph reduction before the label search.
+
+Two passes on the CSR graph:
+
+1. Relevance pruning. Dijkstra on penalties gives d_s (from the source) and d_t
+   (to the target). Edge (u, v) is dropped when d_s(u) + p(u, v) + d_t(v) > C,
+   since no feasible source-target path can use it. Edges entering the source or
+   leaving the target are dropped too, since a simple path never uses them.
+2. Chain contraction. A node other than s and t with exactly one in-edge u -> v
+   and one out-edge v -> w can only be crossed as u -> v -> w, so both edges are
+   replaced by a composite edge u -> w with summed (reward, penalty).
+
+ReducedGraph.expand_path maps a path of the reduced graph back to the original nodes.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+from pathproblems.csr import CSRGraph
+
+def min_penalty_distances(csr, start):
+    """Dijkstra over penalties from node id start; unreachable nodes get math.inf."""
+    return min_penalty_tree(csr, start)[0]
+
+def min_penalty_tree(csr, start):
+    """Dijkstra over penalties from node id start: (distances, predecessor ids), -1 for no predecessor."""
+    distances = [math.inf] * csr.num_nodes
+    pred = [-1] * csr.num_nodes
+    distances[start] = 0
+    heap = [(0, start)]
+    while heap:
+        distance, u = heapq.heappop(heap)
+        if distance > distances[u]:
+            continue
+        for e in csr.out_edges(u):
+            v = csr.targets[e]
+            new_distance = distance + csr.penalties[e]
+            if new_distance < distances[v]:
+                distances[v] = new_distance
+                pred[v] = u
+                heapq.heappush(heap, (new_distance, v))
+    return distances, pred
+
+def tree_path(pred, start, end):
+    """Node ids from start to end along the predecessors of min_penalty_tree(csr, start), or None if
+    end is unreachable."""
+    if end != start and pred[end] < 0:
+        return None
+    path = [end]
+    while pred[path[-1]] >= 0:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path
+
+class ReducedGraph:
+    def __init__(self, csr, composite, original_nodes, original_edges):
+        self.csr = csr
+        self.composite = composite  # (u, w) names -> interior node names of a contracted chain
+        self.original_nodes = original_nodes
+        self.original_edges = original_edges
+
+    @property
+    def graph(self):
+        """The reduced graph as a graph[u][v] = (reward, penalty) dictionary."""
+        return self.csr.to_dict()
+
+    def expand_path(self, path):
+        """Re-insert the contracted chain nodes into a path of the reduced graph."""
+        if not path:
+            return path
+        expanded = [path[0]]
+        for u, v in zip(path, path[1:]):
+            expanded.extend(self.composite.get((u, v), ()))
+            expanded.append(v)
+        return expanded
+
+    def summary(self):
+        return (f"Reduced graph: {self.csr.num_nodes}/{self.original_nodes} nodes, "
+                f"{self.csr.num_edges}/{self.original_edges} edges, {len(self.composite)} contracted chains")
+
+def reduce_graph(graph, source, target, constraint_C=math.inf, contract_chains=True):
+    """Reduce a dictionary or CSRGraph for one source-target query with penalty budget constraint_C."""
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_dict(graph)
+    for node in (source, target):
+        if node not in csr.index:
+            raise ValueError(f"Node {node} not found in graph")
+    s, t = csr.index[source], csr.index[target]
+
+    from_source = min_penalty_distances(csr, s)
+    reverse, _ = csr.reverse()
+    to_target = min_penalty_distances(reverse, t)
+
+    # Relevance pruning; edges[(u, v)] = (reward, penalty, interior node ids)
+    edges = {}
+    for u in range(csr.num_nodes):
+        if from_source[u] == math.inf or u == t:
+            continue
+        for e in csr.out_edges(u):
+            v = csr.targets[e]
+            if v != s and from_source[u] + csr.penalties[e] + to_target[v] <= constraint_C:
+                edges[(u, v)] = (csr.rewards[e], csr.penalties[e], ())
+
+    out_adj = defaultdict(set)
+    in_adj = defaultdict(set)
+    for u, v in edges:
+        out_adj[u].add(v)
+        in_adj[v].add(u)
+
+    def drop_edge(u, v):
+        del edges[(u, v)]
+        out_adj[u].discard(v)
+        in_adj[v].discard(u)
+        worklist.update((u, v))
+
+    # Contract chains and remove the dead ends that pruning a chain can leave behind
+    worklist = set(out_adj) | set(in_adj)
+    while worklist:
+        v = worklist.pop()
+        if v == s or v == t:
+            continue
+        if not in_adj[v] or not out_adj[v]:
+            for w in list(out_adj[v]):
+                drop_edge(v, w)
+            for u in list(in_adj[v]):
+                drop_edge(u, v)
+            continue
+        if not contract_chains or len(in_adj[v]) != 1 or len(out_adj[v]) != 1:
+            continue
+
+        u = next(iter(in_adj[v]))
+        w = next(iter(out_adj[v]))
+        if u == w or (u, w) in edges:
+            continue
+        reward_1, penalty_1, interior_1 = edges[(u, v)]
+        reward_2, penalty_2, interior_2 = edges[(v, w)]
+        drop_edge(u, v)
+        drop_edge(v, w)
+        if from_source[u] + penalty_1 + penalty_2 + to_target[w] <= constraint_C:
+            edges[(u, w)] = (reward_1 + reward_2, penalty_1 + penalty_2, interior_1 + (v,) + interior_2)
+            out_adj[u].add(w)
+            in_adj[w].add(u)
+        worklist.discard(v)
+
+    kept = {s, t}
+    for u, v in edges:
+        kept.update((u, v))
+    nodes = [node for i, node in enumerate(csr.nodes) if i in kept]
+
+    names = csr.nodes
+    reduced = CSRGraph.from_edges(
+        nodes, [(names[u], names[v], reward, penalty) for (u, v), (reward, penalty, _) in edges.items()]
+    )
+    composite = {(names[u], names[v]): [names[i] for i in interior]
+                 for (u, v), (_, _, interior) in edges.items() if interior}
+    return ReducedGraph(reduced, composite, csr.num_nodes, csr.num_edges)
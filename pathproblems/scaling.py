@@ -0,0 +1,157 @@
+"""Bound-tightening scaling FPTAS for the Restricted Rewarding Path problem.
+
+Follows the scheme of Lorenz and Raz (2001) for restricted shortest paths:
+
+1. A cheap feasible path and the n-1 largest edge rewards bracket the optimum
+   reward OPT between a lower bound LB and an upper bound UB.
+2. Coarse tests, each a scaling DP with epsilon = 1, shrink UB / LB to a constant.
+3. A final DP on rewards rounded down to multiples of S = epsilon * LB / (n-1)
+   returns a path whose reward is at least (1 - epsilon) * OPT.
+
+Every DP stores one label per (node, scaled reward) in plain per-node lists of
+length O(n / epsilon), independent of the magnitude of the weights. As in
+FPTAS_RRP, paths are kept simple by rejecting extensions that revisit a node.
+That check drops labels heuristically, so the coarse tests can miss a path and
+the bracket of step 2 is a heuristic one, not a proof of the range of OPT.
+"""
+import heapq
+import math
+from collections import deque
+
+from pathproblems.graph import graph_nodes
+from pathproblems.labels import PredecessorLabel
+
+class ScalingFPTAS_RRP:
+    def __init__(self, graph, source, target, constraint_C, epsilon):
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.C = constraint_C
+        self.epsilon = epsilon
+        self.nodes = graph_nodes(graph)
+        self.n = len(self.nodes)
+        self.num_tests = 0
+        self.bounds = None  # Heuristic (LB, UB) bracket used by the final DP; LB may be None
+
+    def min_penalty_path(self):
+        """Dijkstra on penalties; returns the PredecessorLabel of the cheapest path to the target or None."""
+        best = {self.source: 0}
+        labels = {self.source: PredecessorLabel(0, 0, self.source)}
+        heap = [(0, 0, self.source)]
+        counter = 1  # Tie breaker so labels are never compared
+        done = set()
+
+        while heap:
+            penalty, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            if node == self.target:
+                return labels[node]
+            label = labels[node]
+            for neighbor, (edge_reward, edge_penalty) in self.graph.get(node, {}).items():
+                new_penalty = penalty + edge_penalty
+                if neighbor not in done and new_penalty < best.get(neighbor, math.inf):
+                    best[neighbor] = new_penalty
+                    labels[neighbor] = PredecessorLabel(label.reward + edge_reward, new_penalty, neighbor, label)
+                    heapq.heappush(heap, (new_penalty, counter, neighbor))
+                    counter += 1
+        return None
+
+    def scaled_dp(self, scale, cap):
+        """Label-correcting DP over rewards rounded down to multiples of scale.
+
+        Scaled rewards are capped at cap, so every node holds at most cap + 1 labels.
+        Returns the target's label list, indexed by scaled reward.
+        """
+        penalties = {node: [math.inf] * (cap + 1) for node in self.nodes}
+        labels = {node: [None] * (cap + 1) for node in self.nodes}
+        penalties[self.source][0] = 0
+        labels[self.source][0] = PredecessorLabel(0, 0, self.source)
+
+        queue = deque([self.source])
+        in_queue = {self.source}
+
+        while queue:
+            node = queue.popleft()
+            in_queue.remove(node)
+
+            for k, label in enumerate(labels[node]):
+                if label is None:
+                    continue
+                for neighbor, (edge_reward, edge_penalty) in self.graph.get(node, {}).items():
+                    new_penalty = label.penalty + edge_penalty
+                    if new_penalty > self.C:
+                        continue
+                    new_k = min(cap, k + int(edge_reward // scale))
+                    if penalties[neighbor][new_k] <= new_penalty:
+                        continue
+                    # Skip if the neighbor is already in the path (avoid cycles)
+                    if label.contains(neighbor):
+                        continue
+
+                    penalties[neighbor][new_k] = new_penalty
+                    labels[neighbor][new_k] = PredecessorLabel(label.reward + edge_reward, new_penalty, neighbor, label)
+                    if neighbor not in in_queue:
+                        queue.append(neighbor)
+                        in_queue.add(neighbor)
+
+        return labels[self.target]
+
+    def test(self, value):
+        """Decide OPT >= value (True) or OPT < 2 * value (False) with a coarse epsilon = 1 DP."""
+        self.num_tests += 1
+        hops = max(self.n - 1, 1)
+        scale = value / hops
+        cap = hops
+        return self.scaled_dp(scale, cap)[cap] is not None
+
+    def find_bounds(self, feasible_reward):
+        """Bracket OPT so that UB <= 8 * LB (Lorenz-Raz bound tightening).
+
+        The bracket is heuristic: test() runs the pruned DP and may miss paths.
+        Returns None without positive rewards, and (None, UB) when no path with
+        the smallest positive reward was found, so no lower bound is known.
+        """
+        rewards = sorted((r for u in self.graph for r, p in self.graph[u].values() if r > 0), reverse=True)
+        if not rewards:
+            return None
+        upper = sum(rewards[:max(self.n - 1, 1)])
+
+        lower = feasible_reward
+        if lower <= 0:
+            # No positive-reward path is known yet; the smallest reward is the next candidate
+            lower = rewards[-1]
+            if not self.test(lower):
+                return None, min(upper, 2 * lower)
+
+        while upper > 8 * lower:
+            value = math.sqrt(lower * upper)
+            if self.test(value):
+                lower = value
+            else:
+                upper = min(upper, 2 * value)
+        return lower, upper
+
+    def run(self):
+        """Return (reward, penalty, path) of an approximately best feasible path, or None."""
+        fallback = self.min_penalty_path()
+        if fallback is None or fallback.penalty > self.C:
+            return None
+
+        self.bounds = self.find_bounds(fallback.reward)
+        best_label = fallback
+        if self.bounds is not None:
+            lower, upper = self.bounds
+            if lower is None:
+                # The coarse test found no path reaching the smallest reward; scale by the bracket instead
+                lower = upper / 2
+            scale = self.epsilon * lower / max(self.n - 1, 1)
+            cap = int(upper // scale) + 1
+            for label in self.scaled_dp(scale, cap):
+                if label is None:
+                    continue
+                if (label.reward, -label.penalty) > (best_label.reward, -best_label.penalty):
+                    best_label = label
+
+        return (best_label.reward, best_label.penalty, best_label.reconstruct_path())
@@ -0,0 +1,177 @@
+"""Bulk scoring and validation of many paths with NumPy over a CSRGraph.
+
+Paths are node-id sequences (ids of CSRGraph.nodes) in one of two encodings:
+
+* padded: a 2D array with one path per row, filled up with pad (default -1)
+  after the last node;
+* ragged: a flat ids array and offsets, path i being ids[offsets[i]:offsets[i+1]].
+
+PathScorer.score() looks every consecutive pair (u, v) up as the key u * n + v in
+the sorted edge keys of the graph (numpy.searchsorted), so a batch costs a few
+array passes instead of one dictionary lookup per edge. Per-path sums use prefix
+sums over the pairs, and repeated nodes are found by sorting (path, node) keys.
+For every path it returns the total reward and penalty, whether all its edges
+exist, whether it is simple, and whether it is a valid simple path within the
+penalty budget. New weights for the same edges can be scored with
+with_weights() without rebuilding the lookup.
+"""
+from pathproblems.csr import CSRGraph
+
+def import_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("Bulk path scoring needs NumPy: pip install 'pathproblems[numpy]'") from e
+    return np
+
+def padded_to_ragged(paths, pad=-1):
+    """(ids, offsets) of a padded 2D array of node ids; each row ends at its first pad entry."""
+    np = import_numpy()
+    paths = np.asarray(paths, dtype=np.int64)
+    if paths.ndim != 2:
+        raise ValueError(f"Padded paths must be a 2D array, got {paths.ndim} dimensions")
+    present = paths != pad
+    # Everything after the first pad entry of a row counts as padding
+    present &= np.cumprod(present, axis=1, dtype=bool)
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(present.sum(axis=1), out=offsets[1:])
+    return paths[present], offsets
+
+def read_paths(filename):
+    """Lists of node names from a text file with one path per line, nodes separated by commas or '->'."""
+    paths = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                paths.append([node.strip() for node in line.replace('->', ',').split(',')])
+    return paths
+
+def encode_paths(csr, paths):
+    """(ids, offsets) of lists of node names; unknown names become -1, which score() reports as invalid."""
+    np = import_numpy()
+    index = csr.index
+    lengths = [len(path) for path in paths]
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    ids = np.fromiter((index.get(node, -1) for path in paths for node in path), dtype=np.int64,
+                      count=int(offsets[-1]))
+    return ids, offsets
+
+class PathScorer:
+    def __init__(self, csr, rewards=None, penalties=None):
+        """Edge lookup for csr; rewards and penalties, aligned with the edge ids, replace its weights."""
+        np = import_numpy()
+        if not isinstance(csr, CSRGraph):
+            csr = CSRGraph.from_dict(csr)
+        self.csr = csr
+        self.num_nodes = n = csr.num_nodes
+        offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        keys = sources * n + np.frombuffer(csr.targets, dtype=np.int64)
+        # CSRGraph keeps each node's out-edges sorted by target, so the keys are usually sorted already
+        self.order = None if np.all(keys[1:] >= keys[:-1]) else np.argsort(keys, kind='stable')
+        self.keys = keys if self.order is None else keys[self.order]
+        self.rewards = self.aligned(np.frombuffer(csr.rewards, dtype=np.int64) if rewards is None else rewards)
+        self.penalties = self.aligned(np.frombuffer(csr.penalties, dtype=np.int64) if penalties is None
+                                      else penalties)
+
+    def aligned(self, weights):
+        """Weights by edge id, reordered to match self.keys."""
+        np = import_numpy()
+        weights = np.asarray(weights)
+        if len(weights) != len(self.keys):
+            raise ValueError(f"Expected {len(self.keys)} edge weights, got {len(weights)}")
+        return weights if self.order is None else weights[self.order]
+
+    def with_weights(self, rewards=None, penalties=None):
+        """A scorer over the same edges with new weights by edge id (None keeps the current ones)."""
+        scorer = object.__new__(PathScorer)
+        scorer.__dict__.update(self.__dict__)
+        if rewards is not None:
+            scorer.rewards = self.aligned(rewards)
+        if penalties is not None:
+            scorer.penalties = self.aligned(penalties)
+        return scorer
+
+    def edge_ids(self, u, v):
+        """Positions in self.keys of the edges u -> v for arrays of node ids, and whether each exists."""
+        np = import_numpy()
+        n = self.num_nodes
+        in_range = (u >= 0) & (u < n) & (v >= 0) & (v < n)
+        keys = np.where(in_range, u * n + v, -1)
+        position = np.searchsorted(self.keys, keys)
+        np.minimum(position, max(len(self.keys) - 1, 0), out=position)
+        found = in_range & (self.keys[position] == keys) if len(self.keys) else np.zeros(len(keys), dtype=bool)
+        return position, found
+
+    def score(self, ids, offsets=None, constraint_C=None, pad=-1):
+        """Score paths given as a padded 2D array (offsets=None) or as ragged ids and offsets.
+
+        Returns a dictionary of arrays with one entry per path: reward, penalty (sums
+        over the edges that exist), edges_exist (every node id is in the graph and every
+        edge exists), simple (no node repeats), valid (both) and, with constraint_C,
+        feasible (valid and penalty <= constraint_C). Empty and one-node paths have no
+        edges and are valid.
+        """
+        np = import_numpy()
+        if offsets is None:
+            ids, offsets = padded_to_ragged(ids, pad)
+        ids = np.asarray(ids, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        count = len(offsets) - 1
+        lengths = np.diff(offsets)
+        if count < 0 or np.any(lengths < 0) or offsets[0] != 0 or offsets[-1] != len(ids):
+            raise ValueError("offsets must start at 0, never decrease and end at len(ids)")
+        path_of = np.repeat(np.arange(count, dtype=np.int64), lengths)
+
+        # Pair i is (ids[i], ids[i + 1]); pairs that straddle two paths, and the last position, are masked out
+        same_path = np.zeros(len(ids), dtype=bool)
+        same_path[:-1] = path_of[:-1] == path_of[1:]
+        position = np.zeros(len(ids), dtype=np.int64)
+        found = np.zeros(len(ids), dtype=bool)
+        position[:-1], found[:-1] = self.edge_ids(ids[:-1], ids[1:])
+        found &= same_path
+        missing = same_path & ~found
+        bad_node = (ids < 0) | (ids >= self.num_nodes)
+
+        # Pairs of path j are offsets[j] .. offsets[j+1] - 2, nodes offsets[j] .. offsets[j+1] - 1;
+        # sums are differences of prefix sums
+        first = offsets[:-1]
+        last = np.maximum(offsets[1:] - 1, first)
+
+        def per_path(values, end):
+            prefix = np.zeros(len(values) + 1, dtype=values.dtype)
+            np.cumsum(values, out=prefix[1:])
+            return prefix[end] - prefix[first]
+
+        if len(self.keys):
+            reward = per_path(np.where(found, self.rewards[position], 0), last)
+            penalty = per_path(np.where(found, self.penalties[position], 0), last)
+        else:
+            reward = penalty = np.zeros(count, dtype=np.int64)
+        edges_exist = (per_path(missing.astype(np.int64), last) == 0) & (
+            per_path(bad_node.astype(np.int64), offsets[1:]) == 0)
+
+        # A node repeats if two equal (path, node) keys end up next to each other after sorting
+        simple = np.ones(count, dtype=bool)
+        width = self.num_nodes + 2
+        keys = np.sort(path_of * width + np.clip(ids, -1, self.num_nodes) + 1)
+        repeated = keys[1:] == keys[:-1]
+        simple[keys[1:][repeated] // width] = False
+
+        result = {
+            'reward': reward,
+            'penalty': penalty,
+            'edges_exist': edges_exist,
+            'simple': simple,
+            'valid': edges_exist & simple,
+        }
+        if constraint_C is not None:
+            result['feasible'] = result['valid'] & (penalty <= constraint_C)
+        return result
+
+    def score_paths(self, paths, constraint_C=None):
+        """score() for lists of node names."""
+        ids, offsets = encode_paths(self.csr, paths)
+        return self.score(ids, offsets, constraint_C)
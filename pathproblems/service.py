@@ -0,0 +1,210 @@
+"""Asyncio JSON-lines server that answers FPTAS_RRP queries against graphs kept in memory."""
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pathproblems.cache import QueryCache, graph_fingerprint, select_best, solve_frontier
+from pathproblems.graph import load_graph
+
+# Graphs loaded inside each worker process, keyed by (path, dims, fingerprint); only the
+# newest version of each file is kept
+_worker_graphs = {}
+
+def _file_fingerprint(path, dims):
+    return graph_fingerprint(load_graph(path, dims))
+
+def _worker_solve(path, dims, fingerprint, source, target, constraint_C, epsilon):
+    """Process-pool task: load the graph once per worker, then return the target frontier."""
+    key = (path, dims, fingerprint)
+    if key not in _worker_graphs:
+        graph = load_graph(path, dims)
+        if graph_fingerprint(graph) != fingerprint:
+            raise ValueError(f"Graph file {path} changed since it was loaded, reload it")
+        # The file was reloaded, so queries for its earlier versions fail the check above anyway
+        for stale in [stale for stale in _worker_graphs if stale[:2] == key[:2]]:
+            del _worker_graphs[stale]
+        _worker_graphs[key] = graph
+    return solve_frontier(_worker_graphs[key], source, target, constraint_C, epsilon)
+
+class PathService:
+    """Keeps named graphs loaded, coalesces identical in-flight queries and
+    dispatches FPTAS solves to a process pool.
+
+    Requests and responses are single-line JSON objects:
+        {"op": "load", "name": "g"}
+        {"op": "load", "name": "g", "path": "roads/graph_data.csv", "dims": 2}
+        {"op": "solve", "graph": "g", "source": "n0", "target": "n19", "constraint": 50, "epsilon": 0.1}
+
+    A load request without a path reloads a graph that is already registered. Clients
+    may only name files inside root; without a root, they can only reload.
+    """
+    def __init__(self, workers=None, max_pending=64, cache=None, root=None):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.max_pending = max_pending
+        self.cache = cache if cache is not None else QueryCache()
+        self.root = root and os.path.realpath(root)
+        self.graphs = {}  # name -> (path, dims, fingerprint)
+        self.loading = {}  # name -> asyncio.Task of a load request in progress
+        self.inflight = {}  # query key -> asyncio.Future of the frontier
+
+    def load(self, name, path, dims=2):
+        """Register a graph file under a name, replacing any previous version."""
+        path = os.path.abspath(path)
+        return self.register(name, path, dims, _file_fingerprint(path, dims))
+
+    def register(self, name, path, dims, fingerprint):
+        self.graphs[name] = (path, dims, fingerprint)
+        return {"name": name, "fingerprint": fingerprint}
+
+    async def load_request(self, name, path=None, dims=None):
+        """load() for a client: reload a registered graph, or load a file inside self.root.
+
+        The file is read and hashed in a thread, so queries in flight keep being answered;
+        queries on the same name sent after the load wait for it.
+        """
+        if path is None:
+            if name not in self.graphs:
+                raise ValueError(f"Unknown graph {name}, give a path to load it")
+            path, registered_dims, _ = self.graphs[name]
+            dims = registered_dims if dims is None else dims
+        elif self.root is None:
+            raise ValueError("Loading files is disabled on this server (no graph root), only reloads are allowed")
+        else:
+            resolved = os.path.realpath(os.path.join(self.root, path))
+            if os.path.commonpath([self.root, resolved]) != self.root:
+                raise ValueError(f"Graph path {path} is outside the graph root")
+            path, dims = resolved, 2 if dims is None else dims
+        task = asyncio.ensure_future(self._load(name, path, dims))
+        self.loading[name] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self.loading.get(name) is task:
+                del self.loading[name]
+
+    async def _load(self, name, path, dims):
+        loop = asyncio.get_running_loop()
+        fingerprint = await loop.run_in_executor(None, _file_fingerprint, path, dims)
+        return self.register(name, path, dims, fingerprint)
+
+    async def solve(self, name, source, target, constraint_C, epsilon):
+        """Answer a query from the cache, an identical in-flight solve, or a new worker task."""
+        loading = self.loading.get(name)
+        if loading is not None:
+            await asyncio.wait([loading])
+        if name not in self.graphs:
+            raise ValueError(f"Unknown graph {name}, load it first")
+        path, dims, fingerprint = self.graphs[name]
+
+        frontier = self.cache.lookup(fingerprint, source, target, constraint_C, epsilon)
+        if frontier is None:
+            key = (fingerprint, source, target, constraint_C, epsilon)
+            future = self.inflight.get(key)
+            if future is None:
+                if len(self.inflight) >= self.max_pending:
+                    raise RuntimeError(f"Server busy: {len(self.inflight)} solves in flight")
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(
+                    self.executor, _worker_solve, path, dims, fingerprint, source, target, constraint_C, epsilon
+                )
+                self.inflight[key] = future
+                future.add_done_callback(lambda done, key=key: self._finish(key, done))
+            # Shield so a disconnecting client does not cancel a solve others wait on
+            frontier = await asyncio.shield(future)
+
+        result = select_best(frontier, constraint_C)
+        if result is None:
+            return {"found": False}
+        reward, penalty, path_nodes = result
+        return {"found": True, "reward": reward, "penalty": penalty, "path": path_nodes}
+
+    def _finish(self, key, future):
+        self.inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.store(*key, future.result())
+
+    async def handle_request(self, request):
+        op = request.get("op")
+        if op == "load":
+            dims = request.get("dims")
+            return await self.load_request(request["name"], request.get("path"), dims and int(dims))
+        if op == "solve":
+            return await self.solve(
+                request["graph"], request["source"], request["target"],
+                float(request.get("constraint", 50)), float(request.get("epsilon", 0.1)),
+            )
+        if op == "stats":
+            return {"graphs": sorted(self.graphs), "inflight": len(self.inflight),
+                    "cache_hits": self.cache.hits, "cache_misses": self.cache.misses}
+        raise ValueError(f"Unknown op {op!r}")
+
+    async def handle_connection(self, reader, writer):
+        """Serve JSON-lines requests on one connection; each request runs concurrently."""
+        write_lock = asyncio.Lock()
+
+        async def respond(line):
+            request = None
+            try:
+                request = json.loads(line)
+                response = {"ok": True, "result": await self.handle_request(request)}
+            except Exception as e:
+                request = request if isinstance(request, dict) else {}
+                response = {"ok": False, "error": str(e)}
+            if "id" in request:
+                response["id"] = request["id"]
+            async with write_lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.cache.close()
+
+async def query(host, port, requests):
+    """Send a list of request dictionaries over one connection and return the responses in order."""
+    reader, writer = await asyncio.open_connection(host, port)
+    for request_id, request in enumerate(requests):
+        writer.write((json.dumps(dict(request, id=request_id)) + "\n").encode())
+    await writer.drain()
+
+    responses = {}
+    while len(responses) < len(requests):
+        response = json.loads(await reader.readline())
+        responses[response["id"]] = response
+    writer.close()
+    await writer.wait_closed()
+    return [responses[request_id] for request_id in range(len(requests))]
+
+def run_server(host, port, graphs=(), workers=None, max_pending=64, cache_db=None, dims=2, root=None):
+    """Start a PathService with the given {name: path} graphs preloaded and serve until interrupted.
+
+    Clients can load further graphs from files inside root (see PathService).
+    """
+    service = PathService(workers, max_pending, QueryCache(db_path=cache_db), root)
+    for name, path in dict(graphs).items():
+        print(f"Loaded {name}: {service.load(name, path, dims)['fingerprint'][:12]}")
+
+    print(f"Serving on {host}:{port}")
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,237 @@
+"""Memory-budgeted label storage for FPTAS_RRP with spill to a scratch file.
+
+FPTAS_RRP(..., max_memory=bytes).run() uses this engine instead of the in-memory
+pareto_sets. Labels are split in two parts:
+
+* a label pool with the node id and predecessor label id of every label (two
+  64-bit integers), used for cycle checks and path reconstruction. It lives in
+  a second memory-mapped scratch file, and only the pages of the newest
+  POOL_BLOCK labels count against max_memory; older pages are released as the
+  pool grows and read back from the file on demand;
+* per-node frontiers {bucket: (reward, penalty, label id)}, kept in an LRU of
+  resident dictionaries. When the estimated resident size goes over max_memory,
+  the least recently used frontiers are written to the memory-mapped scratch file
+  as packed (bucket, reward, penalty, label id) records and read back on demand.
+
+max_memory must be at least MIN_MEMORY bytes, to leave room for the newest pool block.
+
+The queue order and the frontier order are the same as in FPTAS_RRP.run, so both
+engines return the same path. Weights must be integers, as read from the CSV files.
+"""
+import mmap
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict, deque
+
+RECORD = struct.Struct('<qqqq')  # bucket, reward, penalty, label id
+
+# Estimated resident bytes of a frontier entry (dict slot, tuple and its integers)
+# and of an empty frontier dictionary
+ENTRY_BYTES = 200
+FRONTIER_BYTES = 240
+
+# Labels written to the pool between two releases of its pages (512 KiB); max_memory
+# must hold that block twice over
+POOL_BLOCK = 1 << 15
+MIN_MEMORY = 2 * POOL_BLOCK * 16
+
+class FrontierStore:
+    """Per-node frontiers under a memory budget, spilling cold ones to a scratch file."""
+    def __init__(self, max_memory, scratch_dir=None):
+        self.max_memory = max_memory
+        self.resident = OrderedDict()  # node -> frontier, least recently used first
+        self.resident_entries = 0
+        self.spilled = {}  # node -> (offset, count, capacity) in records
+        self.file = tempfile.TemporaryFile(dir=scratch_dir)
+        self.map = None
+        self.used = 0  # Bytes of the scratch file handed out
+        self.num_spills = 0
+        self.num_loads = 0
+
+    def get(self, node):
+        """Return the frontier of node, paging it back from the scratch file if needed."""
+        frontier = self.resident.get(node)
+        if frontier is not None:
+            self.resident.move_to_end(node)
+            return frontier
+
+        frontier = {}
+        slot = self.spilled.get(node)
+        if slot is not None:
+            offset, count, _ = slot
+            for bucket, reward, penalty, label_id in RECORD.iter_unpack(
+                    self.map[offset:offset + count * RECORD.size]):
+                frontier[bucket] = (reward, penalty, label_id)
+            self.num_loads += 1
+        self.resident[node] = frontier
+        self.resident_entries += len(frontier)
+        return frontier
+
+    def added(self, count=1):
+        """Record that count new buckets were added to resident frontiers."""
+        self.resident_entries += count
+
+    def resident_bytes(self):
+        return self.resident_entries * ENTRY_BYTES + len(self.resident) * FRONTIER_BYTES
+
+    def trim(self, extra_bytes=0):
+        """Spill least recently used frontiers until resident storage plus extra_bytes fits the budget."""
+        while self.resident and self.resident_bytes() + extra_bytes > self.max_memory:
+            node, frontier = self.resident.popitem(last=False)
+            self.resident_entries -= len(frontier)
+            if frontier:
+                self.spill(node, frontier)
+
+    def spill(self, node, frontier):
+        data = b''.join(RECORD.pack(bucket, reward, penalty, label_id)
+                        for bucket, (reward, penalty, label_id) in frontier.items())
+        count = len(frontier)
+        slot = self.spilled.get(node)
+        if slot is not None and slot[2] >= count:
+            offset, capacity = slot[0], slot[2]
+        else:
+            # Frontiers only grow, so leave room for twice the current size
+            capacity = 2 * count
+            offset = self.reserve(capacity * RECORD.size)
+        self.map[offset:offset + len(data)] = data
+        self.spilled[node] = (offset, count, capacity)
+        self.num_spills += 1
+
+    def reserve(self, size):
+        """Hand out size bytes at the end of the scratch file, growing the mapping if needed."""
+        offset = self.used
+        self.used += size
+        if self.map is None or self.used > len(self.map):
+            new_size = max(self.used, 2 * len(self.map) if self.map is not None else 1 << 20)
+            if self.map is not None:
+                self.map.close()
+            self.file.truncate(new_size)
+            self.map = mmap.mmap(self.file.fileno(), new_size)
+        return offset
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+class LabelPool:
+    """Node and predecessor id of every label, as int64 pairs in a memory-mapped scratch file.
+
+    Every POOL_BLOCK labels, the pages written so far are dropped from the process
+    with madvise(MADV_DONTNEED); they stay in the file and fault back in when a
+    cycle check or a path reaches them.
+    """
+    def __init__(self, scratch_dir=None):
+        self.file = tempfile.TemporaryFile(dir=scratch_dir)
+        self.file.truncate(POOL_BLOCK * 16)
+        self.map = mmap.mmap(self.file.fileno(), POOL_BLOCK * 16)
+        self.ids = memoryview(self.map).cast('q')  # ids[2 * label] = node id, ids[2 * label + 1] = predecessor
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, node_id, pred_id):
+        if 2 * self.size == len(self.ids):
+            # Doubling the mapping needs the view released first
+            self.ids.release()
+            self.map.resize(2 * len(self.map))
+            self.ids = memoryview(self.map).cast('q')
+        self.ids[2 * self.size] = node_id
+        self.ids[2 * self.size + 1] = pred_id
+        self.size += 1
+        if self.size % POOL_BLOCK == 0 and hasattr(self.map, 'madvise'):
+            self.map.madvise(mmap.MADV_DONTNEED, 0, self.size * 16)
+
+    def get(self, label_id):
+        """(node id, predecessor id) of a label."""
+        return self.ids[2 * label_id], self.ids[2 * label_id + 1]
+
+    def close(self):
+        self.ids.release()
+        self.map.close()
+        self.file.close()
+
+def run_with_spill(fptas, max_memory, scratch_dir=None):
+    """Run FPTAS_RRP keeping resident label storage near max_memory bytes; same result as fptas.run()."""
+    if max_memory < MIN_MEMORY:
+        raise ValueError(f"max_memory must be at least {MIN_MEMORY} bytes, got {max_memory}")
+    nodes = list(fptas.nodes)
+    node_ids = {node: i for i, node in enumerate(nodes)}
+    store = FrontierStore(max_memory, scratch_dir)
+    pool = LabelPool(scratch_dir)
+    pool.append(node_ids[fptas.source], -1)
+
+    def on_path(label_id, node_id):
+        ids = pool.ids
+        while label_id >= 0:
+            if ids[2 * label_id] == node_id:
+                return True
+            label_id = ids[2 * label_id + 1]
+        return False
+
+    to_target = fptas.penalty_to_target
+    try:
+        store.get(fptas.source)[0] = (0, 0, 0)
+        store.added()
+        queue = deque([fptas.source])
+        in_queue = {fptas.source}
+
+        while queue:
+            node = queue.popleft()
+            in_queue.remove(node)
+
+            for bucket, (reward, penalty, label_id) in list(store.get(node).items()):
+                for neighbor, (edge_reward, edge_penalty) in fptas.graph.get(node, {}).items():
+                    new_reward = reward + edge_reward
+                    new_penalty = penalty + edge_penalty
+                    if new_penalty > fptas.C:
+                        continue
+                    # The same pruning as FPTAS_RRP.propagate() during solve()
+                    if to_target is not None and (new_penalty + to_target[neighbor] > fptas.C or
+                                                  new_reward > fptas.reward_cap):
+                        continue
+                    if fptas.label_bound is not None and fptas.label_bound.prunes(neighbor, new_reward, new_penalty):
+                        continue
+                    neighbor_id = node_ids[neighbor]
+                    if on_path(label_id, neighbor_id):
+                        continue
+
+                    new_bucket = fptas.get_bucket(new_reward)
+                    frontier = store.get(neighbor)
+                    existing = frontier.get(new_bucket)
+                    if existing is not None and existing[1] <= new_penalty:
+                        continue
+
+                    if existing is None:
+                        store.added()
+                    frontier[new_bucket] = (new_reward, new_penalty, len(pool))
+                    pool.append(neighbor_id, label_id)
+                    if neighbor not in in_queue:
+                        queue.append(neighbor)
+                        in_queue.add(neighbor)
+
+                # The pool pages written since the last release count against the budget
+                store.trim(POOL_BLOCK * 16)
+
+        # Highest reward at the target, ties broken in favor of lower penalty, as in best_result
+        best = None
+        for reward, penalty, label_id in store.get(fptas.target).values():
+            if penalty <= fptas.C and reward >= 0 and (best is None or (reward, -penalty) > (best[0], -best[1])):
+                best = (reward, penalty, label_id)
+        fptas.spill_stats = {'labels': len(pool), 'spills': store.num_spills, 'loads': store.num_loads,
+                             'scratch_bytes': store.used}
+        if best is None:
+            return None
+        path = []
+        label_id = best[2]
+        while label_id >= 0:
+            node_id, label_id = pool.get(label_id)
+            path.append(nodes[node_id])
+        path.reverse()
+        return (best[0], best[1], path)
+    finally:
+        store.close()
+        pool.close()
@@ -0,0 +1,72 @@
+"""Small random graphs and an exhaustive reference solver for the tests."""
+import os
+import random
+import subprocess
+import sys
+
+def random_graph(seed, n=8, p=0.35, dag=False, weight_range=10):
+    """graph[u][v] = (reward, penalty) on nodes n0..n{n-1}; with dag, edges only go to higher numbers."""
+    rng = random.Random(seed)
+    graph = {f'n{i}': {} for i in range(n)}
+    for i in range(n):
+        for j in range(n):
+            if i != j and (not dag or i < j) and rng.random() < p:
+                graph[f'n{i}'][f'n{j}'] = (rng.randint(0, weight_range), rng.randint(0, weight_range))
+    return graph
+
+def simple_paths(graph, source, target, constraint_C=float('inf'), max_edges=None):
+    """Yield (reward, penalty, path) of every simple source-target path within the budget."""
+    def extend(path, reward, penalty):
+        node = path[-1]
+        if node == target:
+            yield reward, penalty, list(path)
+            return
+        if max_edges is not None and len(path) > max_edges:
+            return
+        for neighbor, (edge_reward, edge_penalty) in graph.get(node, {}).items():
+            if neighbor not in path and penalty + edge_penalty <= constraint_C:
+                path.append(neighbor)
+                yield from extend(path, reward + edge_reward, penalty + edge_penalty)
+                path.pop()
+
+    yield from extend([source], 0, 0)
+
+def brute_force(graph, source, target, constraint_C, max_edges=None):
+    """Best (reward, penalty, path) by exhaustive search (highest reward, then lowest penalty), or None."""
+    best = None
+    for candidate in simple_paths(graph, source, target, constraint_C, max_edges):
+        if best is None or (candidate[0], -candidate[1]) > (best[0], -best[1]):
+            best = candidate
+    return best
+
+def path_weights(graph, path):
+    """(reward, penalty) summed over the edges of path; raises KeyError on a missing edge."""
+    steps = list(zip(path, path[1:]))
+    return sum(graph[u][v][0] for u, v in steps), sum(graph[u][v][1] for u, v in steps)
+
+def check_path(graph, result, source, target, constraint_C):
+    """Assert that result = (reward, penalty, path) is a feasible simple path with the stated weights."""
+    reward, penalty, path = result
+    assert path[0] == source and path[-1] == target
+    assert len(set(path)) == len(path)
+    assert path_weights(graph, path) == (reward, penalty)
+    assert penalty <= constraint_C
+
+def write_csv(graph, filename):
+    """Write graph as a source,target,reward,penalty CSV file."""
+    with open(filename, 'w') as f:
+        f.write('source,target,reward,penalty\n')
+        for u in graph:
+            for v, (reward, penalty) in graph[u].items():
+                f.write(f'{u},{v},{reward},{penalty}\n')
+    return filename
+
+HEAVY = ('networkx', 'matplotlib', 'gurobipy', 'numpy', 'numba', 'pyarrow')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def imported_backends(code):
+    """Heavy modules in sys.modules after running code in a fresh interpreter."""
+    check = f"import sys\n{code}\nprint('Backends:', ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, check=True,
+                            cwd=ROOT).stdout
+    return output.rstrip('\n').splitlines()[-1][len('Backends: '):]
@@ -0,0 +1,42 @@
+"""AdditiveFPTAS (shortest simple path, Problem 1) against exhaustive search."""
+import pytest
+from helpers import path_weights, random_graph, simple_paths
+
+from pathproblems.additive import AdditiveFPTAS
+
+def shortest(graph, source, target):
+    """Lowest reward - penalty over every simple source-target path, or inf."""
+    return min((reward - penalty for reward, penalty, _ in simple_paths(graph, source, target)), default=float('inf'))
+
+def check_result(graph, path, value):
+    assert path[0] == 'n0' and path[-1] == 'n7'
+    assert len(set(path)) == len(path)
+    reward, penalty = path_weights(graph, path)
+    assert reward - penalty == value
+
+@pytest.mark.parametrize('epsilon', [0.5, 5, 20])
+@pytest.mark.parametrize('seed', range(30))
+def test_additive_error_on_dags(seed, epsilon):
+    graph = random_graph(seed, dag=True)
+    optimum = shortest(graph, 'n0', 'n7')
+    path, value = AdditiveFPTAS(graph, 'n0', 'n7', epsilon).run()
+    if optimum == float('inf'):
+        assert path is None and value == float('inf')
+        return
+    check_result(graph, path, value)
+    assert optimum <= value <= optimum + epsilon
+
+@pytest.mark.parametrize('seed', range(30))
+def test_feasible_on_general_graphs(seed):
+    # The visited-set check can drop labels the optimum needs, so only feasibility is checked
+    graph = random_graph(seed)
+    optimum = shortest(graph, 'n0', 'n7')
+    path, value = AdditiveFPTAS(graph, 'n0', 'n7', 0.5).run()
+    assert (path is None) == (optimum == float('inf'))
+    if path is not None:
+        check_result(graph, path, value)
+        assert value >= optimum
+
+def test_unreachable_target():
+    graph = {'n0': {'n1': (3, 1)}, 'n1': {}, 'n7': {}}
+    assert AdditiveFPTAS(graph, 'n0', 'n7', 0.5).run() == (None, float('inf'))
@@ -0,0 +1,102 @@
+"""Work queue: sharding, retries of expired and failed shards, and coordinator restarts."""
+import os
+import signal
+
+import pytest
+from helpers import random_graph, write_csv
+
+from pathproblems.batch import ShardQueue, run_coordinator, run_worker, solve_query
+from pathproblems.graph import load_graph
+
+EPSILON = 0.2
+
+@pytest.fixture
+def graph_file(tmp_path):
+    return write_csv(random_graph(5, n=14, p=0.3), str(tmp_path / 'graph.csv'))
+
+def make_queries(count):
+    return [(f'n{i % 7}', f'n{7 + i % 7}', 10 + i % 20) for i in range(count)]
+
+def expected_results(graph_file, queries):
+    graph = load_graph(graph_file)
+    return [solve_query(graph, EPSILON, number, *query) for number, query in enumerate(queries)]
+
+def test_worker_solves_every_shard(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queries = make_queries(25)
+    job = queue.submit(graph_file, queries, EPSILON, shard_size=10)
+    assert job['shards'] == 3 and queue.status()['pending'] == 3
+
+    assert run_worker(queue.root, wait=False) == 3
+    assert queue.status() == {'pending': 0, 'running': 0, 'results': 3, 'failed': 0}
+    assert list(queue.results()) == expected_results(graph_file, queries)
+
+def test_submit_refuses_a_used_queue(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queue.submit(graph_file, make_queries(5), EPSILON)
+    with pytest.raises(ValueError):
+        queue.submit(graph_file, make_queries(5), EPSILON)
+
+def test_expired_claim_is_retried(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queries = make_queries(20)
+    queue.submit(graph_file, queries, EPSILON, shard_size=10, lease=0.2)
+    # A worker that claims a shard and dies without a trace
+    abandoned = queue.claim()
+
+    assert run_worker(queue.root, poll=0.05) == 2
+    assert queue.status() == {'pending': 0, 'running': 0, 'results': 2, 'failed': 0}
+    assert list(queue.results()) == expected_results(graph_file, queries)
+    assert not any(name.endswith('.part') for name in os.listdir(os.path.join(queue.root, 'results')))
+    assert abandoned['attempt'] == 0
+
+def test_failing_shard_ends_in_failed(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    # A constraint that is not a number makes the solver raise
+    queue.submit(graph_file, make_queries(3) + [('n0', 'n7', 'many')], EPSILON, shard_size=3, max_attempts=1)
+    with pytest.raises(TypeError):
+        run_worker(queue.root, wait=False)
+    assert queue.status() == {'pending': 0, 'running': 0, 'results': 1, 'failed': 1}
+    assert not any(name.endswith('.part') for name in os.listdir(os.path.join(queue.root, 'results')))
+
+def test_coordinator_stops_when_the_graph_changed(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queue.submit(graph_file, make_queries(5), EPSILON)
+    write_csv(random_graph(6, n=14, p=0.3), graph_file)
+    with pytest.raises(RuntimeError, match='changed'):
+        run_coordinator(queue.root, workers=1, poll=0.05)
+
+def kill_worker_once(killed):
+    """on_progress callback that kills the local workers once a shard is finished and work remains."""
+    import multiprocessing
+
+    def on_progress(status, expired):
+        if not killed and status['results'] >= 1 and status['pending'] >= 1:
+            for process in multiprocessing.active_children():
+                os.kill(process.pid, signal.SIGKILL)
+                killed.append(process.pid)
+    return on_progress
+
+def test_coordinator_restarts_dead_workers(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queries = make_queries(400)
+    queue.submit(graph_file, queries, EPSILON, shard_size=10, lease=0.5)
+    killed = []
+    status = run_coordinator(queue.root, workers=1, poll=0.05, on_progress=kill_worker_once(killed))
+    assert killed
+    assert status == {'pending': 0, 'running': 0, 'results': 40, 'failed': 0}
+    assert list(queue.results()) == expected_results(graph_file, queries)
+
+def test_coordinator_gives_up_after_max_restarts(graph_file, tmp_path):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queue.submit(graph_file, make_queries(400), EPSILON, shard_size=10, lease=0.5)
+    killed = []
+    with pytest.raises(RuntimeError, match='giving up'):
+        run_coordinator(queue.root, workers=1, poll=0.05, on_progress=kill_worker_once(killed),
+                        max_restarts=0)
+
+def test_unknown_nodes_are_reported(graph_file):
+    graph = load_graph(graph_file)
+    for number, (source, target) in enumerate([('missing', 'n7'), ('n0', 'missing')]):
+        result = solve_query(graph, EPSILON, number, source, target, 10)
+        assert result['error'] == "Node missing not found in graph" and 'path' not in result
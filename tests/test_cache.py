@@ -0,0 +1,87 @@
+"""Query cache: answers, reuse across budgets and epsilons, eviction and the SQLite tier."""
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.cache import QueryCache, graph_fingerprint
+from pathproblems.fptas import FPTAS_RRP
+
+def test_fingerprint_ignores_insertion_order():
+    graph = random_graph(1)
+    reordered = {u: dict(reversed(list(graph[u].items()))) for u in reversed(list(graph))}
+    assert graph_fingerprint(reordered) == graph_fingerprint(graph)
+    u = next(u for u in graph if graph[u])
+    v, (reward, penalty) = next(iter(graph[u].items()))
+    reordered[u][v] = (reward + 1, penalty)
+    assert graph_fingerprint(reordered) != graph_fingerprint(graph)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_miss_matches_fptas(seed):
+    graph = random_graph(seed)
+    result = QueryCache().solve(graph, 'n0', 'n7', 20, 0.2)
+    expected = FPTAS_RRP(graph, 'n0', 'n7', 20, 0.2).run()
+    assert (result and result[:2]) == (expected and expected[:2])
+    if result is not None:
+        check_path(graph, result, 'n0', 'n7', 20)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_smaller_budget_and_coarser_epsilon_reuse_the_frontier(seed):
+    graph = random_graph(seed, dag=True)
+    cache = QueryCache()
+    cache.solve(graph, 'n0', 'n7', 30, 0.1)
+    for constraint_C, epsilon in ((30, 0.1), (20, 0.1), (10, 0.5), (5, 0.2)):
+        result = cache.solve(graph, 'n0', 'n7', constraint_C, epsilon)
+        best = brute_force(graph, 'n0', 'n7', constraint_C)
+        if best is None:
+            assert result is None
+            continue
+        check_path(graph, result, 'n0', 'n7', constraint_C)
+        assert result[0] >= best[0] / (1 + epsilon)
+    assert (cache.hits, cache.misses) == (4, 1)
+
+def test_larger_budget_or_finer_epsilon_miss():
+    graph = random_graph(2)
+    fingerprint = graph_fingerprint(graph)
+    cache = QueryCache()
+    cache.solve(graph, 'n0', 'n7', 20, 0.2, fingerprint)
+    assert cache.lookup(fingerprint, 'n0', 'n7', 25, 0.2) is None
+    assert cache.lookup(fingerprint, 'n0', 'n7', 20, 0.1) is None
+    assert cache.lookup(fingerprint, 'n0', 'n6', 20, 0.2) is None
+    assert cache.lookup('other graph', 'n0', 'n7', 20, 0.2) is None
+    assert cache.lookup(fingerprint, 'n0', 'n7', 20, 0.2) is not None
+
+def test_least_recently_used_entry_is_evicted():
+    graph = random_graph(3)
+    fingerprint = graph_fingerprint(graph)
+    cache = QueryCache(max_entries=2)
+    cache.solve(graph, 'n0', 'n7', 20, 0.2, fingerprint)
+    cache.solve(graph, 'n1', 'n7', 20, 0.2, fingerprint)
+    cache.lookup(fingerprint, 'n0', 'n7', 20, 0.2)
+    cache.solve(graph, 'n2', 'n7', 20, 0.2, fingerprint)
+    assert len(cache.entries) == 2
+    assert cache.lookup(fingerprint, 'n1', 'n7', 20, 0.2) is None
+    assert cache.lookup(fingerprint, 'n0', 'n7', 20, 0.2) is not None
+    assert (fingerprint, 'n1', 'n7') not in cache.by_endpoints
+
+def test_byte_budget_keeps_the_newest_entry():
+    graph = random_graph(3)
+    cache = QueryCache(max_bytes=1)
+    for source in ('n0', 'n1', 'n2'):
+        cache.solve(graph, source, 'n7', 20, 0.2)
+    assert [key[1] for key in cache.entries] == ['n2']
+    assert cache.total_bytes == cache.entries[next(iter(cache.entries))][1]
+
+def test_sqlite_tier_survives_a_restart(tmp_path):
+    graph = random_graph(5)
+    db_path = str(tmp_path / 'cache.db')
+    cache = QueryCache(db_path=db_path)
+    expected = cache.solve(graph, 'n0', 'n7', 20, 0.2)
+    cache.close()
+
+    cache = QueryCache(db_path=db_path)
+    result = cache.solve(graph, 'n0', 'n7', 15, 0.3)
+    assert (cache.hits, cache.misses) == (1, 0)
+    if result is not None:
+        check_path(graph, result, 'n0', 'n7', 15)
+    assert cache.solve(graph, 'n0', 'n7', 20, 0.2) == expected
+    assert (cache.hits, cache.misses) == (2, 0)
+    cache.close()
@@ -0,0 +1,64 @@
+"""ParetoShortcutIndex queries against FPTAS_RRP and exhaustive search."""
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.ch import ParetoShortcutIndex
+from pathproblems.fptas import FPTAS_RRP
+
+EPSILON = 0.1
+
+@pytest.mark.parametrize('max_shortcuts', [4, 64])
+@pytest.mark.parametrize('seed', range(25))
+def test_guarantee_on_dags(seed, max_shortcuts):
+    graph = random_graph(seed, n=9, p=0.3, dag=True)
+    index = ParetoShortcutIndex.build(graph, EPSILON, max_shortcuts)
+    for target in ('n5', 'n8'):
+        best = brute_force(graph, 'n0', target, 20)
+        result = index.query('n0', target, 20)
+        if best is None:
+            assert result is None
+            continue
+        check_path(graph, result, 'n0', target, 20)
+        assert result[0] >= best[0] / (1 + EPSILON)
+        assert result[0] >= FPTAS_RRP(graph, 'n0', target, 20, EPSILON).run()[0] / (1 + EPSILON)
+
+@pytest.mark.parametrize('seed', range(40))
+def test_feasible_on_general_graphs(seed):
+    graph = random_graph(seed, n=9, p=0.3)
+    index = ParetoShortcutIndex.build(graph, EPSILON)
+    for target in ('n5', 'n8'):
+        best = brute_force(graph, 'n0', target, 20)
+        result = index.query('n0', target, 20)
+        assert (result is None) == (best is None)
+        if result is not None:
+            check_path(graph, result, 'n0', target, 20)
+            assert result[0] <= best[0]
+
+def test_labels_through_the_target_do_not_block_the_join():
+    # Labels that passed through n8 used to take the buckets of labels that can end there
+    graph = random_graph(108, n=9, p=0.3)
+    assert ParetoShortcutIndex.build(graph, EPSILON).query('n0', 'n8', 20)[0] == 30
+
+def test_source_equals_target():
+    index = ParetoShortcutIndex.build(random_graph(1, n=9, p=0.3), EPSILON)
+    assert index.query('n3', 'n3', 20) == (0, 0, ['n3'])
+
+def test_save_and_load(tmp_path):
+    graph = random_graph(3, n=9, p=0.3)
+    index = ParetoShortcutIndex.build(graph, EPSILON)
+    path = str(tmp_path / 'graph.csv.ch')
+    index.save(path)
+    loaded = ParetoShortcutIndex.load(path, graph)
+    assert loaded.epsilon == EPSILON
+    for target in ('n5', 'n8'):
+        assert loaded.query('n0', target, 20) == index.query('n0', target, 20)
+
+    changed = {u: dict(edges) for u, edges in graph.items()}
+    changed['n0']['n8'] = (1, 1)
+    with pytest.raises(ValueError):
+        ParetoShortcutIndex.load(path, changed)
+
+def test_unknown_node_is_rejected():
+    index = ParetoShortcutIndex.build(random_graph(0, n=9, p=0.3), EPSILON)
+    with pytest.raises(ValueError):
+        index.query('n0', 'missing', 20)
@@ -0,0 +1,54 @@
+"""Interrupted and resumed runs return the same answer as uninterrupted ones."""
+import pytest
+from helpers import random_graph
+
+from pathproblems.checkpoint import Checkpoint
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.layered import FPTAS_BiObjectiveSP
+
+def larger_graph(seed):
+    return random_graph(seed, n=14, p=0.3)
+
+class Interrupted(Exception):
+    pass
+
+class InterruptingCheckpoint(Checkpoint):
+    """Checkpoint that saves at every opportunity and stops the run after a few saves."""
+    def __init__(self, path, saves):
+        super().__init__(path, interval=0.0)
+        self.saves_left = saves
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.saves_left -= 1
+        if self.saves_left == 0:
+            raise Interrupted
+
+@pytest.mark.parametrize('saves', [1, 3, 10])
+def test_fptas_resume_matches_run(saves, tmp_path):
+    graph = larger_graph(1)
+    expected = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run()
+    path = str(tmp_path / 'rrp')
+    try:
+        result = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run(InterruptingCheckpoint(path, saves))
+    except Interrupted:
+        result = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run(Checkpoint(path, resume=True))
+    assert result == expected
+
+@pytest.mark.parametrize('saves', [1, 3, 10])
+def test_layered_resume_matches_solve(saves, tmp_path):
+    graph = larger_graph(2)
+    expected = FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0).solve()
+    path = str(tmp_path / 'layered')
+    try:
+        result = FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0).solve(InterruptingCheckpoint(path, saves))
+    except Interrupted:
+        result = FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0).solve(Checkpoint(path, resume=True))
+    assert result == expected
+
+def test_checkpoint_of_another_query_is_refused(tmp_path):
+    graph = larger_graph(1)
+    path = str(tmp_path / 'rrp')
+    FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run(Checkpoint(path))
+    with pytest.raises(ValueError):
+        FPTAS_RRP(graph, 'n0', 'n13', 20, 0.2).run(Checkpoint(path, resume=True))
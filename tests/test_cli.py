@@ -0,0 +1,34 @@
+"""The command line entry point with both CSV layouts."""
+import pytest
+from helpers import brute_force, random_graph, write_csv
+
+from pathproblems.cli import main
+
+def test_generate_and_solve(tmp_path, capsys):
+    filename = str(tmp_path / 'graph.csv')
+    main(['generate', '--nodes', '12', '--edges', '40', '--seed', '3', '--output', filename])
+    main(['solve', '--algo', 'fptas', '--input', filename, '--constraint', '20', '--epsilon', '0.2'])
+    assert 'Constraint satisfied: True' in capsys.readouterr().out
+
+def test_fptas_reports_a_feasible_path(tmp_path, capsys):
+    graph = random_graph(2, dag=True)
+    filename = write_csv(graph, str(tmp_path / 'graph.csv'))
+    main(['solve', '--algo', 'fptas', '--input', filename, '--source', 'n0', '--target', 'n7', '--constraint', '20'])
+    best = brute_force(graph, 'n0', 'n7', 20)
+    reward = int(capsys.readouterr().out.split('Total reward: ')[1].split()[0])
+    assert best[0] / 1.1 <= reward <= best[0]
+
+def test_one_dimensional_layout(tmp_path, capsys):
+    filename = str(tmp_path / 'signed.csv')
+    with open(filename, 'w') as f:
+        f.write('source,target,weight\nn0,n1,-4\nn1,n2,3\nn0,n2,-2\n')
+    main(['solve', '--algo', 'dp', '--dims', '1', '--input', filename, '--source', 'n0', '--target', 'n2',
+          '--epsilon', '0.5'])
+    # reward - penalty is -1 over n1 and -2 on the direct edge
+    out = capsys.readouterr().out
+    assert 'Best path: n0 -> n2' in out and 'Path value: -2.00' in out
+
+def test_unknown_algorithm_is_rejected(tmp_path):
+    filename = write_csv(random_graph(0), str(tmp_path / 'graph.csv'))
+    with pytest.raises(SystemExit):
+        main(['solve', '--algo', 'simplex', '--input', filename])
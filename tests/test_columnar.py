@@ -0,0 +1,66 @@
+"""Arrow edge tables and the graph catalog."""
+import pytest
+from helpers import random_graph, write_csv
+
+pa = pytest.importorskip('pyarrow')
+
+from pathproblems.columnar import GraphCatalog, csr_from_table  # noqa: E402
+from pathproblems.csr import CSRGraph  # noqa: E402
+
+def stored(graph):
+    """graph without isolated nodes, which an edge file cannot list."""
+    return {u: edges for u, edges in graph.items() if edges or any(u in other for other in graph.values())}
+
+def test_csv_round_trip(tmp_path):
+    graph = random_graph(2)
+    catalog = GraphCatalog(str(tmp_path / 'catalog'))
+    entry = catalog.add('roads', write_csv(graph, str(tmp_path / 'graph.csv')))
+    assert entry['version'] == 1
+    assert catalog.open('roads').to_dict() == stored(graph)
+    # Unchanged edges do not add a version
+    assert catalog.add('roads', str(tmp_path / 'graph.csv')) == entry
+
+def test_integer_node_columns_are_read_as_names():
+    table = pa.table({'source': [1, 2, 1], 'target': [2, 3, 3], 'reward': [4, 5, 6], 'penalty': [1, 1, 1]})
+    csr = csr_from_table(table)
+    assert csr.to_dict() == CSRGraph.from_dict({'1': {'2': (4, 1), '3': (6, 1)}, '2': {'3': (5, 1)}}).to_dict()
+
+@pytest.mark.parametrize('name', ['../escape', '/abs', '.hidden', '-flag', 'a/b', 'catalog.json', ''])
+def test_unsafe_catalog_names_are_rejected(tmp_path, name):
+    catalog = GraphCatalog(str(tmp_path / 'catalog'))
+    with pytest.raises(ValueError):
+        catalog.add(name, write_csv(random_graph(0), str(tmp_path / 'graph.csv')))
+
+def test_versions_and_remove(tmp_path):
+    catalog = GraphCatalog(str(tmp_path / 'catalog'))
+    first, second = random_graph(1), random_graph(2)
+    catalog.add('roads', write_csv(first, str(tmp_path / 'first.csv')))
+    catalog.add('roads', write_csv(second, str(tmp_path / 'second.csv')))
+    assert catalog.resolve('roads')['version'] == 2
+    assert catalog.open('roads@1').to_dict() == stored(first)
+    assert catalog.open('roads').to_dict() == stored(second)
+    with pytest.raises(ValueError):
+        catalog.open('roads@3')
+
+    assert [entry['version'] for entry in catalog.remove('roads@1')] == [1]
+    assert [entry['version'] for entry in catalog.entries()['roads']] == [2]
+    catalog.remove('roads')
+    assert catalog.entries() == {}
+    with pytest.raises(ValueError):
+        catalog.open('roads')
+
+def test_parquet_matches_csv(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from pathproblems.columnar import load_csr, read_csr
+
+    graph = random_graph(4)
+    csr = load_csr(write_csv(graph, str(tmp_path / 'graph.csv')))
+    rows = [(u, v, r, p) for u in graph for v, (r, p) in graph[u].items()]
+    table = pa.table({name: [row[i] for row in rows] for i, name in enumerate(('source', 'target', 'reward',
+                                                                               'penalty'))})
+    pq.write_table(table, str(tmp_path / 'graph.parquet'))
+    assert read_csr(str(tmp_path / 'graph.parquet')).to_dict() == csr.to_dict()
+
+def test_signed_weight_column():
+    table = pa.table({'source': ['a', 'b'], 'target': ['b', 'c'], 'weight': [3, -2]})
+    assert csr_from_table(table).to_dict() == {'a': {'b': (3, 0)}, 'b': {'c': (0, 2)}, 'c': {}}
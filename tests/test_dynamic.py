@@ -0,0 +1,69 @@
+"""Incremental re-solves after edge changes against fresh solves and exhaustive search."""
+import random
+
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.dynamic import DynamicGraph, IncrementalFPTAS_RRP
+from pathproblems.fptas import FPTAS_RRP
+
+EPSILON = 0.3
+
+def copy(graph):
+    return {u: dict(edges) for u, edges in graph.items()}
+
+def change_edges(dynamic, rng, count):
+    """Random updates, removals and insertions that keep edges pointing to higher-numbered nodes."""
+    nodes = sorted(dynamic.graph, key=lambda node: int(node[1:]))
+    for _ in range(count):
+        i, j = sorted(rng.sample(range(len(nodes)), 2))
+        u, v = nodes[i], nodes[j]
+        weights = (rng.randint(0, 10), rng.randint(0, 10))
+        if not dynamic.has_edge(u, v):
+            dynamic.add_edge(u, v, *weights)
+        elif rng.random() < 0.3:
+            dynamic.remove_edge(u, v)
+        else:
+            dynamic.update_edge(u, v, *weights)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_repair_keeps_the_guarantee(seed):
+    rng = random.Random(seed)
+    dynamic = DynamicGraph(random_graph(seed, dag=True))
+    fptas = IncrementalFPTAS_RRP(dynamic, 'n0', 'n7', 20, EPSILON)
+    assert fptas.run() == FPTAS_RRP(copy(dynamic.graph), 'n0', 'n7', 20, EPSILON).run()
+
+    for _ in range(5):
+        change_edges(dynamic, rng, rng.randint(1, 4))
+        result = fptas.run()
+        best = brute_force(dynamic.graph, 'n0', 'n7', 20)
+        if best is None:
+            assert result is None
+            continue
+        check_path(dynamic.graph, result, 'n0', 'n7', 20)
+        assert result[0] >= best[0] / (1 + EPSILON)
+
+def test_unchanged_graph_keeps_the_answer():
+    dynamic = DynamicGraph(random_graph(3))
+    fptas = IncrementalFPTAS_RRP(dynamic, 'n0', 'n7', 20, EPSILON)
+    first = fptas.run()
+    dynamic.update_edge(*next((u, v, *w) for u in dynamic.graph for v, w in dynamic.graph[u].items()))
+    assert fptas.run() == first
+
+def test_new_nodes_rescale_the_buckets():
+    dynamic = DynamicGraph(random_graph(4, dag=True))
+    fptas = IncrementalFPTAS_RRP(dynamic, 'n0', 'n7', 20, EPSILON)
+    fptas.run()
+    dynamic.add_edge('n7', 'n8', 5, 1)
+    dynamic.add_edge('n8', 'n9', 5, 1)
+    result = fptas.run()
+    fresh = FPTAS_RRP(copy(dynamic.graph), 'n0', 'n7', 20, EPSILON)
+    assert (fptas.n, fptas.max_edges, fptas.delta) == (10, 9, fresh.delta)
+    assert result == fresh.run()
+
+def test_single_node_graph():
+    dynamic = DynamicGraph()
+    fptas = IncrementalFPTAS_RRP(dynamic, 'a', 'a', 5, EPSILON)
+    dynamic.add_edge('a', 'a', 1, 1)
+    assert fptas.run() == FPTAS_RRP(copy(dynamic.graph), 'a', 'a', 5, EPSILON).run()
+    assert fptas.max_edges == 1
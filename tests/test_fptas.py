@@ -0,0 +1,119 @@
+"""FPTAS_RRP against exhaustive search on small random graphs.
+
+On DAGs the visited-set check never rejects an extension, so the (1 + epsilon)
+guarantee holds exactly; on graphs with cycles only validity is checked.
+"""
+import math
+
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.lagrangian import LARAC_RRP
+
+EPSILON = 0.3
+SEEDS = range(40)
+
+def query(seed):
+    return 'n0', 'n7', 5 + seed % 26
+
+def anytime_result(result):
+    return result['total_reward'], result['total_penalty'], result['path']
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_guarantee_on_dags(seed):
+    graph = random_graph(seed, dag=True)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = FPTAS_RRP(graph, source, target, C, EPSILON).run()
+    if best is None:
+        assert result is None
+        return
+    check_path(graph, result, source, target, C)
+    assert result[0] >= best[0] / (1 + EPSILON)
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_feasible_on_general_graphs(seed):
+    graph = random_graph(seed)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = FPTAS_RRP(graph, source, target, C, EPSILON).run()
+    assert (result is None) == (best is None)
+    if result is not None:
+        check_path(graph, result, source, target, C)
+        assert result[0] <= best[0]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_label_bound_keeps_the_guarantee(seed):
+    graph = random_graph(seed, dag=True)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    fptas = FPTAS_RRP(graph, source, target, C, EPSILON)
+    fptas.label_bound = LARAC_RRP(graph, source, target, C)
+    fptas.label_bound.run()
+    result = fptas.run()
+    if best is None:
+        assert result is None
+        return
+    check_path(graph, result, source, target, C)
+    assert result[0] >= best[0] / (1 + EPSILON)
+
+@pytest.mark.parametrize('dag', [True, False])
+@pytest.mark.parametrize('seed', range(20))
+def test_anytime_solve_reports_a_bound(seed, dag):
+    graph = random_graph(seed, dag=dag)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = FPTAS_RRP(graph, source, target, C, EPSILON).solve()
+    if best is None:
+        assert result['path'] is None
+        return
+    check_path(graph, anytime_result(result), source, target, C)
+    assert result['epsilon'] == EPSILON
+    # Without label_bound, solve() runs LARAC for the bound; it is finite on DAGs
+    assert result['upper_bound'] >= best[0] - 1e-6
+    if result['upper_bound'] == math.inf:
+        assert not dag and result['guarantee'] == 0.0
+    elif result['upper_bound'] > 0:
+        assert result['guarantee'] == pytest.approx(min(1.0, result['total_reward'] / result['upper_bound']))
+    if dag:
+        assert result['total_reward'] >= best[0] / (1 + EPSILON)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_anytime_solve_with_label_bound(seed):
+    graph = random_graph(seed, dag=True)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    fptas = FPTAS_RRP(graph, source, target, C, EPSILON)
+    fptas.label_bound = LARAC_RRP(graph, source, target, C)
+    fptas.label_bound.run()
+    result = fptas.solve(epsilon_schedule=[1.0, EPSILON])
+    if best is None:
+        assert result['path'] is None
+        return
+    assert [epsilon for epsilon, _, _ in result['passes']] == [1.0, EPSILON]
+    assert result['upper_bound'] >= best[0] - 1e-6
+    assert result['total_reward'] >= best[0] / (1 + EPSILON)
+    # solve() restores the epsilon of the instance
+    assert fptas.epsilon == EPSILON and fptas.reward_cap == math.inf
+
+@pytest.mark.parametrize('seed', range(10))
+def test_anytime_solve_with_max_hops(seed):
+    graph = random_graph(seed, p=0.5)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C, max_edges=2)
+    result = FPTAS_RRP(graph, source, target, C, EPSILON, max_hops=2).solve()
+    if result['path'] is not None:
+        check_path(graph, anytime_result(result), source, target, C)
+        assert len(result['path']) - 1 <= 2
+        assert result['total_reward'] <= best[0]
+    if best is not None:
+        assert result['upper_bound'] >= best[0] - 1e-6
+
+def test_set_epsilon_rescales_buckets():
+    fptas = FPTAS_RRP(random_graph(0), 'n0', 'n7', 20, EPSILON)
+    assert (fptas.max_edges, fptas.delta) == (7, EPSILON / 7)
+    fptas.set_epsilon(0.7)
+    assert fptas.epsilon == 0.7 and fptas.delta == pytest.approx(0.1)
+    single = FPTAS_RRP({'a': {}}, 'a', 'a', 10, EPSILON)
+    assert (single.max_edges, single.delta) == (1, EPSILON)
@@ -0,0 +1,53 @@
+"""Hop-limited searches against exhaustive search over paths with at most H edges."""
+import pytest
+from helpers import brute_force, check_path, path_weights, random_graph, simple_paths
+
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.layered import FPTAS_BiObjectiveSP
+
+EPSILON = 0.3
+
+@pytest.mark.parametrize('max_hops', [0, 1, 2, 3, 9])
+@pytest.mark.parametrize('seed', range(5))
+def test_run_by_hops(seed, max_hops):
+    graph = random_graph(seed, dag=True, p=0.5)
+    results = FPTAS_RRP(graph, 'n0', 'n7', 30, EPSILON, max_hops=max_hops).run_by_hops()
+    assert len(results) == max_hops + 1
+    for hops, result in enumerate(results):
+        best = brute_force(graph, 'n0', 'n7', 30, max_edges=hops)
+        if best is None:
+            assert result is None
+            continue
+        check_path(graph, result, 'n0', 'n7', 30)
+        assert len(result[2]) - 1 <= hops
+        assert result[0] >= best[0] / (1 + EPSILON)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_run_matches_the_last_hop_limit(seed):
+    graph = random_graph(seed, p=0.5)
+    fptas = FPTAS_RRP(graph, 'n0', 'n7', 30, EPSILON, max_hops=3)
+    assert fptas.run() == FPTAS_RRP(graph, 'n0', 'n7', 30, EPSILON, max_hops=3).run_by_hops()[-1]
+    # delta scales with the hop limit instead of n - 1
+    assert fptas.delta == EPSILON / 3
+
+@pytest.mark.parametrize('max_hops', [0, 2, 4])
+@pytest.mark.parametrize('seed', range(10))
+def test_layered_solve_by_hops(seed, max_hops):
+    graph = random_graph(seed, dag=True, p=0.5)
+    results = FPTAS_BiObjectiveSP(graph, 'n0', 'n7', 1.0, max_hops=max_hops).solve_by_hops()
+    assert len(results) == max_hops + 1
+    for hops, (path, value) in enumerate(results):
+        best = min((reward - penalty for reward, penalty, _ in simple_paths(graph, 'n0', 'n7', max_edges=hops)),
+                   default=float('inf'))
+        if best == float('inf'):
+            assert path is None
+            continue
+        reward, penalty = path_weights(graph, path)
+        assert path[0] == 'n0' and path[-1] == 'n7' and len(path) - 1 <= hops
+        assert best <= reward - penalty == value <= best + 1.0
+
+def test_invalid_hop_limits_are_rejected():
+    with pytest.raises(ValueError):
+        FPTAS_RRP(random_graph(0), 'n0', 'n7', 10, EPSILON, max_hops=-1)
+    with pytest.raises(ValueError):
+        FPTAS_RRP(random_graph(0), 'n0', 'n7', 10, EPSILON).run_by_hops()
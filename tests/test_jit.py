@@ -0,0 +1,28 @@
+"""The Numba engine returns the same answer as the Python loops."""
+import pytest
+from helpers import random_graph
+
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.layered import FPTAS_BiObjectiveSP
+
+pytest.importorskip('numba')
+
+@pytest.mark.parametrize('seed', range(8))
+def test_jit_matches_python(seed):
+    graph = random_graph(seed, n=14, p=0.3)
+    expected = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run()
+    assert FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2, engine='jit').run() == expected
+
+    solver = FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0)
+    assert FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0, engine='jit').solve() == solver.solve()
+
+def test_jit_solve_matches_python():
+    graph = random_graph(2, n=14, p=0.3)
+    expected = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).solve()
+    result = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2, engine='jit').solve()
+    for key in ('path', 'total_reward', 'total_penalty', 'epsilon', 'upper_bound'):
+        assert result[key] == expected[key]
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        FPTAS_RRP(random_graph(0), 'n0', 'n7', 10, 0.2, engine='cuda')
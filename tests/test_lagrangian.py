@@ -0,0 +1,45 @@
+"""LARAC_RRP bounds and pruning against exhaustive search."""
+import math
+
+import pytest
+from helpers import brute_force, check_path, path_weights, random_graph
+
+from pathproblems.lagrangian import LARAC_RRP
+
+SEEDS = range(40)
+
+def query(seed):
+    return 'n0', 'n7', 5 + seed % 26
+
+@pytest.mark.parametrize('dag', [True, False])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_bound_is_valid(seed, dag):
+    graph = random_graph(seed, dag=dag)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = LARAC_RRP(graph, source, target, C).run()
+    if best is None:
+        assert result is None
+        return
+    check_path(graph, (result['total_reward'], result['total_penalty'], result['path']), source, target, C)
+    assert result['total_reward'] <= best[0] <= result['upper_bound'] + 1e-6
+    if dag:
+        assert result['upper_bound'] < math.inf
+        assert 0 <= result['gap'] <= 1
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_prunes_keeps_better_paths(seed):
+    graph = random_graph(seed)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    larac = LARAC_RRP(graph, source, target, C)
+    if larac.run() is None or best[0] <= larac.best[0]:
+        return
+    # Every prefix of a path better than the LARAC path must survive
+    path = best[2]
+    for k in range(1, len(path)):
+        reward, penalty = path_weights(graph, path[:k + 1])
+        assert not larac.prunes(path[k], reward, penalty)
+
+def test_no_path_for_equal_endpoints():
+    assert LARAC_RRP(random_graph(0), 'n0', 'n0', 10).run() is None
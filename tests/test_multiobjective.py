@@ -0,0 +1,65 @@
+"""FPTAS_MultiObjective against exhaustive search over every cost column."""
+import random
+
+import pytest
+from helpers import imported_backends, random_graph
+
+from pathproblems.multiobjective import FPTAS_MultiObjective
+
+EPSILON = 0.3
+
+def vector_graph(seed, num_costs):
+    """random_graph(seed, dag=True) with num_costs - 1 extra random cost columns after the penalty."""
+    rng = random.Random(seed)
+    return {u: {v: (reward, (penalty,) + tuple(rng.randint(0, 10) for _ in range(num_costs - 1)))
+                for v, (reward, penalty) in edges.items()}
+            for u, edges in random_graph(seed, dag=True).items()}
+
+def vector_brute_force(graph, source, target, budgets):
+    """Highest reward of a simple source-target path within every budget, or None."""
+    best = None
+    stack = [([source], 0, (0,) * len(budgets))]
+    while stack:
+        path, reward, costs = stack.pop()
+        if path[-1] == target:
+            best = reward if best is None else max(best, reward)
+            continue
+        for neighbor, (edge_reward, edge_costs) in graph[path[-1]].items():
+            new_costs = tuple(c + e for c, e in zip(costs, edge_costs))
+            if neighbor not in path and all(c <= b for c, b in zip(new_costs, budgets)):
+                stack.append((path + [neighbor], reward + edge_reward, new_costs))
+    return best
+
+def check_vector_path(graph, result, budgets):
+    reward, costs, path = result
+    assert path[0] == 'n0' and path[-1] == 'n7' and len(set(path)) == len(path)
+    steps = [graph[u][v] for u, v in zip(path, path[1:])]
+    assert reward == sum(edge_reward for edge_reward, _ in steps)
+    assert tuple(costs) == tuple(sum(column) for column in zip(*(edge_costs for _, edge_costs in steps)))
+    assert all(c <= b for c, b in zip(costs, budgets))
+
+@pytest.mark.parametrize('num_costs', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(25))
+def test_guarantee_on_dags(seed, num_costs):
+    if num_costs > 1:
+        pytest.importorskip('numpy')
+    graph = vector_graph(seed, num_costs)
+    budgets = (5 + seed % 26,) * num_costs
+    best = vector_brute_force(graph, 'n0', 'n7', budgets)
+    result = FPTAS_MultiObjective(graph, 'n0', 'n7', budgets, EPSILON).run()
+    if best is None:
+        assert result is None
+        return
+    check_vector_path(graph, result, budgets)
+    assert result[0] >= best / (1 + EPSILON)
+
+def test_zero_reward_path():
+    pytest.importorskip('numpy')
+    graph = {'s': {'a': (0, (1, 1))}, 'a': {'t': (0, (1, 1))}, 't': {}}
+    assert FPTAS_MultiObjective(graph, 's', 't', (5, 5), 0.1).run() == (0, (2, 2), ['s', 'a', 't'])
+
+def test_one_cost_column_needs_no_numpy():
+    code = ("from pathproblems.multiobjective import FPTAS_MultiObjective\n"
+            "graph = {'s': {'t': (3, (1,))}, 't': {}}\n"
+            "assert FPTAS_MultiObjective(graph, 's', 't', (5,), 0.1).run() == (3, (1,), ['s', 't'])")
+    assert imported_backends(code) == ''
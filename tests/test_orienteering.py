@@ -0,0 +1,70 @@
+"""Orienteering engines against exhaustive search over the stop orders."""
+import random
+
+import pytest
+from helpers import path_weights, random_graph
+
+from pathproblems.orienteering import Orienteering
+
+def prizes_for(seed, graph):
+    rng = random.Random(seed)
+    return {node: rng.randint(0, 5) for node in graph}
+
+def best_prize(problem):
+    """Largest prize of a route over every order of every subset of stops, or None."""
+    distance, prize, target, budget = problem.distance, problem.prize, problem.target_stop, problem.budget
+    best = None
+
+    def extend(route, visited, time, collected):
+        nonlocal best
+        u = route[-1]
+        if time + distance[u][target] <= budget:
+            total = collected + (prize[target] if target not in visited else 0)
+            best = total if best is None else max(best, total)
+        for v in range(len(distance)):
+            if v not in visited and v != target and time + distance[u][v] + distance[v][target] <= budget:
+                visited.add(v)
+                extend(route + [v], visited, time + distance[u][v], collected + prize[v])
+                visited.remove(v)
+
+    extend([0], {0}, 0, prize[0])
+    return best
+
+def check_route(problem, graph, prizes, result):
+    route = result['route']
+    assert route[0] == problem.source and route[-1] == problem.target
+    assert len(set(route[1:-1])) == len(route) - 2
+    assert result['time'] <= problem.budget
+    assert result['prize'] == sum(prizes.get(node, 0) for node in set(route))
+    path = problem.expand(route)
+    assert path[0] == problem.source and path[-1] == problem.target
+    assert path_weights(graph, path)[1] == result['time']
+
+@pytest.mark.parametrize('closed', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_engines_against_brute_force(seed, closed):
+    graph = random_graph(seed, n=8, p=0.4)
+    prizes = prizes_for(seed, graph)
+    target = 'n0' if closed else 'n7'
+    problem = Orienteering(graph, prizes, 'n0', target, 25)
+    best = best_prize(problem)
+    exact = problem.label_dp()
+    if best is None:
+        assert exact is None and problem.local_search(starts=2, workers=1) is None
+        return
+
+    check_route(problem, graph, prizes, exact)
+    assert exact['prize'] == best
+    for result in (problem.label_dp(epsilon=0.5), problem.local_search(starts=2, iterations=30, workers=1)):
+        check_route(problem, graph, prizes, result)
+        assert result['prize'] <= best
+
+def test_local_search_in_processes_matches_one_process():
+    graph = random_graph(3, n=8, p=0.4)
+    problem = Orienteering(graph, prizes_for(3, graph), 'n0', 'n7', 25)
+    assert (problem.local_search(starts=3, iterations=30, workers=2) ==
+            problem.local_search(starts=3, iterations=30, workers=1))
+
+def test_unknown_node_is_rejected():
+    with pytest.raises(ValueError):
+        Orienteering(random_graph(0), {}, 'n0', 'missing', 10)
@@ -0,0 +1,12 @@
+"""The package and the FPTAS command import no heavy backend."""
+from helpers import imported_backends, random_graph, write_csv
+
+def test_import_is_cheap():
+    assert imported_backends("import pathproblems, pathproblems.cli\npathproblems.FPTAS_RRP") == ''
+
+def test_fptas_command_is_cheap(tmp_path):
+    filename = write_csv(random_graph(0), str(tmp_path / 'graph.csv'))
+    code = ("from pathproblems.cli import main\n"
+            f"main(['solve', '--algo', 'fptas', '--input', {filename!r}, '--source', 'n0', '--target', 'n7', "
+            "'--constraint', '20'])")
+    assert imported_backends(code) == ''
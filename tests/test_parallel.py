@@ -0,0 +1,20 @@
+"""ParallelBiObjectiveSP returns the same answer as the single-process layered solver."""
+import pytest
+from helpers import random_graph
+
+from pathproblems.layered import FPTAS_BiObjectiveSP
+from pathproblems.parallel import ParallelBiObjectiveSP
+
+@pytest.mark.parametrize('seed', range(3))
+def test_parallel_matches_layered(seed):
+    graph = random_graph(seed, n=14, p=0.3)
+    expected = FPTAS_BiObjectiveSP(graph, 'n0', 'n13', 1.0).solve()
+    assert ParallelBiObjectiveSP(graph, 'n0', 'n13', 1.0, workers=2).solve() == expected
+
+def test_parallel_with_max_hops():
+    graph = random_graph(4, n=10, p=0.4)
+    expected = FPTAS_BiObjectiveSP(graph, 'n0', 'n9', 1.0, max_hops=3).solve()
+    assert ParallelBiObjectiveSP(graph, 'n0', 'n9', 1.0, workers=2, max_hops=3).solve() == expected
+
+def test_missing_target():
+    assert ParallelBiObjectiveSP({'a': {'b': (1, 1)}}, 'a', 'z', 1.0, workers=1).solve() == (None, float('inf'))
@@ -0,0 +1,59 @@
+"""PortfolioRRP races engines and only trusts valid bounds."""
+import math
+
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems import portfolio
+from pathproblems.portfolio import PortfolioRRP
+
+def portfolio_result(result):
+    return result['total_reward'], result['total_penalty'], result['path']
+
+def test_heuristics_prove_nothing():
+    graph = random_graph(7)
+    result = PortfolioRRP(graph, 'n0', 'n7', 20, 0.5, engines=('fptas', 'scaling')).solve(deadline=60)
+    check_path(graph, portfolio_result(result), 'n0', 'n7', 20)
+    assert not result['proven'] and result['winner'] is None
+    assert result['upper_bound'] == math.inf and result['gap'] == math.inf
+
+def test_infinite_larac_bound_is_not_sent():
+    # Positive cycles make the Lagrangian bound infinite here
+    graph = random_graph(12, n=8)
+    result = PortfolioRRP(graph, 'n0', 'n7', 15, engines=('larac',)).solve(deadline=60)
+    check_path(graph, portfolio_result(result), 'n0', 'n7', 15)
+    assert result['upper_bound'] == math.inf and not result['proven']
+
+@pytest.mark.parametrize('seed', range(5))
+def test_larac_bound_on_dags(seed):
+    graph = random_graph(seed, dag=True)
+    best = brute_force(graph, 'n0', 'n7', 20)
+    result = PortfolioRRP(graph, 'n0', 'n7', 20, engines=('fptas', 'larac')).solve(deadline=60)
+    if best is None:
+        assert result['path'] is None and result['proven']
+        return
+    check_path(graph, portfolio_result(result), 'n0', 'n7', 20)
+    # Integer rewards round the bound down
+    assert best[0] <= result['upper_bound'] < math.inf and float(result['upper_bound']).is_integer()
+
+def test_ilp_closes_the_gap():
+    pytest.importorskip('gurobipy')
+    graph = random_graph(5)
+    best = brute_force(graph, 'n0', 'n7', 20)
+    result = PortfolioRRP(graph, 'n0', 'n7', 20, engines=('fptas', 'ilp')).solve(deadline=60)
+    assert result['proven'] and result['total_reward'] == best[0] == result['upper_bound']
+
+def test_engine_errors_are_recorded(monkeypatch):
+    def failing(*args):
+        raise RuntimeError("no solver")
+
+    monkeypatch.setitem(portfolio.ENGINES, 'larac', failing)
+    solver = PortfolioRRP(random_graph(0), 'n0', 'n7', 20, engines=('larac',))
+    result = solver.solve(deadline=60)
+    assert result['path'] is None and not result['proven']
+    assert [(name, kind, value) for _, name, kind, value in solver.events if kind == 'error'] == [
+        ('larac', 'error', 'RuntimeError: no solver')]
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        PortfolioRRP(random_graph(0), 'n0', 'n7', 20, engines=('fptas', 'simplex'))
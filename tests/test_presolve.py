@@ -0,0 +1,53 @@
+"""ILP presolve keeps every feasible path and MTZ positions that fit it."""
+import pytest
+from helpers import brute_force, random_graph, simple_paths
+
+from pathproblems.ilp import presolve
+
+def edge_dict(graph):
+    return {(u, v): weights for u in graph for v, weights in graph[u].items()}
+
+@pytest.mark.parametrize('dag', [True, False])
+@pytest.mark.parametrize('seed', range(30))
+def test_presolve_keeps_feasible_paths(seed, dag):
+    graph = random_graph(seed, dag=dag)
+    C = 5 + seed % 26
+    edges, nodes, bounds = presolve(edge_dict(graph), list(graph), 'n0', 'n7', C)
+    assert set(edges) <= set(edge_dict(graph))
+    assert nodes == [node for node in graph if node in nodes]
+
+    for _, _, path in simple_paths(graph, 'n0', 'n7', C):
+        assert set(zip(path, path[1:])) <= set(edges)
+        # Positions k - 1 from the source up to the target at len(nodes) - 1 must fit the bounds
+        length = len(path) - 1
+        for k, node in enumerate(path[1:], 1):
+            lower, upper = bounds[node]
+            assert lower <= k - 1 and upper >= len(nodes) - 1 - (length - k)
+
+def test_presolve_drops_far_and_unreachable_nodes():
+    graph = {
+        's': {'a': (1, 1), 'x': (1, 1)},
+        'a': {'t': (1, 1)},
+        'x': {'s': (1, 1)},
+        'y': {'t': (1, 1)},
+        't': {},
+    }
+    edges, nodes, bounds = presolve(edge_dict(graph), list(graph), 's', 't', 10)
+    assert nodes == ['s', 'a', 't'] and set(edges) == {('s', 'a'), ('a', 't')}
+    assert bounds == {'a': (0, 1), 't': (1, 2)}
+
+@pytest.mark.parametrize('seed', range(10))
+def test_ilp_with_and_without_presolve(seed):
+    pytest.importorskip('gurobipy')
+    from pathproblems.ilp import solve_rrp_ilp
+
+    graph = random_graph(seed)
+    C = 5 + seed % 26
+    best = brute_force(graph, 'n0', 'n7', C)
+    for presolve_model in (True, False):
+        result = solve_rrp_ilp(edge_dict(graph), list(graph), 'n0', 'n7', C, presolve_model)
+        if best is None:
+            assert result is None
+        else:
+            assert result['path'][-1] == 'n7' and result['constraint_satisfied']
+            assert result['total_reward'] == best[0]
@@ -0,0 +1,22 @@
+"""Growth exponents and a small profile sweep."""
+import pytest
+
+from pathproblems.profiler import PHASES, growth_exponent, profile_sweep, report
+
+def test_growth_exponent():
+    assert growth_exponent([(10, 300), (20, 1200), (40, 4800)]) == pytest.approx(2.0)
+    assert growth_exponent([(10, 5), (20, 5)]) == pytest.approx(0.0)
+    # Fewer than two usable points, or a single size, fit nothing
+    assert growth_exponent([(10, 1), (20, 0)]) is None
+    assert growth_exponent([(10, 1), (10, 2)]) is None
+
+def test_small_sweep():
+    messages = []
+    records = profile_sweep([10, 20], [0.5, 0.25], ['fptas'], repeat=1, log=messages.append)
+    assert [(record['nodes'], record['epsilon']) for record in records] == [(10, 0.5), (10, 0.25), (20, 0.5),
+                                                                            (20, 0.25)]
+    assert len(messages) == 4
+    for record in records:
+        assert set(record['seconds']) <= set(PHASES) and set(record['seconds']) == set(record['peak'])
+    text = report(records)
+    assert 'Growth exponents' in text and 'hottest functions' in text
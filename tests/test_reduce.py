@@ -0,0 +1,43 @@
+"""reduce_graph keeps every feasible source-target path of the original graph."""
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.reduce import reduce_graph
+
+@pytest.mark.parametrize('dag', [True, False])
+@pytest.mark.parametrize('seed', range(30))
+def test_reduction_keeps_the_optimum(seed, dag):
+    graph = random_graph(seed, dag=dag)
+    C = 5 + seed % 26
+    best = brute_force(graph, 'n0', 'n7', C)
+    reduced = reduce_graph(graph, 'n0', 'n7', C)
+    assert reduced.csr.num_edges <= sum(len(edges) for edges in graph.values())
+
+    reduced_best = brute_force(reduced.graph, 'n0', 'n7', C)
+    if best is None:
+        assert reduced_best is None
+        return
+    reward, penalty, path = reduced_best
+    assert (reward, penalty) == best[:2]
+    check_path(graph, (reward, penalty, reduced.expand_path(path)), 'n0', 'n7', C)
+
+def test_chain_contraction_and_pruning():
+    graph = {
+        's': {'a': (1, 1), 'x': (9, 50)},
+        'a': {'b': (2, 1)},
+        'b': {'t': (3, 1)},
+        'x': {'t': (9, 1)},
+        't': {'s': (1, 1)},
+    }
+    reduced = reduce_graph(graph, 's', 't', 10)
+    # s -> x is over budget and t -> s enters the source; a and b become one composite edge
+    assert reduced.graph == {'s': {'t': (6, 3)}, 't': {}}
+    assert reduced.expand_path(['s', 't']) == ['s', 'a', 'b', 't']
+    assert reduced.expand_path([]) == []
+
+    uncontracted = reduce_graph(graph, 's', 't', 10, contract_chains=False)
+    assert uncontracted.graph == {'s': {'a': (1, 1)}, 'a': {'b': (2, 1)}, 'b': {'t': (3, 1)}, 't': {}}
+
+def test_unknown_node_is_rejected():
+    with pytest.raises(ValueError):
+        reduce_graph(random_graph(0), 'n0', 'missing', 10)
@@ -0,0 +1,45 @@
+"""ScalingFPTAS_RRP against exhaustive search on small random graphs.
+
+On DAGs the visited-set check never rejects an extension, so the (1 - epsilon)
+guarantee holds exactly; on graphs with cycles only validity is checked.
+"""
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.scaling import ScalingFPTAS_RRP
+
+EPSILON = 0.3
+SEEDS = range(40)
+
+def query(seed):
+    return 'n0', 'n7', 5 + seed % 26
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_scaling_guarantee_on_dags(seed):
+    graph = random_graph(seed, dag=True)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = ScalingFPTAS_RRP(graph, source, target, C, EPSILON).run()
+    if best is None:
+        assert result is None
+        return
+    check_path(graph, result, source, target, C)
+    assert result[0] >= (1 - EPSILON) * best[0]
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_feasible_on_general_graphs(seed):
+    graph = random_graph(seed)
+    source, target, C = query(seed)
+    best = brute_force(graph, source, target, C)
+    result = ScalingFPTAS_RRP(graph, source, target, C, EPSILON).run()
+    assert (result is None) == (best is None)
+    if result is not None:
+        check_path(graph, result, source, target, C)
+        assert result[0] <= best[0]
+
+def test_bracket_without_lower_bound():
+    # The only positive-reward path is over budget, so no path reaches the smallest reward
+    graph = {'s': {'t': (0, 1), 'a': (5, 10)}, 'a': {'t': (5, 10)}, 't': {}}
+    solver = ScalingFPTAS_RRP(graph, 's', 't', 5, 0.5)
+    assert solver.run() == (0, 1, ['s', 't'])
+    assert solver.bounds[0] is None
@@ -0,0 +1,87 @@
+"""Bulk path scoring against a per-path Python reference."""
+import random
+
+import pytest
+from helpers import random_graph, simple_paths
+
+np = pytest.importorskip('numpy')
+
+from pathproblems.csr import CSRGraph  # noqa: E402
+from pathproblems.scoring import PathScorer, encode_paths  # noqa: E402
+
+C = 25
+
+def reference(graph, path):
+    """(reward, penalty, edges_exist, simple, feasible) of one list of node names."""
+    reward = penalty = 0
+    edges_exist = all(node in graph for node in path)
+    for u, v in zip(path, path[1:]):
+        edge = graph.get(u, {}).get(v)
+        if edge is None:
+            edges_exist = False
+            continue
+        reward += edge[0]
+        penalty += edge[1]
+    simple = len(set(path)) == len(path)
+    return reward, penalty, edges_exist, simple, edges_exist and simple and penalty <= C
+
+def sample_paths(graph, seed, count=200):
+    """Real paths, random walks (with repeats) and random node sequences (with missing edges and unknown nodes)."""
+    rng = random.Random(seed)
+    nodes = list(graph)
+    paths = [path for _, _, path in simple_paths(graph, 'n0', 'n7', C)][:count // 4]
+    paths += [[], ['n3'], ['n3', 'n3'], ['unknown'], ['n0', 'unknown', 'n1']]
+    while len(paths) < count:
+        path = [rng.choice(nodes)]
+        for _ in range(rng.randint(0, 7)):
+            neighbors = list(graph.get(path[-1], {}))
+            if neighbors and rng.random() < 0.8:
+                path.append(rng.choice(neighbors))
+            else:
+                path.append(rng.choice(nodes + ['unknown']))
+        paths.append(path)
+    return paths
+
+def check(scores, graph, paths, reward_factor=1):
+    for i, path in enumerate(paths):
+        reward, penalty, edges_exist, simple, feasible = reference(graph, path)
+        assert scores['reward'][i] == reward_factor * reward, path
+        assert scores['penalty'][i] == penalty, path
+        assert scores['edges_exist'][i] == edges_exist, path
+        assert scores['simple'][i] == simple, path
+        assert scores['valid'][i] == (edges_exist and simple), path
+        assert scores['feasible'][i] == feasible, path
+
+@pytest.mark.parametrize('seed', range(10))
+def test_score_paths_matches_reference(seed):
+    graph = random_graph(seed)
+    paths = sample_paths(graph, seed)
+    check(PathScorer(graph).score_paths(paths, C), graph, paths)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_padded_matches_ragged(seed):
+    graph = random_graph(seed)
+    csr = CSRGraph.from_dict(graph)
+    paths = sample_paths(graph, seed)
+    scorer = PathScorer(csr)
+    ids, offsets = encode_paths(csr, paths)
+    width = max(len(path) for path in paths) + 1
+    padded = np.full((len(paths), width), -2, dtype=np.int64)
+    for i in range(len(paths)):
+        padded[i, :offsets[i + 1] - offsets[i]] = ids[offsets[i]:offsets[i + 1]]
+    ragged = scorer.score(ids, offsets, C)
+    # Unknown nodes are encoded as -1, so a different pad value keeps them apart
+    for key, values in scorer.score(padded, constraint_C=C, pad=-2).items():
+        assert np.array_equal(values, ragged[key]), key
+
+def test_with_weights_rescores_the_same_edges():
+    graph = random_graph(4)
+    csr = CSRGraph.from_dict(graph)
+    paths = sample_paths(graph, 4)
+    scorer = PathScorer(csr).with_weights(rewards=3 * np.frombuffer(csr.rewards, dtype=np.int64))
+    check(scorer.score_paths(paths, C), graph, paths, reward_factor=3)
+
+def test_bad_offsets_are_rejected():
+    scorer = PathScorer(random_graph(0))
+    with pytest.raises(ValueError):
+        scorer.score(np.array([0, 1, 2]), np.array([0, 2]))
@@ -0,0 +1,92 @@
+"""Query service: answers, load restrictions, loading off the event loop and worker graph eviction."""
+import asyncio
+import os
+import threading
+
+import pytest
+from helpers import random_graph, write_csv
+
+from pathproblems import service as service_module
+from pathproblems.cache import graph_fingerprint, select_best, solve_frontier
+from pathproblems.service import PathService, query
+
+@pytest.fixture
+def service(tmp_path):
+    root = tmp_path / 'graphs'
+    root.mkdir()
+    write_csv(random_graph(0), str(root / 'inside.csv'))
+    write_csv(random_graph(1), str(tmp_path / 'outside.csv'))
+    os.symlink(str(tmp_path / 'outside.csv'), str(root / 'link.csv'))
+    service = PathService(workers=1, root=str(root))
+    yield service
+    service.close()
+
+def test_load_inside_root(service):
+    response = asyncio.run(service.load_request('g', 'inside.csv'))
+    assert service.graphs['g'][0] == os.path.join(service.root, 'inside.csv')
+    assert response['fingerprint'] == graph_fingerprint(random_graph(0))
+    assert asyncio.run(service.load_request('g')) == response
+
+@pytest.mark.parametrize('path', ['../outside.csv', 'link.csv', '/etc/passwd'])
+def test_load_outside_root_is_refused(service, path):
+    with pytest.raises(ValueError, match='outside the graph root'):
+        asyncio.run(service.load_request('g', path))
+    assert 'g' not in service.graphs
+
+def test_without_root_only_reloads(tmp_path):
+    filename = write_csv(random_graph(0), str(tmp_path / 'graph.csv'))
+    service = PathService(workers=1)
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(service.load_request('g', filename))
+        with pytest.raises(ValueError):
+            asyncio.run(service.load_request('g'))
+        service.load('g', filename)
+        assert asyncio.run(service.load_request('g'))['name'] == 'g'
+    finally:
+        service.close()
+
+def test_loads_run_off_the_event_loop(service, monkeypatch):
+    threads = []
+    load_graph = service_module.load_graph
+
+    def recording_load_graph(*args):
+        threads.append(threading.current_thread())
+        return load_graph(*args)
+
+    monkeypatch.setattr(service_module, 'load_graph', recording_load_graph)
+    asyncio.run(service.load_request('g', 'inside.csv'))
+    assert threads and threading.main_thread() not in threads
+
+def test_worker_keeps_only_the_newest_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(service_module, '_worker_graphs', {})
+    filename = os.path.abspath(write_csv(random_graph(0), str(tmp_path / 'graph.csv')))
+    for seed in range(3):
+        graph = random_graph(seed)
+        write_csv(graph, filename)
+        frontier = service_module._worker_solve(filename, 2, graph_fingerprint(graph), 'n0', 'n7', 20, 0.2)
+        assert frontier == solve_frontier(graph, 'n0', 'n7', 20, 0.2)
+        assert list(service_module._worker_graphs) == [(filename, 2, graph_fingerprint(graph))]
+    with pytest.raises(ValueError, match='changed'):
+        service_module._worker_solve(filename, 2, graph_fingerprint(random_graph(0)), 'n0', 'n7', 20, 0.2)
+
+def test_queries_over_a_connection(service):
+    graph = random_graph(0)
+    expected = select_best(solve_frontier(graph, 'n0', 'n7', 20, 0.2), 20)
+
+    async def session():
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await query('127.0.0.1', port, [
+                {'op': 'load', 'name': 'g', 'path': 'inside.csv'},
+                {'op': 'solve', 'graph': 'g', 'source': 'n0', 'target': 'n7', 'constraint': 20, 'epsilon': 0.2},
+                {'op': 'solve', 'graph': 'h', 'source': 'n0', 'target': 'n7'},
+            ])
+
+    load, solve, unknown = asyncio.run(session())
+    assert load['ok'] and solve['ok'] and not unknown['ok']
+    if expected is None:
+        assert solve['result'] == {'found': False}
+    else:
+        assert solve['result'] == {'found': True, 'reward': expected[0], 'penalty': expected[1], 'path': expected[2]}
@@ -0,0 +1,61 @@
+"""FPTAS_RRP with max_memory returns the same answer as without it."""
+import pytest
+from helpers import random_graph
+
+from pathproblems.fptas import FPTAS_RRP
+from pathproblems.spill import ENTRY_BYTES, FRONTIER_BYTES, MIN_MEMORY, FrontierStore
+
+SEEDS = range(8)
+
+def larger_graph(seed):
+    return random_graph(seed, n=14, p=0.3)
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_spill_matches_run(seed, tmp_path):
+    graph = larger_graph(seed)
+    expected = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).run()
+    fptas = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2, max_memory=MIN_MEMORY, scratch_dir=str(tmp_path))
+    assert fptas.run() == expected
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_spill_solve_matches_solve(seed, tmp_path):
+    graph = larger_graph(seed)
+    expected = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2).solve()
+    fptas = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2, max_memory=MIN_MEMORY, scratch_dir=str(tmp_path))
+    result = fptas.solve()
+    for key in ('path', 'total_reward', 'total_penalty', 'epsilon', 'upper_bound'):
+        assert result[key] == expected[key]
+
+def test_spill_prunes_like_propagate(tmp_path):
+    graph = larger_graph(3)
+    fptas = FPTAS_RRP(graph, 'n0', 'n13', 25, 0.2, max_memory=MIN_MEMORY, scratch_dir=str(tmp_path))
+    fptas.run()
+    unpruned = fptas.spill_stats['labels']
+
+    # Nothing is within budget of the target and no reward fits under the cap
+    fptas.penalty_to_target = {node: 0 for node in graph}
+    fptas.reward_cap = -1
+    assert fptas.run() is None
+    assert fptas.spill_stats['labels'] == 1 < unpruned
+
+def test_frontier_store_spills_and_reloads(tmp_path):
+    store = FrontierStore(10 * ENTRY_BYTES + 2 * FRONTIER_BYTES, str(tmp_path))
+    try:
+        expected = {}
+        for node in range(20):
+            frontier = store.get(node)
+            for bucket in range(4):
+                frontier[bucket] = expected.setdefault(node, {})[bucket] = (bucket + node, node, 100 * node + bucket)
+            store.added(4)
+            store.trim()
+        assert store.num_spills > 0 and len(store.resident) < 20
+        for node in range(20):
+            assert store.get(node) == expected[node]
+            store.trim()
+        assert store.num_loads > 0
+    finally:
+        store.close()
+
+def test_spill_rejects_small_caps():
+    with pytest.raises(ValueError):
+        FPTAS_RRP(larger_graph(0), 'n0', 'n13', 25, 0.2, max_memory=1024).run()
@@ -0,0 +1,45 @@
+"""FPTAS_RRP.run_all_targets() against exhaustive search to every node."""
+import math
+
+import pytest
+from helpers import brute_force, check_path, random_graph
+
+from pathproblems.fptas import FPTAS_RRP
+
+pytest.importorskip('numpy')
+
+EPSILON = 0.3
+
+@pytest.mark.parametrize('seed', range(20))
+def test_every_target_on_dags(seed):
+    graph = random_graph(seed, dag=True)
+    C = 5 + seed % 26
+    table = FPTAS_RRP(graph, 'n0', 'n7', C, EPSILON).run_all_targets()
+    assert len(table) == len(graph)
+
+    for i, node in enumerate(table.nodes):
+        best = brute_force(graph, 'n0', node, C)
+        if best is None:
+            assert not table.reachable[i]
+            assert math.isnan(table.reward[i]) and table.pred[i] == -1 and table.path(node) == []
+            continue
+        path = table.path(node)
+        check_path(graph, (table.reward[i], table.penalty[i], path), 'n0', node, C)
+        assert table.reward[i] >= best[0] / (1 + EPSILON)
+        # pred is the row of the last hop of the full path
+        if node == 'n0':
+            assert table.pred[i] == -1
+        else:
+            assert table.nodes[table.pred[i]] == path[-2]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_target_row_matches_run(seed):
+    graph = random_graph(seed)
+    C = 5 + seed % 26
+    table = FPTAS_RRP(graph, 'n0', 'n7', C, EPSILON).run_all_targets()
+    result = FPTAS_RRP(graph, 'n0', 'n7', C, EPSILON).run()
+    i = table.index['n7']
+    if result is None:
+        assert not table.reachable[i]
+    else:
+        assert (table.reward[i], table.penalty[i], table.path('n7')) == result